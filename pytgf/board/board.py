@@ -3,12 +3,15 @@ File containing the definition of Board, Tile and TileIdentifier
 """
 
 from collections import namedtuple
-from typing import Union, Tuple, List
+from functools import partial
+from typing import Union, Tuple, List, Optional, Dict
 
+import numpy as np
 import pygame
 
 from .graphics import BoardGraphics, Width, Height
 from ..utils.geom import Coordinates
+from ..utils.journal import Journal
 
 __author__ = 'Anthony Rouneau'
 
@@ -27,6 +30,9 @@ class BoardWithoutGraphicsException(Exception):
 class Board:
     """
     Class defining a Board containing Tiles. The tiles are linked to each other with a list of neighbours.
+    The "deadly" and "walkable" properties of the tiles are stored in two boolean NumPy matrices, so that they can be
+    read and copied at once. The Tile structs are only views on these matrices, built when they are asked, and kept
+    until their tile is modified.
     """
 
     OUT_OF_BOARD_TILE = Tile(identifier=(-1, -1), center=(-500, -500), deadly=True, walkable=True, neighbours=())
@@ -56,7 +62,16 @@ class Board:
                                           tiles_visible=False)
         self.lines = lines  # type: int
         self.columns = columns  # type: int
-        self._tiles = tiles  # type: List[List[Tile]]
+        self._deadly = np.array([[tile.deadly for tile in line] for line in tiles], dtype=bool)
+        self._walkable = np.array([[tile.walkable for tile in line] for line in tiles], dtype=bool)
+        # The centers and the neighbours of the tiles never change, and are shared with the copies of this board
+        self._centers = tuple(tuple(tile.center for tile in line) for line in tiles)
+        self._neighbours = tuple(tuple(tile.neighbours for tile in line) for line in tiles)
+        self._tiles = {}  # type: Dict[TileIdentifier, Tile]  # The Tile structs built for the unmodified tiles
+        self.journal = None  # type: Optional[Journal]  # Journal in which the modifications of the tiles are recorded
+        self.game = None  # The game played on this board, informed of the modifications of the tiles
+        self._neighbourIndexes = None  # type: Optional[Tuple[Tuple[int, ...], ...]]
+        self.topologyVersion = 0  # Incremented each time a tile becomes (non-)deadly or (non-)walkable
 
     def getTileByPixel(self, pixel: Coordinates) -> Union[Tile, None]:
         """
@@ -82,13 +97,15 @@ class Board:
 
         Returns: The Tile struct located at the given identifier
         """
-        i, j = identifier
-        if i < 0 or j < 0:
-            return self.OUT_OF_BOARD_TILE
-        try:
-            return self._tiles[identifier[0]][identifier[1]]
-        except IndexError:
-            return self.OUT_OF_BOARD_TILE
+        tile = self._tiles.get(identifier)
+        if tile is None:
+            i, j = identifier
+            if not (0 <= i < self.lines and 0 <= j < self.columns):
+                return self.OUT_OF_BOARD_TILE
+            tile = Tile(identifier=(int(i), int(j)), center=self._centers[i][j], deadly=bool(self._deadly[i, j]),
+                        walkable=bool(self._walkable[i, j]), neighbours=self._neighbours[i][j])
+            self._tiles[identifier] = tile
+        return tile
 
     def isAccessible(self, source_identifier: TileIdentifier, destination_identifier: TileIdentifier) -> bool:
         """
@@ -115,6 +132,47 @@ class Board:
         """
         return self.getTileById(tile_identifier).neighbours
 
+    def getNeighbourIndexes(self) -> Tuple[Tuple[int, ...], ...]:
+        """
+        Gives the neighbourhood of the tiles as a flat array, in which the tile (i, j) has the index i * columns + j.
+        It is computed once, as the neighbours of the tiles never change, and shared with the copies of this board.
+
+        Returns: A tuple containing, at the index of each tile, the tuple of the indexes of its neighbours
+        """
+        if self._neighbourIndexes is None:
+            neighbour_indexes = []
+            for line in self._neighbours:
+                for neighbours in line:
+                    neighbour_indexes.append(tuple(i * self.columns + j for i, j in neighbours
+                                                   if 0 <= i < self.lines and 0 <= j < self.columns))
+            self._neighbourIndexes = tuple(neighbour_indexes)
+        return self._neighbourIndexes
+
+    def getWalkableMask(self, avoid_deadly: bool=False) -> np.ndarray:
+        """
+        Args:
+            avoid_deadly: If True, the deadly tiles are considered as non-walkable
+
+        Returns: A (lines x columns) boolean matrix that is True for each tile that can be walked on
+        """
+        if avoid_deadly:
+            return self._walkable & ~self._deadly
+        return self._walkable.copy()
+
+    def getByteCodes(self) -> np.ndarray:
+        """
+        Returns:
+            A (lines x columns) matrix containing the byte code of each tile of the board
+
+                - 0 = walkable non-deadly
+                - 1 = walkable deadly
+                - 2 = non-walkable, non-deadly
+                - 3 = non-walkable, deadly
+        """
+        byte_codes = self._deadly.astype(np.int8)
+        byte_codes[~self._walkable] += 2
+        return byte_codes
+
     def setTileDeadly(self, tile_identifier: TileIdentifier, deadly: bool=True) -> None:
         """
         Modifies the "deadly" property of a tile
@@ -124,9 +182,9 @@ class Board:
             deadly: If True, the tile will be set as "deadly", else, set the tile as "non-deadly"
         """
         tile = self.getTileById(tile_identifier)
-        i, j = tile_identifier
-        self._tiles[i][j] = Tile(identifier=tile.identifier, center=tile.center, neighbours=tile.neighbours,
-                                 deadly=deadly, walkable=tile.walkable)
+        self._recordTile(tile)
+        self._deadly[tile_identifier] = deadly
+        self._afterTileModification(tile)
 
     def setTileNonWalkable(self, tile_identifier: TileIdentifier, walkable: bool=False) -> None:
         """
@@ -137,9 +195,9 @@ class Board:
             walkable: If False, the tile will be set as "non-walkable", else, sets the the tile as "walkable"
         """
         tile = self.getTileById(tile_identifier)
-        i, j = tile_identifier
-        self._tiles[i][j] = Tile(identifier=tile.identifier, center=tile.center, neighbours=tile.neighbours,
-                                 deadly=tile.deadly, walkable=walkable)
+        self._recordTile(tile)
+        self._walkable[tile_identifier] = walkable
+        self._afterTileModification(tile)
 
     def draw(self, surface: pygame.Surface) -> None:
         """
@@ -153,15 +211,69 @@ class Board:
         else:
             raise BoardWithoutGraphicsException("Trying to draw a board without a graphical part")
 
+    def snapshot(self) -> 'Board':
+        """
+        Creates a copy of this board, without its graphical part, that shares the centers and the neighbours of its
+        tiles with this board.
+
+        Returns: A copy of this board that can be modified without affecting this one
+        """
+        cls = self.__class__
+        result = cls.__new__(cls)
+        result.__dict__.update(self.__dict__)
+        result.graphics = None
+        result.journal = None
+        result.game = None
+        result._deadly = self._deadly.copy()
+        result._walkable = self._walkable.copy()
+        result._tiles = self._tiles.copy()
+        return result
+
+    def _afterTileModification(self, tile: Tile) -> None:
+        """
+        Forgets the Tile struct of a tile that was modified, and informs the game of the modification
+
+        Args:
+            tile: The Tile struct of the tile before its modification
+        """
+        self._tiles.pop(tile.identifier, None)
+        self.topologyVersion += 1
+        if self.game is not None:
+            self.game.afterTileModification(tile, self.getTileById(tile.identifier))
+
+    def _recordTile(self, tile: Tile) -> None:
+        """
+        Records the given tile in the journal of this board (if any) before it is replaced
+
+        Args:
+            tile: The tile that will be replaced
+        """
+        if self.journal is not None and self.journal.isRecording():
+            self.journal.record(partial(self._restoreTile, tile))
+
+    def _restoreTile(self, tile: Tile) -> None:
+        """
+        Puts back the given tile in this board
+
+        Args:
+            tile: The tile to put back at its place
+        """
+        self._deadly[tile.identifier] = tile.deadly
+        self._walkable[tile.identifier] = tile.walkable
+        self._tiles[tile.identifier] = tile
+        self.topologyVersion += 1
+
     def __deepcopy__(self, memo={}):
         cls = self.__class__
         result = cls.__new__(cls)
         memo[id(self)] = result
         for k, v in self.__dict__.items():
-            if k == "_tiles":
-                value = [[a for a in b] for b in v]
-            elif k == "_kdTree" or k == "graphics":
+            if k == "_deadly" or k == "_walkable" or k == "_tiles":
+                value = v.copy()
+            elif k == "_kdTree" or k == "graphics" or k == "journal":
                 value = None
+            elif k == "game":  # Only keeps the link with the game if the game is copied as well
+                value = memo.get(id(v)) if v is not None else None
             else:
                 value = v
             setattr(result, k, value)
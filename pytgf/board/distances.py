@@ -0,0 +1,118 @@
+"""
+File containing vectorized methods that compute, with NumPy, the distances from one or several tiles to every tile of
+a board. The tiles are reached through their four direct neighbours, as in the boards created by the Builder.
+"""
+
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from .board import TileIdentifier
+
+__author__ = 'Anthony Rouneau'
+
+
+UNREACHABLE = -1  # Distance of a tile that cannot be reached from the sources
+NO_OWNER = -1  # Owner of a tile that no source reaches strictly before the others
+
+
+# -------------------- PUBLIC METHODS -------------------- #
+
+def get_distance_field(walkable_mask: np.ndarray, sources: Iterable[TileIdentifier], max_dist: int=-1) -> np.ndarray:
+    """
+    Computes, by a breadth-first search from all the sources at once, the distance from the closest source to each tile
+
+    Args:
+        walkable_mask: A (lines x columns) boolean matrix that is True for each tile that can be walked on
+        sources:
+            The identifiers of the tiles from which the distances are computed.
+            A source is at distance 0 even if it is not walkable (e.g. the tile on which a unit stands).
+        max_dist: The maximum distance to compute (< 0 => no max distance)
+
+    Returns:
+        A (lines x columns) integer matrix containing the distance from the closest source to each tile,
+        or UNREACHABLE if the tile cannot be reached within the maximum distance
+    """
+    frontier = np.zeros(walkable_mask.shape, dtype=bool)
+    for i, j in sources:
+        frontier[i, j] = True
+    return __expand(frontier, walkable_mask, max_dist)
+
+
+def get_distance_fields(walkable_mask: np.ndarray, sources: Sequence[TileIdentifier],
+                        max_dist: int=-1) -> np.ndarray:
+    """
+    Computes the distance field of each source separately, all the fields being expanded together
+
+    Args:
+        walkable_mask: A (lines x columns) boolean matrix that is True for each tile that can be walked on
+        sources: The identifiers of the tiles from which the distances are computed (e.g. the positions of the players)
+        max_dist: The maximum distance to compute (< 0 => no max distance)
+
+    Returns:
+        A (sources x lines x columns) integer array, in which the matrix at index k contains the distance from the
+        k-th source to each tile (see "get_distance_field")
+    """
+    frontier = np.zeros((len(sources),) + walkable_mask.shape, dtype=bool)
+    for k, (i, j) in enumerate(sources):
+        frontier[k, i, j] = True
+    return __expand(frontier, walkable_mask, max_dist)
+
+
+def get_territories(walkable_mask: np.ndarray, sources: Sequence[TileIdentifier]) -> np.ndarray:
+    """
+    Computes the Voronoi territory of each source: the tiles that it reaches strictly before all the other sources
+
+    Args:
+        walkable_mask: A (lines x columns) boolean matrix that is True for each tile that can be walked on
+        sources: The identifiers of the tiles from which the territories start (e.g. the positions of the players)
+
+    Returns:
+        A (lines x columns) integer matrix containing, for each tile, the index of the source that owns it,
+        or NO_OWNER if the tile is unreachable or reached by several sources at the same distance
+    """
+    if len(sources) == 0:
+        return np.full(walkable_mask.shape, NO_OWNER, dtype=np.int32)
+    distances = get_distance_fields(walkable_mask, sources)
+    distances[distances == UNREACHABLE] = np.iinfo(np.int32).max
+    owners = np.argmin(distances, axis=0).astype(np.int32)
+    best_distances = np.min(distances, axis=0)
+    contested = np.count_nonzero(distances == best_distances, axis=0) > 1
+    owners[contested | (best_distances == np.iinfo(np.int32).max)] = NO_OWNER
+    return owners
+
+
+# -------------------- PRIVATE METHODS -------------------- #
+
+def __expand(frontier: np.ndarray, walkable_mask: np.ndarray, max_dist: int) -> np.ndarray:
+    """
+    Args:
+        frontier:
+            A boolean array whose two last dimensions are the lines and the columns of the board, that is True for the
+            sources of the search. The searches of the matrices stacked along the first dimensions are independent.
+        walkable_mask: A (lines x columns) boolean matrix that is True for each tile that can be walked on
+        max_dist: The maximum distance to compute (< 0 => no max distance)
+
+    Returns: An integer array of the same shape, containing the distances reached by the breadth-first searches
+    """
+    distances = np.full(frontier.shape, UNREACHABLE, dtype=np.int32)
+    distances[frontier] = 0
+    unvisited = walkable_mask & ~frontier
+    # The frontier is copied in an array bordered by non-reached tiles, so that the neighbours are given by shifted views
+    padded = np.zeros(frontier.shape[:-2] + (frontier.shape[-2] + 2, frontier.shape[-1] + 2), dtype=bool)
+    padded_frontier = padded[..., 1:-1, 1:-1]
+    padded_frontier[...] = frontier
+    reached = np.empty(frontier.shape, dtype=bool)
+    distance = 0
+    while max_dist < 0 or distance < max_dist:
+        np.logical_or(padded[..., :-2, 1:-1], padded[..., 2:, 1:-1], out=reached)
+        reached |= padded[..., 1:-1, :-2]
+        reached |= padded[..., 1:-1, 2:]
+        reached &= unvisited
+        if not reached.any():
+            break
+        distance += 1
+        unvisited ^= reached
+        distances[reached] = distance
+        padded_frontier[...] = reached
+    return distances
@@ -3,14 +3,14 @@ File containing the Definition of Color (a 3-uple of int) and BoardGraphics that
 represents the graphical part of a Board
 """
 
-from typing import Tuple, List, Union
+import math
+from typing import Tuple, List, Union, Optional, Set
 
 import numpy as np
 import pygame
 from pygame import gfxdraw
-from scipy.spatial import KDTree
 
-from ..utils.geom import dist, Coordinates, get_convex_hull, get_path
+from ..utils.geom import dist, Coordinates
 
 __author__ = 'Anthony Rouneau'
 
@@ -37,6 +37,7 @@ class BoardGraphics:
     _INTERNAL_COLOR = 1
 
     _TILE_LENGTH_EPSILON = 0.1
+    _NO_TILE = -1
 
     def __init__(self, size: Tuple[Width, Height], tiles_borders: list, background_color: Color,
                  border_line_color: Color, centers: List[List[Coordinates]],
@@ -48,7 +49,7 @@ class BoardGraphics:
             tiles_borders: The points that will serve to draw the tiles
             background_color: The color of the background of the board
             border_line_color: The color of the border of the ground
-            centers: The list containing the matrix of centers for the tiles. Used to associate a pixel to a tile.
+            centers: The list containing the matrix of centers for the tiles.
             borders:
                 A list of lines, represented by two points each, representing the borders of the board.
                  (e.g. [((1, 2), (3, 4)), ((0,1), (0,2)), ...])
@@ -64,7 +65,10 @@ class BoardGraphics:
         self._colorMatrix = self._initColorMatrix(len(tiles_borders), len(tiles_borders[0]))
         self._drawMatrix = self._initDrawMatrix(tiles_borders)
         self._columns = len(centers[0])
-        self._kdTree = KDTree(np.array(centers).reshape(1, len(centers) * len(centers[0]), 2)[0])  # type: KDTree
+        self._pixelMap = None  # type: Optional[np.ndarray]  # Index of the tile drawn on each pixel, see "_getPixelMap"
+        self._tilesRects = [self._getBoundingRect(points) for line in self._drawMatrix for points in line]
+        self._surface = None  # type: Optional[pygame.Surface]  # The board, drawn once and kept up to date
+        self._dirtyTiles = set()  # type: Set[Tuple[int, int]]  # Tiles to redraw on the surface of the board
 
     # -------------------- PUBLIC METHODS -------------------- #
 
@@ -129,13 +133,42 @@ class BoardGraphics:
         Args:
             surface: The surface on which draw the board
         """
-        # Using a temporary surface allows to paint only once on the displayed surface (avoid delay between components)
-        surf = pygame.Surface(surface.get_size())
-        self._drawBackground(surf)
+        # Using a surface kept between two calls allows to paint only once on the displayed surface (avoid delay
+        # between components) and to redraw only the tiles that changed
+        self.refreshSurface()
+        surface.blit(self._surface, (0, 0))
+
+    def refreshSurface(self) -> List[pygame.Rect]:
+        """
+        Draws the board on its own surface (see "surface"), or redraws the parts of this surface that changed since
+        the last call if the board was already drawn
+
+        Returns: The rectangles of the surface that were redrawn
+        """
+        if self._surface is None:
+            self._surface = pygame.Surface(self.size)
+            self._drawBackground(self._surface)
+            if self._tilesVisible:
+                self._drawTiles(self._surface)
+            self._drawBorders(self._surface)
+            self._dirtyTiles.clear()
+            return [self._surface.get_rect()]
+        dirty_rects = []
         if self._tilesVisible:
-            self._drawTiles(surf)
-        self._drawBorders(surf)
-        surface.blit(surf, (0, 0))
+            dirty_rects = [self._tilesRects[i * self._columns + j] for i, j in self._dirtyTiles]
+            for rect in dirty_rects:
+                self._redrawRect(self._surface, rect)
+        self._dirtyTiles.clear()
+        return dirty_rects
+
+    @property
+    def surface(self) -> pygame.Surface:
+        """
+        Returns: The surface on which the board is drawn, without the units (see "refreshSurface")
+        """
+        if self._surface is None:
+            self.refreshSurface()
+        return self._surface
 
     def setBordersColor(self, borders_color: Color) -> None:
         """
@@ -145,6 +178,7 @@ class BoardGraphics:
             borders_color: RGB (or RGBA) tuple for the borders color
         """
         self._borderLineColor = borders_color
+        self._surface = None  # The whole board must be redrawn
 
     def setBackgroundColor(self, background_color: Color) -> None:
         """
@@ -154,6 +188,7 @@ class BoardGraphics:
             background_color: RGB (or RGBA) tuple for the background color
         """
         self._backgroundColor = background_color
+        self._surface = None  # The whole board must be redrawn
 
     def setTilesVisible(self, visible: bool) -> None:
         """
@@ -163,6 +198,7 @@ class BoardGraphics:
             visible: True if the tiles must be visible. False otherwise.
         """
         self._tilesVisible = visible
+        self._surface = None  # The whole board must be redrawn
 
     def containsPoint(self, point: Coordinates, i: int, j: int) -> bool:
         """
@@ -175,10 +211,8 @@ class BoardGraphics:
 
         Returns: True if the point is inside and False otherwise
         """
-        points = self._drawMatrix[i][j]
-        convex_hull = get_convex_hull(points)
-        hull_path = get_path(points, convex_hull)
-        return hull_path.contains_point(point)
+        polygon = np.array([self._drawMatrix[i][j]], dtype=float)
+        return bool(self._arePointsInside(polygon, np.array([point[0]]), np.array([point[1]]))[0])
 
     def getTileIdByPixel(self, pixel: Coordinates) -> Union[Tuple[int, int], None]:
         """
@@ -189,14 +223,68 @@ class BoardGraphics:
 
         Returns: The identifier of the tile located on the pixel, or None if there is no tile at this position
         """
-        center_index = self._kdTree.query(pixel, 1)[1]
-        i = center_index // self._columns
-        j = center_index - (self._columns * i)
-        if self.containsPoint(pixel, i, j):
-            return i, j
+        x = math.floor(pixel[0])
+        y = math.floor(pixel[1])
+        pixel_map = self._getPixelMap()
+        if 0 <= y < pixel_map.shape[0] and 0 <= x < pixel_map.shape[1]:
+            tile_index = int(pixel_map[y, x])
+            if tile_index != self._NO_TILE:
+                return divmod(tile_index, self._columns)
 
     # -------------------- PROTECTED METHODS -------------------- #
 
+    def _getPixelMap(self) -> np.ndarray:
+        """
+        Computes, the first time it is needed, the map giving for each pixel (y, x) of the board the index
+        "line * columns + column" of the tile drawn on it (or -1 if there is no tile on the pixel). A pixel on the side
+        shared by two tiles belongs to the last of them.
+
+        Returns: The map of the tiles indexes, at the resolution of the board
+        """
+        if self._pixelMap is None:
+            width, height = int(self.size[0]), int(self.size[1])
+            polygons = np.array(self._drawMatrix, dtype=float).reshape((-1, self.nbrOfSides, 2))
+            # Each tile is checked on the pixels of a box that starts on the top left pixel of the tile
+            top_left_pixels = np.ceil(polygons.min(axis=1) - self._TILE_LENGTH_EPSILON).astype(int)
+            bottom_right_pixels = np.floor(polygons.max(axis=1) + self._TILE_LENGTH_EPSILON).astype(int)
+            box_width, box_height = (bottom_right_pixels - top_left_pixels).max(axis=0) + 1
+            offsets_ys, offsets_xs = np.mgrid[0:box_height, 0:box_width]
+            xs = top_left_pixels[:, 0, np.newaxis, np.newaxis] + offsets_xs
+            ys = top_left_pixels[:, 1, np.newaxis, np.newaxis] + offsets_ys
+            inside = self._arePointsInside(polygons, xs, ys) & (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+            tiles_indexes = np.broadcast_to(np.arange(len(polygons))[:, np.newaxis, np.newaxis], xs.shape)
+            pixel_map = np.full((height, width), self._NO_TILE, dtype=np.int32)
+            np.maximum.at(pixel_map, (ys[inside], xs[inside]), tiles_indexes[inside].astype(np.int32))
+            self._pixelMap = pixel_map
+        return self._pixelMap
+
+    def _arePointsInside(self, polygons: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Checks which points lie inside the given convex polygons (the tiles are regular polygons), by checking that they
+        are on the same side of each side of their polygon as its center. A point on a side is inside the polygon.
+
+        Args:
+            polygons: The points of the polygons, as an array of shape (number of polygons, number of sides, 2)
+            xs: The x coordinates of the points to check, as an array whose first dimension is the polygons
+            ys: The y coordinates of the points to check (same shape as "xs")
+
+        Returns: An array of booleans (same shape as "xs"), True for the points that are inside their polygon
+        """
+        shape = (len(polygons),) + (1,) * (np.ndim(xs) - 1)  # To broadcast the polygons on the points
+        centers = polygons.mean(axis=1)
+        center_xs = centers[:, 0].reshape(shape)
+        center_ys = centers[:, 1].reshape(shape)
+        tolerance = self._TILE_LENGTH_EPSILON * self.sideLength  # Points at less than 0.1 pixel of a side are on it
+        inside = np.ones(np.shape(xs), dtype=bool)
+        for k in range(polygons.shape[1]):
+            x1 = polygons[:, k, 0].reshape(shape)
+            y1 = polygons[:, k, 1].reshape(shape)
+            x2 = polygons[:, (k + 1) % polygons.shape[1], 0].reshape(shape)
+            y2 = polygons[:, (k + 1) % polygons.shape[1], 1].reshape(shape)
+            center_side = np.sign((x2 - x1) * (center_ys - y1) - (y2 - y1) * (center_xs - x1))
+            inside &= ((x2 - x1) * (ys - y1) - (y2 - y1) * (xs - x1)) * center_side >= -tolerance
+        return inside
+
     def _setTilesColor(self, color: Color, i: int, j: int, internal: bool=True):
         """
         Sets the (i, j) tile's border color
@@ -245,6 +333,7 @@ class BoardGraphics:
         temp = internal_color, color
 
         self._colorMatrix[i] = self._colorMatrix[i][:j] + (tuple(temp), ) + self._colorMatrix[i][j+1:]
+        self._dirtyTiles.add((i, j))
 
     def _drawTiles(self, surface: pygame.Surface) -> None:
         """
@@ -255,12 +344,52 @@ class BoardGraphics:
         """
         for i in range(len(self._drawMatrix)):
             for j in range(len(self._drawMatrix[0])):
-                points = self._drawMatrix[i][j]
-                internal_color = self._colorMatrix[i][j][self._INTERNAL_COLOR]
-                border_color = self._colorMatrix[i][j][self._BORDER_COLOR]
-                if internal_color is not None:
-                    gfxdraw.filled_polygon(surface, points, internal_color)
-                gfxdraw.aapolygon(surface, points, border_color)
+                self._drawTile(surface, i, j)
+
+    def _drawTile(self, surface: pygame.Surface, i: int, j: int) -> None:
+        """
+        Draws the tile (i, j) on the given surface
+
+        Args:
+            surface: The surface on which the tile will be drawn
+            i: The row index of the tile
+            j: The column index of the tile
+        """
+        points = self._drawMatrix[i][j]
+        internal_color = self._colorMatrix[i][j][self._INTERNAL_COLOR]
+        border_color = self._colorMatrix[i][j][self._BORDER_COLOR]
+        if internal_color is not None:
+            gfxdraw.filled_polygon(surface, points, internal_color)
+        gfxdraw.aapolygon(surface, points, border_color)
+
+    def _redrawRect(self, surface: pygame.Surface, rect: pygame.Rect) -> None:
+        """
+        Redraws the given rectangle of the board on the given surface, as if the whole board was redrawn
+
+        Args:
+            surface: The surface on which the board is drawn
+            rect: The rectangle to redraw
+        """
+        surface.set_clip(rect)
+        surface.fill(self._backgroundColor, rect)
+        for tile_index in rect.collidelistall(self._tilesRects):
+            self._drawTile(surface, tile_index // self._columns, tile_index % self._columns)
+        self._drawBorders(surface)
+        surface.set_clip(None)
+
+    @staticmethod
+    def _getBoundingRect(points: Tuple[Coordinates, ...]) -> pygame.Rect:
+        """
+        Args:
+            points: The points of a polygon
+
+        Returns: The smallest rectangle containing all the pixels on which the polygon can be drawn
+        """
+        left = math.floor(min(point[0] for point in points))
+        top = math.floor(min(point[1] for point in points))
+        right = math.ceil(max(point[0] for point in points))
+        bottom = math.ceil(max(point[1] for point in points))
+        return pygame.Rect(left, top, right - left + 1, bottom - top + 1)
 
     def _drawBackground(self, surface: pygame.Surface) -> None:
         """
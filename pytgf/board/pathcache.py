@@ -0,0 +1,170 @@
+"""
+File containing the definition of a ShortestPathsCache, that keeps the shortest paths between the tiles of a board
+until the walkability of its tiles changes
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .board import Board, Tile, TileIdentifier
+from .distances import UNREACHABLE
+from .pathfinder import UnreachableDestination
+
+__author__ = 'Anthony Rouneau'
+
+
+class ShortestPathsCache:
+    """
+    Caches the shortest paths between all the pairs of tiles of a board. The distances and the previous tile of each
+    shortest path from a source tile are computed by a breadth-first search the first time that the source is queried,
+    and are stored in two rows of unsigned 16 bits integers (or 32 bits for a board of more than 65535 tiles).
+    The rows are dropped when the topology version of the board changes (i.e. when a tile becomes (non-)deadly or
+    (non-)walkable), so a path query costs, most of the time, the length of the path.
+    """
+
+    def __init__(self, board: Board, walkable_tile_func: Optional[Callable[[Tile], bool]]=None):
+        """
+        Args:
+            board: The board in which the paths are searched
+            walkable_tile_func:
+                A function that take a tile in parameter and that returns True if the given tile can be walked on
+                (None if all the walkable tiles can be walked on). It must only depend on the properties of the tile.
+        """
+        self.board = board
+        self.walkableTileFunc = walkable_tile_func
+        tiles_count = board.lines * board.columns
+        self._dtype = np.uint16 if tiles_count < np.iinfo(np.uint16).max else np.uint32
+        self._noTile = np.iinfo(self._dtype).max  # Distance and previous tile of a tile that cannot be reached
+        self._version = None  # type: Optional[int]
+        self._walkable = []  # type: List[bool]
+        self._rows = {}  # type: Dict[int, Tuple[np.ndarray, np.ndarray]]
+
+    # -------------------- PUBLIC METHODS -------------------- #
+
+    def getDistance(self, source_tile_id: TileIdentifier, dest_tile_id: TileIdentifier) -> int:
+        """
+        Args:
+            source_tile_id: The identifier of the tile from which the path begins
+            dest_tile_id: The identifier of the tile at which the path ends
+
+        Returns: The length of the shortest path between the two tiles, or UNREACHABLE if there is no path
+        """
+        if not (self._isOnBoard(source_tile_id) and self._isOnBoard(dest_tile_id)):
+            return UNREACHABLE
+        distances, _ = self._getRow(self._getIndex(source_tile_id))
+        distance = int(distances[self._getIndex(dest_tile_id)])
+        return UNREACHABLE if distance == self._noTile else distance
+
+    def getShortestPath(self, source_tile_id: TileIdentifier, dest_tile_id: TileIdentifier) -> List[TileIdentifier]:
+        """
+        Same as "pathfinder.get_shortest_path_in_board", with the paths read in the cache
+
+        Args:
+            source_tile_id: The identifier of the tile from which the path begins
+            dest_tile_id: The identifier of the tile at which the path ends
+
+        Returns:
+            The shortest path (list of tile_ids) to travel to reach the destination tile from the source tile,
+            without the source tile
+
+        Raises:
+            UnreachableDestination: If the destination tile cannot be reached from the source tile
+        """
+        if self._isOnBoard(source_tile_id) and self._isOnBoard(dest_tile_id) and source_tile_id != dest_tile_id:
+            source = self._getIndex(source_tile_id)
+            current = self._getIndex(dest_tile_id)
+            distances, previous_tiles = self._getRow(source)
+            if distances[current] != self._noTile:
+                path = []
+                while current != source:
+                    path.append(divmod(current, self.board.columns))
+                    current = int(previous_tiles[current])
+                path.reverse()
+                return path
+        raise UnreachableDestination("The tile " + str(dest_tile_id) + " is unreachable from the tile " +
+                                     str(source_tile_id))
+
+    # -------------------- PROTECTED METHODS -------------------- #
+
+    def _getRow(self, source: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Args:
+            source: The flat index of the source tile
+
+        Returns:
+            The distance from the source to each tile, and the previous tile of each tile in a shortest path from
+            the source, computed if needed
+        """
+        if self._version != self.board.topologyVersion:
+            self._rows = {}
+            self._walkable = self._computeWalkableTiles()
+            self._version = self.board.topologyVersion
+        row = self._rows.get(source)
+        if row is None:
+            row = self._computeRow(source)
+            self._rows[source] = row
+        return row
+
+    def _computeRow(self, source: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Performs a breadth-first search from the given tile
+
+        Args:
+            source: The flat index of the source tile
+
+        Returns:
+            The distance from the source to each tile, and the previous tile of each tile in a shortest path from
+            the source
+        """
+        neighbour_indexes = self.board.getNeighbourIndexes()
+        walkable = self._walkable
+        distances = [self._noTile] * len(neighbour_indexes)
+        previous_tiles = [self._noTile] * len(neighbour_indexes)
+        distances[source] = 0
+        frontier = [source]
+        distance = 0
+        while len(frontier) > 0:
+            distance += 1
+            next_frontier = []
+            for current in frontier:
+                for neighbour in neighbour_indexes[current]:
+                    if distances[neighbour] == self._noTile and walkable[neighbour]:
+                        distances[neighbour] = distance
+                        previous_tiles[neighbour] = current
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        return np.array(distances, dtype=self._dtype), np.array(previous_tiles, dtype=self._dtype)
+
+    def _computeWalkableTiles(self) -> List[bool]:
+        """
+        Returns: A list containing, at the flat index of each tile, True if the tile can be walked on
+        """
+        walkable = []
+        for i in range(self.board.lines):
+            for j in range(self.board.columns):
+                tile = self.board.getTileById((i, j))
+                walkable.append(tile.walkable and (self.walkableTileFunc is None or self.walkableTileFunc(tile)))
+        return walkable
+
+    def _getIndex(self, tile_id: TileIdentifier) -> int:
+        """
+        Args:
+            tile_id: The identifier of a tile of the board
+
+        Returns: The flat index of the tile (see "Board.getNeighbourIndexes")
+        """
+        return tile_id[0] * self.board.columns + tile_id[1]
+
+    def _isOnBoard(self, tile_id: TileIdentifier) -> bool:
+        """
+        Args:
+            tile_id: The identifier of a tile
+
+        Returns: True if the tile is in the board
+        """
+        return 0 <= tile_id[0] < self.board.lines and 0 <= tile_id[1] < self.board.columns
+
+    def __deepcopy__(self, memo={}):
+        # The cached paths are not copied: they will be computed again for the copy of the board
+        return ShortestPathsCache(memo.get(id(self.board), self.board), self.walkableTileFunc)
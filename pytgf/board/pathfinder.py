@@ -1,16 +1,19 @@
 """
 File containing methods that can be used to find shortest paths inside a board.
+As all the moves between two neighbour tiles cost 1, the paths are found by a breadth-first search, or by an A* search
+that stores its frontier in buckets of equal priority, instead of a heap.
 """
 
-from queue import PriorityQueue
-from typing import Callable, Tuple, Dict, List, Optional, Any
+from collections import deque
+from typing import Callable, Tuple, Dict, List, Optional, Any, Hashable, Iterable, Deque
 
-from .board import Tile, TileIdentifier
+from .board import Board, Tile, TileIdentifier
 
 __author__ = 'Anthony Rouneau'
 
 
 Cost = int
+Node = Hashable  # A tile identifier, or the flat index of a tile in a board (i.e. i * columns + j)
 
 
 class UnreachableDestination(Exception):
@@ -42,15 +45,14 @@ def get_shortest_path(source_tile_id, dest_tile_id, get_tile_by_id_func: Callabl
         The cost of this path is equal to the length of this list.
         Returns None if the destination is unreachable
     """
+    dest_i, dest_j = dest_tile_id
 
-    def heuristic(a: TileIdentifier, b: TileIdentifier):
-        if type(a) == type(b) == tuple:
-            (x1, y1) = a
-            (x2, y2) = b
-            return abs(x1 - x2) + abs(y1 - y2)
+    def heuristic(tile_id: TileIdentifier) -> int:
+        return abs(tile_id[0] - dest_i) + abs(tile_id[1] - dest_j)
 
-    came_from, _ = __find_path(dest_tile_id, source_tile_id, get_tile_by_id_func, get_tile_neighbours_func,
-                               walkable_tile_func, heuristic, -1)
+    came_from = __a_star(source_tile_id, dest_tile_id,
+                         lambda tile_id: get_tile_neighbours_func(get_tile_by_id_func(tile_id)),
+                         __get_walkable_func(get_tile_by_id_func, walkable_tile_func), heuristic)
     return reconstruct_path(came_from, source_tile_id, dest_tile_id)
 
 
@@ -60,7 +62,7 @@ def get_shortest_paths(source_tile_id: TileIdentifier, max_dist: int,
                        walkable_tile_function: Callable[[Any, Tile], bool]) \
                                         -> Tuple[Dict[TileIdentifier, TileIdentifier], Dict[TileIdentifier, Cost]]:
     """
-    Uses Dijkstra's algorithm to find all the paths available from the given source tile to any other tile
+    Uses a breadth-first search to find all the paths available from the given source tile to any other tile
     within the given maximum distance.
 
     Args:
@@ -77,8 +79,76 @@ def get_shortest_paths(source_tile_id: TileIdentifier, max_dist: int,
         - A dict containing, for a key being a tile identifier, the previous tile in the path to reach that destination
         - The cost to reach that destination tile
     """
-    return __find_path(None, source_tile_id, get_tile_by_id_func, get_tile_neighbours_func, walkable_tile_function,
-                       None, max_dist)
+    return __breadth_first_search(source_tile_id, None,
+                                  lambda tile_id: get_tile_neighbours_func(get_tile_by_id_func(tile_id)),
+                                  __get_walkable_func(get_tile_by_id_func, walkable_tile_function), max_dist)
+
+
+def get_shortest_path_in_board(board: Board, source_tile_id: TileIdentifier, dest_tile_id: TileIdentifier,
+                               walkable_tile_func: Optional[Callable[[Tile], bool]]=None) -> List[TileIdentifier]:
+    """
+    Same as "get_shortest_path", but the neighbours of the tiles are read in the flat neighbour index of the board
+    instead of being asked to functions.
+
+    Args:
+        board: The board in which the path is searched
+        source_tile_id: The identifier of the tile from which the path finding is started
+        dest_tile_id: The identifier of the tile to which the path finding ends
+        walkable_tile_func:
+            A function that take a tile in parameter and that returns True if the given tile can be walked on
+            (None if all the walkable tiles can be walked on)
+
+    Returns:
+        The shortest path (list of tile_ids) to travel to reach the destination tile from the source tile.
+        The cost of this path is equal to the length of this list.
+
+    Raises:
+        UnreachableDestination: If the destination tile cannot be reached from the source tile
+    """
+    columns = board.columns
+    dest_i, dest_j = dest_tile_id
+
+    def heuristic(index: int) -> int:
+        i, j = divmod(index, columns)
+        return abs(i - dest_i) + abs(j - dest_j)
+
+    source = __get_flat_index(board, source_tile_id)
+    dest = __get_flat_index(board, dest_tile_id)
+    came_from = __a_star(source, dest, board.getNeighbourIndexes().__getitem__,
+                         __get_board_walkable_func(board, walkable_tile_func), heuristic)
+    path = reconstruct_path(came_from, source, dest)
+    return [divmod(index, columns) for index in path]
+
+
+def get_shortest_paths_in_board(board: Board, source_tile_id: TileIdentifier, max_dist: int,
+                                walkable_tile_func: Optional[Callable[[Tile], bool]]=None) \
+                                        -> Tuple[Dict[TileIdentifier, TileIdentifier], Dict[TileIdentifier, Cost]]:
+    """
+    Same as "get_shortest_paths", but the neighbours of the tiles are read in the flat neighbour index of the board
+    instead of being asked to functions.
+
+    Args:
+        board: The board in which the paths are searched
+        source_tile_id: The identifier of the tile from which the path finding is started
+        max_dist: The maximum distance allowed between the source and the destination tile (< 0 => no max distance)
+        walkable_tile_func:
+            A function that take a tile in parameter and that returns True if the given tile can be walked on
+            (None if all the walkable tiles can be walked on)
+
+    Returns:
+        A tuple containing
+
+        - A dict containing, for a key being a tile identifier, the previous tile in the path to reach that destination
+        - The cost to reach that destination tile
+    """
+    columns = board.columns
+    came_from, cost_so_far = __breadth_first_search(__get_flat_index(board, source_tile_id), None,
+                                                    board.getNeighbourIndexes().__getitem__,
+                                                    __get_board_walkable_func(board, walkable_tile_func), max_dist)
+    tile_ids = {index: divmod(index, columns) for index in cost_so_far}
+    tile_ids[None] = None
+    return ({tile_ids[index]: tile_ids[previous] for index, previous in came_from.items()},
+            {tile_ids[index]: cost for index, cost in cost_so_far.items()})
 
 
 def reconstruct_path(came_from: Dict[TileIdentifier, TileIdentifier], source_tile_id: TileIdentifier,
@@ -115,49 +185,135 @@ def reconstruct_path(came_from: Dict[TileIdentifier, TileIdentifier], source_til
 
 # -------------------- PRIVATE METHODS -------------------- #
 
-def __find_path(dest_tile_id: Optional[TileIdentifier], source_tile_id: TileIdentifier,
-                get_tile_by_id_func: Callable[[Any, TileIdentifier], Tile],
-                get_tile_neighbours_func:  Callable[[Any, Tile], List[TileIdentifier]],
-                walkable_tile_function: Callable[[Any, Tile], bool],
-                heuristic: Optional[Callable[[TileIdentifier, TileIdentifier], int]], max_dist: int)\
-                                -> Tuple[Dict[TileIdentifier, TileIdentifier], Dict[TileIdentifier, Cost]]:
+def __breadth_first_search(source: Node, dest: Optional[Node], get_neighbours_func: Callable[[Node], Iterable[Node]],
+                           walkable_func: Callable[[Node], bool], max_dist: int) \
+                                -> Tuple[Dict[Node, Optional[Node]], Dict[Node, Cost]]:
     """
     Args:
-        dest_tile_id: The identifier of the destination of the path (can be None if there is no specific destination).
-        source_tile_id: The identifier of the tile from which the path will begin.
-        get_tile_by_id_func: A callable that, given a tile identifier returns a Tile
-        get_tile_neighbours_func: A callable that takes a tile and returns its neighbours
-        walkable_tile_function: A callable that returns True if the given tile is walkable, and False otherwise.
-        heuristic: A callable that, given two tiles identifier, returns the estimated distance between them.
-        max_dist: The maximum distance that can separate the source tile from the farthest destination in the path.
+        source: The node from which the paths begin
+        dest: The node at which the search stops (None to explore all the nodes within the maximum distance)
+        get_neighbours_func: A callable that returns the neighbours of the given node
+        walkable_func: A callable that returns True if the given node can be walked on
+        max_dist: The maximum cost of a path (< 0 => no max distance)
 
     Returns:
         A tuple containing
 
-        - A dictionary that links a destination with the tile that came before in the path.
+        - A dictionary that links a destination with the node that came before in the path.
         - A dictionary that links a destination with the cost to reach it.
-
     """
-    frontier = PriorityQueue()
-    frontier.put(source_tile_id, 0)
-    came_from = {}
-    cost_so_far = {source_tile_id: 0}
-    came_from[source_tile_id] = None
-    while not frontier.empty():
-        current = frontier.get()
-
-        if dest_tile_id is not None and current == dest_tile_id:
+    came_from = {source: None}  # type: Dict[Node, Optional[Node]]
+    cost_so_far = {source: 0}  # type: Dict[Node, Cost]
+    blocked = set()
+    frontier = deque((source,))  # type: Deque[Node]
+    while len(frontier) > 0:
+        current = frontier.popleft()
+        if current == dest:
             break
-        for next_tile_id in get_tile_neighbours_func(get_tile_by_id_func(current)):
-            new_cost = cost_so_far[current] + 1  # Cost just one more because all the cost in the graph == 1
-            next_tile = get_tile_by_id_func(next_tile_id)
-            if next_tile.walkable and (walkable_tile_function is None or walkable_tile_function(next_tile)) \
-                    and (next_tile_id not in cost_so_far or new_cost < cost_so_far[next_tile_id]):
-                cost_so_far[next_tile_id] = new_cost
-                priority = new_cost
-                if heuristic is not None:
-                    priority += heuristic(dest_tile_id, next_tile_id)
-                if max_dist < 0 or new_cost < max_dist:
-                    frontier.put(next_tile_id, priority)
-                came_from[next_tile_id] = current
+        new_cost = cost_so_far[current] + 1  # Cost just one more because all the cost in the graph == 1
+        expand = max_dist < 0 or new_cost < max_dist
+        for next_node in get_neighbours_func(current):
+            if next_node not in cost_so_far and next_node not in blocked:
+                if walkable_func(next_node):
+                    # The nodes are reached in increasing cost order: the first path found is a shortest one
+                    cost_so_far[next_node] = new_cost
+                    came_from[next_node] = current
+                    if expand:
+                        frontier.append(next_node)
+                else:
+                    blocked.add(next_node)
     return came_from, cost_so_far
+
+
+def __a_star(source: Node, dest: Node, get_neighbours_func: Callable[[Node], Iterable[Node]],
+             walkable_func: Callable[[Node], bool], heuristic: Callable[[Node], int]) -> Dict[Node, Optional[Node]]:
+    """
+    Args:
+        source: The node from which the path begins
+        dest: The node at which the path ends
+        get_neighbours_func: A callable that returns the neighbours of the given node
+        walkable_func: A callable that returns True if the given node can be walked on
+        heuristic: A callable that returns an estimation of the cost from the given node to the destination
+
+    Returns: A dictionary that links a node with the node that came before in the path.
+    """
+    came_from = {source: None}  # type: Dict[Node, Optional[Node]]
+    cost_so_far = {source: 0}  # type: Dict[Node, Cost]
+    blocked = set()
+    min_priority = heuristic(source)
+    buckets = [deque((source,))]  # type: List[Deque[Node]]  # buckets[k] holds the nodes of priority min_priority + k
+    k = 0
+    while k < len(buckets):
+        bucket = buckets[k]
+        while len(bucket) > 0:
+            current = bucket.pop()
+            current_cost = cost_so_far[current]
+            if current_cost + heuristic(current) != min_priority + k:
+                continue  # A cheaper path to this node was found after it was put in this bucket
+            if current == dest:
+                return came_from
+            new_cost = current_cost + 1  # Cost just one more because all the cost in the graph == 1
+            for next_node in get_neighbours_func(current):
+                if next_node in blocked or (next_node in cost_so_far and new_cost >= cost_so_far[next_node]):
+                    continue
+                if not walkable_func(next_node):
+                    blocked.add(next_node)
+                    continue
+                cost_so_far[next_node] = new_cost
+                came_from[next_node] = current
+                index = max(new_cost + heuristic(next_node) - min_priority, k)
+                while len(buckets) <= index:
+                    buckets.append(deque())
+                buckets[index].append(next_node)
+        k += 1
+    return came_from
+
+
+def __get_walkable_func(get_tile_by_id_func: Callable[[TileIdentifier], Tile],
+                        walkable_tile_func: Optional[Callable[[Tile], bool]]) -> Callable[[TileIdentifier], bool]:
+    """
+    Args:
+        get_tile_by_id_func: A callable that, given a tile identifier returns a Tile
+        walkable_tile_func: A callable that returns True if the given tile is walkable (can be None)
+
+    Returns: A callable that returns True if the tile with the given identifier can be walked on
+    """
+    def walkable(tile_id: TileIdentifier) -> bool:
+        tile = get_tile_by_id_func(tile_id)
+        return tile.walkable and (walkable_tile_func is None or walkable_tile_func(tile))
+    return walkable
+
+
+def __get_board_walkable_func(board: Board, walkable_tile_func: Optional[Callable[[Tile], bool]]) \
+        -> Callable[[int], bool]:
+    """
+    Args:
+        board: The board in which the path is searched
+        walkable_tile_func: A callable that returns True if the given tile is walkable (can be None)
+
+    Returns: A callable that returns True if the tile with the given flat index can be walked on
+    """
+    columns = board.columns
+    get_tile_by_id_func = board.getTileById
+
+    def walkable(index: int) -> bool:
+        tile = get_tile_by_id_func(divmod(index, columns))
+        return tile.walkable and (walkable_tile_func is None or walkable_tile_func(tile))
+    return walkable
+
+
+def __get_flat_index(board: Board, tile_id: TileIdentifier) -> int:
+    """
+    Args:
+        board: The board containing the tile
+        tile_id: The identifier of the tile
+
+    Returns: The index of the tile in the flat neighbour index of the board
+
+    Raises:
+        UnreachableDestination: If the tile is not in the board
+    """
+    i, j = tile_id
+    if not (0 <= i < board.lines and 0 <= j < board.columns):
+        raise UnreachableDestination("The tile " + str(tile_id) + " is not in the board")
+    return i * board.columns + j
@@ -1 +1,5 @@
 from .simultaneous_alphabeta import SimultaneousAlphaBeta
+from .transposition import TranspositionTable
+from .evaluation import BatchEvaluator
+from .ordering import MoveOrdering
+from .mcts import MonteCarloTreeSearch, PlayoutPolicy
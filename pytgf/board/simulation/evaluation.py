@@ -0,0 +1,57 @@
+"""
+File containing the definition of a BatchEvaluator, that evaluates many states in one call, using NumPy
+"""
+
+from abc import ABCMeta, abstractmethod
+from typing import List
+
+import numpy as np
+
+from ...game import API
+
+__author__ = 'Anthony Rouneau'
+
+
+class BatchEvaluator(metaclass=ABCMeta):
+    """
+    Evaluates the leaves of a search by batches instead of one by one: each leaf state is first encoded into a vector,
+    and the vectors of the leaves are stacked into a matrix, evaluated by one call to "evaluateBatch".
+    This amortizes the Python overhead of the evaluation, and allows vectorized heuristics or learned models.
+    """
+
+    def encodeState(self, state: API) -> np.ndarray:
+        """
+        Encodes a state into a vector. Can be overridden to keep only what the evaluation needs.
+
+        Args:
+            state: The state to encode
+
+        Returns:
+            By default, the byte codes of the board (see "API.getBoardByteCodes"), row by row, followed by the alive
+            status, the row and the column of each player, in the order of "API.getPlayerNumbers"
+            (a dead player is located at (-1, -1))
+        """
+        players = []
+        for player_number in state.getPlayerNumbers():
+            if state.isPlayerAlive(player_number):
+                row, column = state.getPlayerLocation(player_number)
+                players.extend((1, row, column))
+            else:
+                players.extend((0, -1, -1))
+        return np.concatenate((np.asarray(state.getBoardByteCodes(), dtype=np.float32).ravel(),
+                               np.asarray(players, dtype=np.float32)))
+
+    @abstractmethod
+    def evaluateBatch(self, encoded_states: np.ndarray, player_numbers: List[int]) -> np.ndarray:
+        """
+        Evaluates a batch of states
+
+        Args:
+            encoded_states: The stacked encoded states (one row per state, see "encodeState")
+            player_numbers: The numbers of the players to evaluate, in the order of the columns of the result
+
+        Returns:
+            A matrix with one row per state and one column per player, containing the score of each player in each
+            state (as the dicts returned by the evaluation functions of the searches)
+        """
+        pass
@@ -0,0 +1,358 @@
+"""
+File containing the definition of a Monte Carlo Tree Search, an alternative to the alpha beta for the games in which
+the number of combinations of moves is too high to explore the tree exhaustively
+"""
+
+import math
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from ...characters.moves import MoveDescriptor
+from ...game import API
+from ...game.turnbased import TurnBasedAPI
+
+__author__ = 'Anthony Rouneau'
+
+Combination = Dict[int, MoveDescriptor]  # The moves of the players, linked to their number
+CombinationKey = Tuple[Tuple[int, MoveDescriptor], ...]  # A hashable version of a combination
+
+
+class PlayoutPolicy:
+    """
+    Chooses the moves performed during the playouts (the simulations made from the leaves of the tree until the end of
+    the game). The default policy chooses uniformly at random among the feasible moves.
+    Override "chooseMove" to make the playouts more realistic (e.g. by avoiding the suicidal moves).
+    """
+
+    def chooseMove(self, state: API, player_number: int, feasible_moves: List[MoveDescriptor]) -> MoveDescriptor:
+        """
+        Args:
+            state: The state from which the move will be performed
+            player_number: The number of the player that must move
+            feasible_moves: The moves that the player can perform (at least one)
+
+        Returns: The move performed by the player during the playout
+        """
+        return random.choice(feasible_moves)
+
+
+class MCTSNode:
+    """
+    A node of the tree built by a MonteCarloTreeSearch. Each player that acts in the node keeps its own statistics
+    for each of its moves (decoupled UCT). In a turn-based game, only the current player acts.
+    """
+
+    __slots__ = ["stateHash", "visits", "movesStatistics", "children", "isTerminal"]
+
+    def __init__(self, state_hash: int, feasible_moves: Dict[int, List[MoveDescriptor]], is_terminal: bool):
+        """
+        Instantiates a node that has never been visited
+
+        Args:
+            state_hash: The hash of the state represented by the node (see "API.__hash__")
+            feasible_moves: The feasible moves of each player that acts in the state
+            is_terminal: True if the state is a final state
+        """
+        self.stateHash = state_hash
+        self.visits = 0
+        # The number of visits and the sum of the rewards of each move, for each acting player
+        self.movesStatistics = {}  # type: Dict[int, Dict[MoveDescriptor, List[float]]]
+        for player_number, moves in feasible_moves.items():
+            self.movesStatistics[player_number] = {move: [0, 0.] for move in moves}
+        self.children = {}  # type: Dict[CombinationKey, MCTSNode]
+        self.isTerminal = is_terminal
+
+    def getMostVisitedMove(self, player_number: int) -> Optional[MoveDescriptor]:
+        """
+        Args:
+            player_number: The number of the player for which the move is wanted
+
+        Returns: The move of the given player that was explored the most, or None if the player does not act here
+        """
+        statistics = self.movesStatistics.get(player_number)
+        if not statistics:
+            return None
+        max_visits = max(visits for visits, _ in statistics.values())
+        return random.choice([move for move, (visits, _) in statistics.items() if visits == max_visits])
+
+
+class MonteCarloTreeSearch:
+    """
+    Implementation of a Monte Carlo Tree Search that uses the simulation methods of the API.
+
+        - In a TurnBasedAPI, only the current player acts in a node, and the search is a classic UCT.
+        - Otherwise, all the alive players act simultaneously, and each one chooses its move independently using
+          its own statistics (decoupled UCT).
+
+    The search is anytime: it can be stopped after a time or a number of iterations, and the tree can be reused by the
+    next search, if the new state was explored.
+    """
+
+    def __init__(self, possible_actions: Union[Tuple[MoveDescriptor, ...], List[MoveDescriptor]],
+                 eval_fct: Optional[Callable[[API], Dict[int, float]]]=None,
+                 playout_policy: Optional[PlayoutPolicy]=None,
+                 exploration: float=math.sqrt(2), max_playout_depth: int=-1, time_budget: Optional[float]=None,
+                 max_iterations: Optional[int]=None, reuse_tree: bool=True):
+        """
+        Args:
+            possible_actions: The tuple of possible actions accepted in the game for all players
+            eval_fct:
+                Gives the reward of each player (between 0 and 1) for a state that is not final, reached at the end of
+                a playout interrupted by "max_playout_depth" (optional, 0.5 for every player by default)
+            playout_policy: Chooses the moves performed during the playouts (optional, random moves by default)
+            exploration: The exploration constant of the UCB1 formula
+            max_playout_depth: The maximum number of turns simulated by a playout (-1 = until the end of the game)
+            time_budget: The time (in seconds) that a search can take by default
+            max_iterations: The number of iterations that a search can make by default
+            reuse_tree:
+                If True, the tree built by a search is kept, and the next search starts from the node of its state,
+                if this node was created by the previous search
+        """
+        self.possibleActions = possible_actions
+        self.eval = eval_fct
+        self.playoutPolicy = playout_policy if playout_policy is not None else PlayoutPolicy()
+        self.exploration = exploration
+        self.maxPlayoutDepth = max_playout_depth
+        if self.maxPlayoutDepth == -1:  # If there is no maximum depth...
+            self.maxPlayoutDepth = float('inf')
+        self.timeBudget = time_budget
+        self.maxIterations = max_iterations
+        self.reuseTree = reuse_tree
+        self._root = None  # type: MCTSNode
+        self._iterationsCount = 0
+        self._nodesCount = 0
+        self._reusedVisits = 0
+
+    # -------------------- PUBLIC METHODS -------------------- #
+
+    def monteCarloSearching(self, player_number: int, state: API, time_budget: Optional[float]=None,
+                            max_iterations: Optional[int]=None) -> MoveDescriptor:
+        """
+        Searches the best move for the given player, until the time budget or the number of iterations is reached
+        (at least one iteration is made). If none of them is given, nor in the constructor, 1000 iterations are made.
+
+        Args:
+            player_number: The number of the player for which a move must be found
+            state: The current state of the game
+            time_budget: The time (in seconds) that the search can take (optional, "time_budget" of the constructor)
+            max_iterations:
+                The number of iterations that the search can make (optional, "max_iterations" of the constructor)
+
+        Returns: The move of the given player that was explored the most
+        """
+        if time_budget is None:
+            time_budget = self.timeBudget
+        if max_iterations is None:
+            max_iterations = self.maxIterations
+        if time_budget is None and max_iterations is None:
+            max_iterations = 1000
+        deadline = time.time() + time_budget if time_budget is not None else None
+        state = state.snapshot()  # The iterations are made in place, on a copy without graphics of the given state
+        self._iterationsCount = 0
+        self._nodesCount = 0
+        root = self._findReusableRoot(state) if self.reuseTree else None
+        if root is None:
+            root = self._createNode(state)
+        self._reusedVisits = root.visits
+        self._root = root
+        while self._iterationsCount == 0 or \
+                ((max_iterations is None or self._iterationsCount < max_iterations) and
+                 (deadline is None or time.time() < deadline)):
+            self._iterate(state, root)
+            self._iterationsCount += 1
+        move = root.getMostVisitedMove(player_number)
+        if not self.reuseTree:
+            self._root = None
+        if move is None:
+            feasible_moves = state.checkFeasibleMoves(player_number, self.possibleActions)
+            return random.choice(feasible_moves if len(feasible_moves) > 0 else list(self.possibleActions))
+        return move
+
+    def getSearchStatistics(self) -> Dict[str, int]:
+        """
+        Returns:
+            The number of iterations made and of nodes created by the last call to "monteCarloSearching", and the
+            number of visits of its root that were made by the previous searches (reused tree)
+        """
+        return {"iterations": self._iterationsCount, "nodes": self._nodesCount, "reused_visits": self._reusedVisits}
+
+    def resetTree(self) -> None:
+        """
+        Forgets the tree built by the previous searches
+        """
+        self._root = None
+
+    # -------------------- PROTECTED METHODS -------------------- #
+
+    def _iterate(self, state: API, root: MCTSNode) -> None:
+        """
+        Makes one iteration of the search: selects a path in the tree, expands it with a new node, simulates a playout
+        from this node, and updates the statistics of the path with the rewards of the playout.
+        All the moves performed in the given state are undone at the end of the iteration.
+
+        Args:
+            state: The state of the root, in which the moves are performed
+            root: The root of the tree
+        """
+        node = root
+        path = []  # type: List[Tuple[MCTSNode, Combination]]
+        rewards = None
+        records_count = state.game.journal.getRecordsCount()
+        try:
+            # Selection and expansion
+            while not node.isTerminal:
+                combination = self._selectCombination(node)
+                if not state.performMoves(combination, record=True):
+                    rewards = self._getRewards(state)  # Unexpected unfeasible combination: the walk stops here
+                    break
+                path.append((node, combination))
+                key = self._getCombinationKey(combination)
+                child = node.children.get(key)
+                if child is None:
+                    child = self._createNode(state)
+                    node.children[key] = child
+                    node = child
+                    break
+                node = child
+            # Simulation
+            if rewards is None:
+                self._playout(state)
+                rewards = self._getRewards(state)
+        finally:  # All the moves performed are undone, even if the iteration is interrupted by an exception
+            while state.game.journal.getRecordsCount() > records_count:
+                state.undoMove()
+        # Backpropagation
+        node.visits += 1
+        for path_node, combination in path:
+            path_node.visits += 1
+            for player_number, move in combination.items():
+                move_statistics = path_node.movesStatistics[player_number][move]
+                move_statistics[0] += 1
+                move_statistics[1] += rewards.get(player_number, 0)
+
+    def _selectCombination(self, node: MCTSNode) -> Combination:
+        """
+        Args:
+            node: The node in which the combination is selected
+
+        Returns:
+            The combination made of the move chosen by each acting player, using the UCB1 formula on its own
+            statistics (the moves never explored are chosen first)
+        """
+        combination = {}
+        log_visits = math.log(node.visits) if node.visits > 0 else 0
+        for player_number, statistics in node.movesStatistics.items():
+            best_moves = []
+            best_value = -float('inf')
+            for move, (visits, total_reward) in statistics.items():
+                if visits == 0:
+                    value = float('inf')
+                else:
+                    value = total_reward / visits + self.exploration * math.sqrt(log_visits / visits)
+                if value > best_value:
+                    best_value = value
+                    best_moves = [move]
+                elif value == best_value:
+                    best_moves.append(move)
+            combination[player_number] = random.choice(best_moves)
+        return combination
+
+    def _playout(self, state: API) -> int:
+        """
+        Simulates the end of the game from the given state, using the playout policy
+
+        Args:
+            state: The state from which the playout starts (modified in place)
+
+        Returns: The number of moves performed in the state, which must be undone
+        """
+        performed_moves = 0
+        while performed_moves < self.maxPlayoutDepth and not state.isFinished():
+            combination = {}
+            for player_number, feasible_moves in self._getFeasibleMoves(state).items():
+                if len(feasible_moves) > 0:
+                    combination[player_number] = self.playoutPolicy.chooseMove(state, player_number, feasible_moves)
+            if len(combination) == 0 or not state.performMoves(combination, record=True):
+                break
+            performed_moves += 1
+        return performed_moves
+
+    def _getRewards(self, state: API) -> Dict[int, float]:
+        """
+        Args:
+            state: The state reached at the end of an iteration
+
+        Returns:
+            The reward of each player: 1 for a win, 0 for a loss and 0.5 for a draw if the game is finished, or the
+            value given by the evaluation function otherwise
+        """
+        if state.isFinished():
+            winners = [player_number for player_number in state.getPlayerNumbers() if state.hasWon(player_number)]
+            if len(winners) == 0:
+                return {player_number: 0.5 for player_number in state.getPlayerNumbers()}
+            return {player_number: float(player_number in winners) for player_number in state.getPlayerNumbers()}
+        if self.eval is not None:
+            return self.eval(state)
+        return {player_number: 0.5 for player_number in state.getPlayerNumbers()}
+
+    def _createNode(self, state: API) -> MCTSNode:
+        """
+        Args:
+            state: The state represented by the new node
+
+        Returns: A new node for the given state
+        """
+        self._nodesCount += 1
+        if state.isFinished():
+            return MCTSNode(hash(state), {}, True)
+        feasible_moves = {player_number: moves for player_number, moves in self._getFeasibleMoves(state).items()
+                          if len(moves) > 0}
+        return MCTSNode(hash(state), feasible_moves, len(feasible_moves) == 0)
+
+    def _getFeasibleMoves(self, state: API) -> Dict[int, List[MoveDescriptor]]:
+        """
+        Args:
+            state: The state in which the players act
+
+        Returns: The feasible moves of each player that acts in the given state
+        """
+        if isinstance(state, TurnBasedAPI):
+            acting_players = [state.getCurrentPlayer()]
+        else:
+            acting_players = state.getAlivePlayersNumbers()
+        return {player_number: state.checkFeasibleMoves(player_number, self.possibleActions)
+                for player_number in acting_players}
+
+    def _findReusableRoot(self, state: API) -> Optional[MCTSNode]:
+        """
+        Looks for the node of the given state in the tree of the previous search. As the other players may have played
+        since then, the node is looked for in the first levels of the tree.
+
+        Args:
+            state: The state for which a new search is launched
+
+        Returns: The node of the given state, or None if it was not explored by the previous search
+        """
+        if self._root is None:
+            return None
+        state_hash = hash(state)
+        nodes = [self._root]
+        for _ in range(len(state.getPlayerNumbers()) + 1):
+            next_nodes = []
+            for node in nodes:
+                if node.stateHash == state_hash:
+                    return node
+                next_nodes.extend(node.children.values())
+            nodes = next_nodes
+        return None
+
+    @staticmethod
+    def _getCombinationKey(combination: Combination) -> CombinationKey:
+        """
+        Args:
+            combination: The moves of the players, linked to their number
+
+        Returns: A hashable version of the combination, used to find the child in which it leads
+        """
+        return tuple(sorted(combination.items()))
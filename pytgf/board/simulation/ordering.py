@@ -0,0 +1,174 @@
+"""
+File containing the definition of a MoveOrdering, that decides in which order a search explores the combinations
+of moves, so that the best ones (which cause the most cutoffs) are explored first
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+
+from ...characters.moves import MoveDescriptor
+
+__author__ = 'Anthony Rouneau'
+
+Combination = Dict[int, MoveDescriptor]  # The moves of the players, linked to their number
+
+
+class MoveOrdering:
+    """
+    Orders the combinations of moves using, by order of priority:
+
+        - the principal variation: the best combination found for the state by a previous search
+        - the killer combinations: the last combinations that caused a cutoff at the same depth
+        - the history heuristic: how much each move of each player, keyed by (player number, move), caused cutoffs
+
+    The combinations with the same priority keep their order (which can be random).
+    Override "getScore" to order the combinations differently.
+    """
+
+    def __init__(self, nb_killers: int=2):
+        """
+        Instantiates a move ordering without any knowledge
+
+        Args:
+            nb_killers: The number of killer combinations kept for each depth
+        """
+        self.nbKillers = nb_killers
+        self._killers = {}  # type: Dict[int, List[Combination]]
+        self._history = {}  # type: Dict[Tuple[int, MoveDescriptor], int]
+
+    # -------------------- PUBLIC METHODS -------------------- #
+
+    def orderCombinations(self, actions_combinations: List[List[Combination]], depth: int, player_number: int,
+                          principal_variation: Optional[Combination]=None) -> None:
+        """
+        Sorts the given combinations in place, from the most to the least promising
+
+        Args:
+            actions_combinations:
+                The combinations of moves to sort, grouped by move of the player for which the search is made
+                (see "SimultaneousAlphaBeta._groupMovesList"). The groups are sorted using the move of
+                this player, and the combinations inside a group are sorted using the moves of the other players.
+            depth: The depth of the state in the searched tree
+            player_number: The number of the player for which the search is made
+            principal_variation: The best combination found for this state by a previous search, if any
+        """
+        for combinations in actions_combinations:
+            combinations.sort(key=lambda combination: self.getScore(combination, depth, player_number,
+                                                                    principal_variation, own_move=False),
+                              reverse=True)
+        actions_combinations.sort(key=lambda combinations: self.getScore(combinations[0], depth, player_number,
+                                                                         principal_variation, own_move=True),
+                                  reverse=True)
+
+    def orderMoves(self, moves: List[MoveDescriptor], depth: int, player_number: int, moving_player: int,
+                   principal_variation: Optional[Combination]=None) -> None:
+        """
+        Sorts the given moves of one player in place, from the most to the least promising, so that the combinations
+        can be generated lazily in a promising order (see "getPriorityCombinations")
+
+        Args:
+            moves: The moves of the player to sort
+            depth: The depth of the state in the searched tree
+            player_number: The number of the player for which the search is made
+            moving_player: The number of the player that performs the moves
+            principal_variation: The best combination found for this state by a previous search, if any
+        """
+        own_move = moving_player == player_number
+        moves.sort(key=lambda move: self.getScore({moving_player: move}, depth, player_number, principal_variation,
+                                                  own_move=own_move),
+                   reverse=True)
+
+    def getPriorityCombinations(self, depth: int, player_number: int, own_move: MoveDescriptor,
+                                principal_variation: Optional[Combination]=None) -> List[Combination]:
+        """
+        Args:
+            depth: The depth of the state in the searched tree
+            player_number: The number of the player for which the search is made
+            own_move: The move of the player for which the search is made
+            principal_variation: The best combination found for this state by a previous search, if any
+
+        Returns:
+            The known combinations containing the given move that must be explored before the others: the principal
+            variation, then the killer combinations. They can be unfeasible in the current state.
+        """
+        priority_combinations = []
+        if principal_variation is not None and principal_variation.get(player_number) == own_move:
+            priority_combinations.append(principal_variation)
+        for killer in self._killers.get(depth, ()):
+            if killer.get(player_number) == own_move and killer not in priority_combinations:
+                priority_combinations.append(killer)
+        return priority_combinations
+
+    def getScore(self, combination: Combination, depth: int, player_number: int,
+                 principal_variation: Optional[Combination], own_move: bool) -> Tuple[bool, bool, int]:
+        """
+        Args:
+            combination: The combination to score
+            depth: The depth of the state in the searched tree
+            player_number: The number of the player for which the search is made
+            principal_variation: The best combination found for this state by a previous search, if any
+            own_move:
+                If True, only the move of the player for which the search is made is scored.
+                Otherwise, only the moves of the other players are scored.
+
+        Returns: A sortable score (the greater, the sooner the combination is explored)
+        """
+        killers = self._killers.get(depth, ())
+        if own_move:
+            move = combination.get(player_number)
+            is_principal = principal_variation is not None and principal_variation.get(player_number) == move
+            is_killer = any(killer.get(player_number) == move for killer in killers)
+            history = self._history.get((player_number, move), 0)
+        else:
+            is_principal = combination == principal_variation
+            is_killer = combination in killers
+            history = sum([self._history.get((other_player, move), 0) for other_player, move in combination.items()
+                           if other_player != player_number])
+        return is_principal, is_killer, history
+
+    def registerCutoff(self, combination: Combination, depth: int, remaining_depth: Union[int, float],
+                       player_numbers: List[int]) -> None:
+        """
+        Remembers that the given combination caused a cutoff
+
+        Args:
+            combination: The combination that caused the cutoff
+            depth: The depth of the state in the searched tree
+            remaining_depth: The depth that remained to be explored below the state (deep cutoffs weigh more)
+            player_numbers: The players of which the moves caused the cutoff
+        """
+        killers = self._killers.setdefault(depth, [])
+        if combination not in killers:
+            killers.insert(0, combination)
+            del killers[self.nbKillers:]
+        weight = (min(remaining_depth, 30) + 1) ** 2
+        for player_number in player_numbers:
+            if player_number in combination:
+                key = (player_number, combination[player_number])
+                self._history[key] = self._history.get(key, 0) + weight
+
+    def merge(self, other: 'MoveOrdering') -> None:
+        """
+        Adds what another ordering learned to this one (e.g. an ordering used by another process during the same
+        search): its killers are inserted after the killers of this ordering, and the greatest history weight of each
+        move is kept
+
+        Args:
+            other: The ordering to merge into this one
+        """
+        for depth, other_killers in other._killers.items():
+            killers = self._killers.setdefault(depth, [])
+            for killer in other_killers:
+                if killer not in killers:
+                    killers.append(killer)
+            del killers[self.nbKillers:]
+        for key, weight in other._history.items():
+            if weight > self._history.get(key, 0):
+                self._history[key] = weight
+
+    def startSearch(self) -> None:
+        """
+        Prepares the ordering for a new search: the killers, which depend on the searched tree, are forgotten and the
+        history is aged, so that the recent cutoffs weigh more than the old ones
+        """
+        self._killers = {}
+        self._history = {key: value // 2 for key, value in self._history.items() if value > 1}
@@ -4,13 +4,22 @@ for all the players
 """
 
 import itertools
+import logging
 import random
-from typing import List, Dict, Union, Callable, TypeVar, Tuple
+import time
+from typing import List, Dict, Union, Callable, TypeVar, Tuple, Any, Optional, Iterator, Iterable, NamedTuple
 
+import multiprocess
+import multiprocess.pool
 import numpy as np
 
+from .evaluation import BatchEvaluator
+from .ordering import MoveOrdering
+from .transposition import TranspositionTable, TranspositionEntry, EXACT, LOWER_BOUND, UPPER_BOUND
 from ...characters.moves import MoveDescriptor
+from ...characters.utils.moves import getMovesCombinations, combinationToDict
 from ...game import API
+from ...utils.zobrist import get_zobrist_key
 
 __author__ = 'Anthony Rouneau'
 
@@ -18,17 +27,67 @@ Value = Union[int, float]
 T = TypeVar('T')
 EndState = Tuple[bool, int, bool]
 
-_RetValue = Tuple[Value, Union[Dict[int, MoveDescriptor], None], EndState, Union[API, None], bool]
+_logger = logging.getLogger(__name__)
+
+StateDescription = Any  # What the search keeps about an explored state (see "_describeState")
+_RetValue = Tuple[Value, Union[Dict[int, MoveDescriptor], None], EndState, Union[StateDescription, None], bool]
+# The combinations of moves containing the same move ("ownMove") for the player for which the search is made, as
+# tuples holding the move of each player of "players" (the player for which the search is made comes first)
+MovesGroup = NamedTuple('MovesGroup', [('players', Tuple[int, ...]), ('ownMove', MoveDescriptor),
+                                       ('combinations', Iterable[Tuple[MoveDescriptor, ...]])])
+
+
+class SearchTimeoutException(Exception):
+    """
+    Exception raised when the time budget of a search is exhausted before the search is completed
+    """
+    pass
+
+
+_workerAlphaBeta = None  # The copy of the alpha beta used by a worker process of a parallel search
+_sharedAlpha = None  # The alpha bound of the root of a parallel search, shared by all the worker processes
+
+
+def _initialize_worker(alpha_beta: 'SimultaneousAlphaBeta', shared_alpha) -> None:
+    """
+    Initializes a worker process of a parallel search
+
+    Args:
+        alpha_beta: The alpha beta that launched the worker process
+        shared_alpha: The alpha bound shared by all the worker processes
+    """
+    global _workerAlphaBeta, _sharedAlpha
+    _workerAlphaBeta = alpha_beta
+    _sharedAlpha = shared_alpha
+
+
+def _search_root_groups(state: API, groups: List[MovesGroup], player_number: int,
+                        search_depth: Union[int, float], deadline: Optional[float], move_ordering: MoveOrdering,
+                        transposition_entries: List[TranspositionEntry]):
+    """
+    Searches a part of the root of a parallel search, in a worker process
+    (see "SimultaneousAlphaBeta._searchRootGroups")
+    """
+    return _workerAlphaBeta._searchRootGroups(state, groups, player_number, search_depth, deadline, _sharedAlpha,
+                                              move_ordering, transposition_entries)
 
 
 class SimultaneousAlphaBeta:
     """
-    Implementation of a cutoff AlphaBeta algorithm that performs the moves of all the players simultaneously
+    Implementation of a cutoff AlphaBeta algorithm that performs the moves of all the players simultaneously.
+    The tree is walked on the given state itself: the moves are performed in place, and undone after being explored.
     """
 
+    # Set to True by a subclass that overrides "_generateMovesList" to filter the combinations: the search then
+    # explores the list it returns instead of generating the combinations lazily
+    _FILTERS_MOVES_LIST = False
+
     def __init__(self, eval_fct: Callable[[API], Dict[int, Value]],
                  possible_actions: Union[Tuple[MoveDescriptor, ...], List[MoveDescriptor]],
-                 max_depth: int = 6, turn_based: bool = False, must_hash_states: bool=True):
+                 max_depth: int = 6, turn_based: bool = False, must_hash_states: bool=True,
+                 transposition_table: Optional[TranspositionTable]=None, time_budget: Optional[float]=None,
+                 move_ordering: Optional[MoveOrdering]=None, nb_workers: int=1,
+                 batch_evaluator: Optional[BatchEvaluator]=None):
         """
 
         Args:
@@ -43,6 +102,27 @@ class SimultaneousAlphaBeta:
             possible_actions: The tuple of possible actions accepted in the game for all players
             max_depth: the maximum depth of the tree the algorithm can explore
             must_hash_states: If True, will store states in order to cut off the already-made computations 
+            transposition_table:
+                The table in which the states are stored if "must_hash_states" is True (optional).
+                Several alpha betas using the same evaluation function can share the same table.
+            time_budget:
+                The time (in seconds) that a call to "alphaBetaSearching" can take by default (optional).
+                If a time budget is given, the search is iteratively deepened until "max_depth" or the budget is
+                reached (see "alphaBetaSearching").
+            move_ordering:
+                Decides in which order the combinations of moves are explored (optional, a MoveOrdering by default)
+            nb_workers:
+                The number of processes that search the tree in parallel (optional, 1 by default = no parallelism).
+                If greater than 1, the combinations of the root are split between the worker processes, that share
+                the alpha bound of the root. The worker processes are created at the first search, with a copy of this
+                alpha beta, and are kept until "close" is called. A search launched in a daemonic process (e.g. in a
+                bot process of a MainLoop) cannot create processes, and is therefore not parallel.
+            batch_evaluator:
+                Evaluates the leaves of the tree by batches (optional). If given, at the maximum depth, the leaves
+                reached by all the combinations containing the same move of the player are encoded and evaluated in
+                one call, instead of calling "eval_fct" for each of them ("eval_fct" is still used for the final states
+                reached before the maximum depth). As these leaves cannot be cut off anymore, this is worth it when
+                the evaluation is much slower than the simulation of a move (e.g. a learned model).
         """
         self.eval = eval_fct
         self.maxDepth = max_depth
@@ -58,25 +138,54 @@ class SimultaneousAlphaBeta:
         self._playerMapping = {}
         self._prepared = False
         self._currentlyTestedAction = None
-        self._mustHash = must_hash_states
-        self._storedStates = {}  # type: Dict[Tuple[Tuple[int, ...], ...], _RetValue]
+        self.transpositionTable = None  # type: Optional[TranspositionTable]
+        if must_hash_states:
+            self.transpositionTable = transposition_table if transposition_table is not None \
+                else TranspositionTable()
+        self.timeBudget = time_budget
+        self.reachedDepth = None  # The depth of the deepest search completed by the last call to "alphaBetaSearching"
+        self._searchDepth = self.maxDepth  # The maximum depth of the current iteration
+        self._deadline = None  # The time at which the current iteration must be interrupted (None = no deadline)
+        self._principalVariation = None  # The best combination found by the previous iteration
+        self.moveOrdering = move_ordering if move_ordering is not None else MoveOrdering()
+        self._nodesCount = 0
+        self._maxCutoffsCount = 0
+        self._minCutoffsCount = 0
+        self.nbWorkers = nb_workers
+        self._workersPool = None  # type: multiprocess.pool.Pool
+        self._sharedAlpha = None
+        self._rootAlpha = None  # The alpha bound shared by the processes of a parallel search, in a worker process
+        self.batchEvaluator = batch_evaluator
 
     # -------------------- PUBLIC METHODS -------------------- #
 
-    def alphaBetaSearching(self, player_number: int, state: API) -> MoveDescriptor:
+    def alphaBetaSearching(self, player_number: int, state: API, time_budget: Optional[float]=None) \
+            -> MoveDescriptor:
         """
         :param player_number: The number of the player for which an action must be found
         :param state: The current state of the game (including the current player)
         :type state: API
+        :param time_budget:
+            The time (in seconds) that the search can take (optional, "time_budget" of the constructor by default).
+            If there is a budget, the search is iteratively deepened, from the depth 0 to the maximum depth, and
+            the action found by the deepest completed iteration is returned (the first iteration is always completed)
         :return: the best action among the possible ones
         """
         if not self._prepared:
             self._prepare(player_number, state)
-        if self._storedStates.get(state.getBoardByteCodes()) is not None:
-            val = self._storedStates[state.getBoardByteCodes()]
-            actions = val[1]
+        state = state.snapshot()  # The search is made in place, on a copy without graphics of the given state
+        self.moveOrdering.startSearch()
+        self._nodesCount = 0
+        self._maxCutoffsCount = 0
+        self._minCutoffsCount = 0
+        if time_budget is None:
+            time_budget = self.timeBudget
+        if time_budget is None:
+            self._searchDepth = self.maxDepth
+            _, actions, _, _, _ = self._searchRoot(state)
+            self.reachedDepth = self.maxDepth
         else:
-            _, actions, _, _, _ = self._maxValue(state, -float('inf'), float('inf'), 0)
+            actions = self._deepenIteratively(state, time_budget)
         self.playerNumber = None
         self._prepared = False
         if actions is not None:
@@ -84,6 +193,34 @@ class SimultaneousAlphaBeta:
         else:
             return random.choice(self.possibleActions)
 
+    def getSearchStatistics(self) -> Dict[str, int]:
+        """
+        Returns:
+            The number of max nodes explored by the last call to "alphaBetaSearching", and the number of cutoffs
+            that occurred in the max nodes and in the min nodes
+        """
+        return {"nodes": self._nodesCount, "max_cutoffs": self._maxCutoffsCount,
+                "min_cutoffs": self._minCutoffsCount}
+
+    def close(self) -> None:
+        """
+        Stops the worker processes of the parallel search, if any (they are created again by the next search).
+        Must be called when a parallel alpha beta is not used anymore.
+        """
+        if self._workersPool is not None:
+            # Not terminated: the signal handlers of pygame could prevent the workers from stopping
+            self._workersPool.close()
+            self._workersPool.join()
+            self._workersPool = None
+            self._sharedAlpha = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_workersPool"] = None  # The worker processes belong to the process that created them
+        state["_sharedAlpha"] = None
+        state["_rootAlpha"] = None
+        return state
+
     def _prepare(self, player_number: int, state: API):
         self._currentMoveSequence = np.ndarray((len(state.getAlivePlayersNumbers()), 0))
         ordered_list = state.getPlayerNumbers().copy()
@@ -94,6 +231,173 @@ class SimultaneousAlphaBeta:
 
     # -------------------- PROTECTED METHODS -------------------- #
 
+    def _deepenIteratively(self, state: API, time_budget: float) -> Union[Dict[int, MoveDescriptor], None]:
+        """
+        Searches the given state with an increasing maximum depth, until the maximum depth of this alpha beta is
+        reached or the time budget is exhausted. Each iteration explores the best combination found by the previous
+        one first.
+
+        Args:
+            state: The state for which the best combination of moves must be found
+            time_budget: The time (in seconds) that the search can take
+
+        Returns: The best combination of moves found by the deepest completed iteration
+        """
+        deadline = time.time() + time_budget
+        actions = None
+        self._principalVariation = None
+        self.reachedDepth = None
+        search_depth = 0
+        while search_depth <= self.maxDepth and (search_depth == 0 or time.time() < deadline):
+            self._searchDepth = search_depth
+            if search_depth > 0:  # The first iteration must not be interrupted, to find at least one action
+                self._deadline = deadline
+            try:
+                _, iteration_actions, _, _, _ = self._searchRoot(state)
+            except SearchTimeoutException:  # The moves of the interrupted iteration have been undone on the way up
+                break
+            finally:
+                self._deadline = None
+            self.reachedDepth = search_depth
+            if iteration_actions is None:  # No combination is feasible from this state, whatever the depth
+                break
+            actions = iteration_actions
+            self._principalVariation = iteration_actions
+            search_depth += 1
+        self._principalVariation = None
+        self._searchDepth = self.maxDepth
+        return actions
+
+    def _searchRoot(self, state: API) -> _RetValue:
+        """
+        Searches the given state, which is the root of the tree, in parallel if this alpha beta has several workers
+
+        Args:
+            state: The state for which the best combination of moves must be found
+
+        Returns: The same values as "_maxValue"
+        """
+        if self.nbWorkers <= 1 or multiprocess.current_process().daemon or state.isFinished():
+            return self._maxValue(state, -float('inf'), float('inf'), 0)
+        if self._deadline is not None and time.time() > self._deadline:
+            raise SearchTimeoutException()
+        self._nodesCount += 1
+        # The groups are pickled to be sent to the workers, so the combinations of the root are generated here
+        actions_combinations = [group._replace(combinations=list(group.combinations))
+                                for group in self._generateMovesCombinations(state, 0, self._principalVariation)]
+        pool = self._getWorkersPool()
+        self._sharedAlpha.value = -float('inf')
+        # The groups are dealt like cards, so that each worker starts with one of the most promising moves
+        parts = [actions_combinations[i::self.nbWorkers] for i in range(self.nbWorkers)]
+        # The workers keep their transposition table between the tasks: they are only sent what this search learned
+        # since the last exchange, and send back what they learned during the task
+        transposition_entries = self.transpositionTable.takeNewEntries() if self.transpositionTable is not None \
+            else []
+        results = [pool.apply_async(_search_root_groups, (state, groups, self.playerNumber, self._searchDepth,
+                                                          self._deadline, self.moveOrdering, transposition_entries))
+                   for groups in parts if len(groups) > 0]
+        max_value = -float('inf')
+        equally_good_choices = []  # type: List[Tuple[Dict[int, MoveDescriptor], bool]]
+        end_state = (False, 0, False)
+        interrupted = False
+        for result in results:
+            groups_results, statistics, move_ordering, transposition_entries = result.get()
+            self.moveOrdering.merge(move_ordering)
+            if self.transpositionTable is not None:
+                self.transpositionTable.storeEntries(transposition_entries)
+            self._nodesCount += statistics["nodes"]
+            self._maxCutoffsCount += statistics["max_cutoffs"]
+            self._minCutoffsCount += statistics["min_cutoffs"]
+            if groups_results is None:
+                interrupted = True
+                continue
+            for min_value, min_actions, new_end_state, best_reached_end in groups_results:
+                if min_actions is None:  # None of the combinations of the group is feasible
+                    continue
+                end_state = self._evaluateEndState(end_state, new_end_state)
+                if min_value > max_value:
+                    max_value = min_value
+                    equally_good_choices = [(min_actions, best_reached_end)]
+                elif min_value == max_value:
+                    equally_good_choices.append((min_actions, best_reached_end))
+        if interrupted:
+            raise SearchTimeoutException()
+        if len(equally_good_choices) == 0:  # No choice is good to take...
+            return self._getTeamScore(state, self.eval(state)), None, \
+                (state.isFinished(), 0, state.hasWon(self.playerNumber)), None, False
+        best_combination, best_reached_end = random.choice(equally_good_choices)
+        return max_value, best_combination, end_state, None, best_reached_end
+
+    def _searchRootGroups(self, state: API, groups: List[MovesGroup], player_number: int,
+                          search_depth: Union[int, float], deadline: Optional[float], shared_alpha,
+                          move_ordering: MoveOrdering, transposition_entries: List[TranspositionEntry]) \
+            -> Tuple[Optional[List[Tuple[Value, Dict[int, MoveDescriptor], EndState, bool]]], Dict[str, int],
+                     MoveOrdering, List[TranspositionEntry]]:
+        """
+        Explores the given groups of combinations of the root, in a worker process of a parallel search
+
+        Args:
+            state: The root of the tree (a copy owned by the worker process)
+            groups: The groups of combinations to explore (see "_generateMovesCombinations")
+            player_number: The number of the player for which the search is made
+            search_depth: The maximum depth of the search
+            deadline: The time at which the search must be interrupted (None = no deadline)
+            shared_alpha: The alpha bound of the root, shared by all the worker processes
+            move_ordering: The move ordering of the search that sent the groups, as it was when they were sent
+            transposition_entries:
+                The entries stored in the transposition table of the search that sent the groups since the last time
+                it sent some to the workers
+
+        Returns:
+            The value, best combination, end state and end indicator of each explored group (None if the search was
+            interrupted), the statistics of the worker (see "getSearchStatistics"), and the move ordering and the
+            entries stored in the transposition table of the worker during this task, to be merged into the search
+            that sent the groups
+        """
+        self._prepare(player_number, state)
+        self.moveOrdering = move_ordering
+        if self.transpositionTable is not None:
+            self.transpositionTable.storeEntries(transposition_entries)
+            self.transpositionTable.takeNewEntries()  # The search that sent them already knows them
+        self._nodesCount = 0
+        self._maxCutoffsCount = 0
+        self._minCutoffsCount = 0
+        self._searchDepth = search_depth
+        self._deadline = deadline
+        self._rootAlpha = shared_alpha
+        results = []
+        try:
+            for group in groups:
+                self._currentlyTestedAction = group.ownMove
+                min_value, min_actions, end_state, _, best_reached_end = \
+                    self._minValue(state, group, shared_alpha.value, float('inf'), 0)
+                results.append((min_value, min_actions, end_state, best_reached_end))
+                with shared_alpha.get_lock():
+                    if min_value > shared_alpha.value:
+                        shared_alpha.value = min_value
+        except SearchTimeoutException:
+            results = None
+        finally:
+            self._deadline = None
+            self._rootAlpha = None
+            self._prepared = False
+        transposition_entries = self.transpositionTable.takeNewEntries() if self.transpositionTable is not None \
+            else []
+        return results, self.getSearchStatistics(), self.moveOrdering, transposition_entries
+
+    def _getWorkersPool(self) -> multiprocess.pool.Pool:
+        """
+        Returns: The pool of worker processes of the parallel search, created if needed
+        """
+        if self._workersPool is None:
+            if self.transpositionTable is not None:
+                # The workers start with a copy of the table: only the entries stored from now on are exchanged
+                self.transpositionTable.trackNewEntries()
+            self._sharedAlpha = multiprocess.Value('d', -float('inf'))
+            self._workersPool = multiprocess.Pool(self.nbWorkers, initializer=_initialize_worker,
+                                     initargs=(self, self._sharedAlpha))
+        return self._workersPool
+
     @property
     def _mustCutOff(self) -> bool:
         """
@@ -119,41 +423,61 @@ class SimultaneousAlphaBeta:
                     - A bool set to True if the action has reached a end state
                     - An int indicating the depth at which the game ended (0 if the game hasn't ended yet)
                     - A bool set to True if the player for which this AB is launched had won when the game ended
-              - The API that represents the game after the best move
+              - The description of the state of the game after the best move (see "_describeState")
 
         """
-        # Check if we reached the end of the tree
-        if depth > self.maxDepth:
+        if self._deadline is not None and time.time() > self._deadline:
+            raise SearchTimeoutException()
+        self._nodesCount += 1
+        # Check if the game state is final (even at the end of the tree, a win or a loss must be seen)
+        if state.isFinished():
             score = self._getTeamScore(state, self.eval(state))
-            return score, None, (False, depth - 1, False), state, False
-        # Check if the game state is final
-        elif state.isFinished():
+            return score, None, (True, depth - 1, state.hasWon(self.playerNumber)), None, True
+        # Check if we reached the end of the tree
+        elif depth > self._searchDepth:
             score = self._getTeamScore(state, self.eval(state))
-            return score, None, (True, depth - 1, state.hasWon(self.playerNumber)), state, True
-        hashable_state = state.getBoardByteCodes()
+            return score, None, (False, depth - 1, False), None, False
         # If we already made the computations, no need to do more
-        if self._storedStates.get(hashable_state) is not None:
-            return self._storedStates[hashable_state]
+        key = None
+        best_move_hint = None
+        if self.transpositionTable is not None:
+            key = self._getTranspositionKey(state)
+            entry = self.transpositionTable.probe(key)
+            if entry is not None:
+                if entry.depth >= self._searchDepth - depth and (entry.bound == EXACT or
+                                                             (entry.bound == LOWER_BOUND and entry.value > beta) or
+                                                             (entry.bound == UPPER_BOUND and entry.value <= alpha)):
+                    return entry.value, entry.bestMove, entry.endState, None, entry.reachedEnd
+                best_move_hint = entry.bestMove
+        if depth == 0 and self._principalVariation is not None:
+            best_move_hint = self._principalVariation
+        original_alpha = alpha
         # Initializing the best values
         max_value = -float('inf')
-        equally_good_choices = []  # type: List[Tuple[Dict[int, MoveDescriptor], API, bool]]
+        equally_good_choices = []  # type: List[Tuple[Dict[int, MoveDescriptor], StateDescription, bool]]
         end_state = (False, 0, False)
         # Explore every possible actions from this point
-        actions_combinations = self._generateMovesCombinations(state)
-        random.shuffle(actions_combinations)
-        actions_combinations_scores = {}  # type: Dict[float, Tuple[Dict[int, MoveDescriptor], API, bool]]
+        actions_combinations = self._generateMovesCombinations(state, depth, best_move_hint)
+        actions_combinations_scores = {}  # type: Dict[float, Tuple[Dict[int, MoveDescriptor], StateDescription, bool]]
         for actions in actions_combinations:
             intermediate_state = state
             if depth == 0:
-                self._currentlyTestedAction = actions[0][self.playerNumber]
+                self._currentlyTestedAction = actions.ownMove
             min_value, min_actions, new_end_state, min_game_state, best_reached_end = \
                 self._minValue(intermediate_state, actions, alpha, beta, depth)
+            if min_actions is None:  # None of the combinations of the group is feasible
+                continue
             end_state = self._evaluateEndState(end_state, new_end_state)
             actions_combinations_scores[min_value] = min_actions, min_game_state, best_reached_end
             if self._mustCutOff and min_value > beta:  # Cutoff
+                self._maxCutoffsCount += 1
+                if min_actions is not None:
+                    self.moveOrdering.registerCutoff(min_actions, depth, self._searchDepth - depth,
+                                                     [self.playerNumber])
                 ret_val = min_value, min_actions, end_state, min_game_state, best_reached_end
-                if best_reached_end and self._mustHash:
-                    self._storedStates[min_game_state.getBoardByteCodes()] = ret_val
+                if key is not None:
+                    self.transpositionTable.store(key, self._searchDepth - depth, min_value, LOWER_BOUND, min_actions,
+                                                  end_state, best_reached_end)
                 return ret_val
             alpha = max(alpha, min_value)
         for score in actions_combinations_scores:
@@ -164,15 +488,76 @@ class SimultaneousAlphaBeta:
             elif score == max_value:
                 equally_good_choices.append((combination, new_game_state, best_reached_end))
         if len(equally_good_choices) == 0:  # No choice is good to take...
-            print("no choice is good to take")
+            _logger.debug("No feasible combination of moves at depth %s: the state is evaluated as a leaf", depth)
             return self._getTeamScore(state, self.eval(state)), None, \
                 (state.isFinished(), depth, state.hasWon(self.playerNumber)), None, False
         best_combination, best_game_state, best_reached_end = random.choice(equally_good_choices)
         ret_val = max_value, best_combination, end_state, best_game_state, best_reached_end
-        if best_reached_end and self._mustHash:
-            self._storedStates[best_game_state.getBoardByteCodes()] = ret_val
+        if key is not None:
+            bound = UPPER_BOUND if self._mustCutOff and max_value <= original_alpha else EXACT
+            self.transpositionTable.store(key, self._searchDepth - depth, max_value, bound, best_combination, end_state,
+                                          best_reached_end)
         return ret_val
 
+    def _minValueOfLeaves(self, state: API, actions: MovesGroup, alpha: float, depth: int) \
+            -> _RetValue:
+        """
+        Computes the possibilities of the other players when all the states they lead to are leaves, evaluating these
+        leaves in one batch (see "BatchEvaluator").
+        This trades the cutoffs for the batch: all the leaves are simulated and evaluated, even those that a cutoff
+        would have skipped. When the batch comes back with a value lower than alpha, the cutoff is still counted and
+        registered in the move ordering, so that the ordering of the upper levels keeps learning from the leaves.
+        The leaves that finish the game are evaluated by the evaluation function and end the game, as in "_maxValue".
+
+        Args:
+            state: The state of the current node
+            actions: The combinations of moves containing the same move for the player of this alpha beta
+            alpha: The alpha bound of the current node
+            depth: The current depth in the tree
+
+        Returns: The same values as "_minValue"
+        """
+        combinations = []  # type: List[Tuple[Dict[int, MoveDescriptor], StateDescription, bool]]
+        values = []  # type: List[Value]  # NaN for the leaves evaluated in the batch
+        end_state = (False, 0, False)
+        encoded_states = []
+        for moves in actions.combinations:
+            combination = combinationToDict(actions.players, moves)
+            if self._performMoves(combination, state):
+                try:
+                    self._nodesCount += 1
+                    finished = state.isFinished()
+                    if finished:
+                        values.append(self._getTeamScore(state, self.eval(state)))
+                        end_state = self._evaluateEndState(end_state,
+                                                           (True, depth, state.hasWon(self.playerNumber)))
+                    else:
+                        values.append(float('nan'))
+                        encoded_states.append(self.batchEvaluator.encodeState(state))
+                        end_state = self._evaluateEndState(end_state, (False, depth, False))
+                    combinations.append((combination, self._describeState(state, finished), finished))
+                finally:
+                    state.undoMove()
+        if len(combinations) == 0:  # None of the combinations is feasible
+            return float('inf'), None, (False, 0, False), None, False
+        values = np.array(values, dtype=float)
+        if len(encoded_states) > 0:
+            player_numbers = state.getPlayerNumbers()
+            own_team = np.array([player_number == self.playerNumber or
+                                 state.belongsToSameTeam(player_number, self.playerNumber)
+                                 for player_number in player_numbers])
+            scores = np.asarray(self.batchEvaluator.evaluateBatch(np.stack(encoded_states), player_numbers))
+            values[np.isnan(values)] = scores[:, own_team].sum(axis=1)
+        min_value = float(values.min())
+        min_actions, new_game_state, best_reached_end = \
+            random.choice([combinations[i] for i in np.flatnonzero(values == min_value)])
+        if self._mustCutOff and min_value < alpha:  # The other combinations would have been cut off
+            self._minCutoffsCount += 1
+            self.moveOrdering.registerCutoff(min_actions, depth, self._searchDepth - depth,
+                                             [player_number for player_number in min_actions
+                                              if player_number != self.playerNumber])
+        return min_value, min_actions, end_state, new_game_state, best_reached_end
+
     @staticmethod
     def _evaluateEndState(current_end_state: EndState, new_end_state: EndState) -> EndState:
         """
@@ -204,14 +589,14 @@ class SimultaneousAlphaBeta:
                 return False, 0, False
         return current_end_state
 
-    def _minValue(self, state: API, actions: List[Dict[int, MoveDescriptor]], alpha: float, beta: float, depth: int) \
-            -> _RetValue:
+    def _minValue(self, state: API, actions: MovesGroup, alpha: float, beta: float, depth: int) -> _RetValue:
         """
-        Computes the possibilities of the other players, simulating the action of every players at the same time
+        Computes the possibilities of the other players, simulating the action of every players at the same time.
+        The combinations are pulled one by one from the group, and the rest of them is never generated after a cutoff.
 
         Args:
             state: The state of the current node
-            actions:
+            actions: The combinations of moves containing the same move for the player of this alpha beta
             alpha: The alpha bound that allows to cutoff some branches
             beta: The beta bound that allows to cutoff some branches
             depth: The current depth in the tree
@@ -225,17 +610,25 @@ class SimultaneousAlphaBeta:
                     - A bool set to True if the action has reached a end state
                     - An int indicating the depth at which the game ended (0 if the game hasn't ended yet)
                     - A bool set to True if the player for which this AB is launched had won when the game ended
-              - The API that represents the game after the best move
+              - The description of the state of the game after the best move (see "_describeState")
+            The best action combination is None if none of the combinations is feasible.
         """
+        if self.batchEvaluator is not None and depth == self._searchDepth:  # All the next states are leaves
+            return self._minValueOfLeaves(state, actions, alpha, depth)
         min_value = float('inf')
-        equal_min_choices = []  # type: List[Tuple[Dict[int, MoveDescriptor], API, bool]]
+        equal_min_choices = []  # type: List[Tuple[Dict[int, MoveDescriptor], StateDescription, bool]]
         end_state = (False, 0, False)
-        for combination in actions:
-            simulation_combination = combination
-            feasible_moves, new_game_state = self._simulateMoves(simulation_combination, state)
-            if feasible_moves and new_game_state is not None:
-                value, _, new_end_state, game_state, best_reached_end = \
-                                        self._maxValue(new_game_state, alpha, beta, depth + 1)
+        for moves in actions.combinations:
+            if depth == 0 and self._rootAlpha is not None:  # The other worker processes may have raised alpha
+                alpha = max(alpha, self._rootAlpha.value)
+            combination = combinationToDict(actions.players, moves)  # Only the explored combinations are converted
+            if self._performMoves(combination, state):
+                try:  # The moves are undone even if the search is interrupted
+                    value, _, new_end_state, game_state, best_reached_end = \
+                                            self._maxValue(state, alpha, beta, depth + 1)
+                    new_game_state = self._describeState(state, best_reached_end)
+                finally:
+                    state.undoMove()
                 end_state = self._evaluateEndState(end_state, new_end_state)
                 if value < min_value:
                     min_value = value
@@ -243,20 +636,53 @@ class SimultaneousAlphaBeta:
                 elif value == min_value:
                     equal_min_choices.append((combination, new_game_state, best_reached_end))
                 if self._mustCutOff and value < alpha:  # Cutoff because we are in a min situation
+                    self._minCutoffsCount += 1
+                    self.moveOrdering.registerCutoff(combination, depth, self._searchDepth - depth,
+                                                     [player_number for player_number in combination
+                                                      if player_number != self.playerNumber])
                     best_combination, new_game_state, best_reached_end = random.choice(equal_min_choices)
-                    ret_val = value, best_combination, end_state, new_game_state, best_reached_end
-                    if best_reached_end and self._mustHash:
-                        self._storedStates[new_game_state.getBoardByteCodes()] = ret_val
-                    return ret_val
+                    return value, best_combination, end_state, new_game_state, best_reached_end
                 beta = min(beta, value)
+        if len(equal_min_choices) == 0:  # None of the combinations is feasible
+            return min_value, None, end_state, None, False
         min_actions, new_game_state, best_reached_end = random.choice(equal_min_choices)
-        ret_val = min_value, min_actions, end_state, new_game_state, best_reached_end
-        if best_reached_end and self._mustHash:
-            self._storedStates[new_game_state.getBoardByteCodes()] = ret_val
-        return ret_val
+        return min_value, min_actions, end_state, new_game_state, best_reached_end
 
-    def _simulateMoves(self, simulation_combination, state):
-        return state.simulateMoves(simulation_combination)
+    def _performMoves(self, combination: Dict[int, MoveDescriptor], state: API) -> bool:
+        """
+        Performs the given combination of moves in the given state, so that they can be undone with "state.undoMove"
+
+        Args:
+            combination: The moves to perform, linked to the number of the player performing them
+            state: The state in which the moves are performed
+
+        Returns: True if the moves were feasible and performed, False otherwise (in which case nothing was performed)
+        """
+        return state.performMoves(combination, record=True)
+
+    def _describeState(self, state: API, reached_end: bool) -> StateDescription:
+        """
+        As the state is modified in place during the search, computes what must be kept about the given state.
+
+        Args:
+            state: The state currently explored
+            reached_end: True if the best moves from this state reach an end state
+
+        Returns:
+            The hash of the state, that identifies the state reached by the best moves (override to keep more)
+        """
+        return hash(state)
+
+    def _getTranspositionKey(self, state: API) -> int:
+        """
+        Args:
+            state: The state currently explored
+
+        Returns:
+            The key of the state in the transposition table. The values depend on the player for which the search is
+            made, so it is part of the key.
+        """
+        return hash(state) ^ get_zobrist_key(("searching player", self.playerNumber))
 
     def _getActionsList(self, actions: Dict[int, MoveDescriptor], state: API) -> np.ndarray:
         """
@@ -302,60 +728,126 @@ class SimultaneousAlphaBeta:
             A list of dictionaries
             (e.g. {1: 2, 2: 3} indicates that the player 1 chose the action "2" and the player 2 chose the action "3")
         """
-        players = state.getPlayerNumbers()
-        moves = self._getPossibleMoves(players, state)
-        temp = itertools.product(*moves)
-        dicts = [dict(choices) for choices in temp]
+        combinations = getMovesCombinations({player_number: self._getPossibleMovesForPlayer(player_number, state)
+                                             for player_number in self._getAlivePlayers(state)})
         if self.turnByTurn:
-            unfeasible = []
-            for moves in dicts:
-                succeeded, _ = state.simulateMoves(moves)
-                if not succeeded:
-                    unfeasible.append(moves)
-            dicts = [dicts[i] for i in range(len(dicts)) if dicts[i] not in unfeasible]
-        return dicts
+            combinations = [combination for combination in combinations
+                            if self._isCombinationFeasible(state, combination)]
+        return combinations
+
+    def _isCombinationFeasible(self, state: API, combination: Dict[int, MoveDescriptor]) -> bool:
+        """
+        Args:
+            state: The state in which the combination would be performed
+            combination: The moves of the players, linked to their number
+
+        Returns: True if all the moves of the combination can be performed in the given state
+        """
+        if self._performMoves(combination, state):
+            state.undoMove()
+            return True
+        return False
+
+    @staticmethod
+    def _getAlivePlayers(state: API) -> List[int]:
+        """
+        Args:
+            state: The state for which the movements will be evaluated
 
-    def _generateMovesCombinations(self, state: API) -> List[List[Dict[int, MoveDescriptor]]]:
+        Returns: The numbers of the players that are still alive in the given state
         """
-        Generates all the possible combinations of movements for the given state, and arrange them into a list of list 
-        structure
+        return [player_number for player_number in state.getPlayerNumbers()
+                if state.game.avatars[player_number].isAlive()]
+
+    def _generateMovesCombinations(self, state: API, depth: int=0,
+                                   principal_variation: Optional[Dict[int, MoveDescriptor]]=None) -> List[MovesGroup]:
+        """
+        Generates the possible combinations of movements for the given state, grouped by move of the player concerned
+        in this alpha beta, from the most to the least promising (see "MoveOrdering").
+        The combinations of a group are generated lazily, while they are explored: the moves of each player are
+        ordered once, and the combinations are pulled from their product after the known good combinations.
+        Unfeasible combinations (e.g. in a turn-based game) are only detected when they are performed.
 
         Args:
             state: The state for which the movements will be evaluated
+            depth: The depth of the state in the searched tree
+            principal_variation: The best combination found for this state by a previous search, if any
 
         Returns:
-            A list of lists of dictionaries
-            (e.g. {1: 2, 2: 3} indicates that the player 1 chose the action "2" and the player 2 chose the action "3")
-            The list contains lists, containing all the dictionaries containing the same actions for the player
-            concerned in this alpha beta. (e.g. [[{1: 2, 2: 3}, {1: 2, 2: 1}] , [{1: 3, 2: 3}, {1: 3, 2: 2}]])
+            A list of groups of combinations, each containing the same move for the player concerned in this alpha
+            beta (e.g. the group (players=(1, 2), ownMove=2, combinations=((2, 3), (2, 1))) contains the combinations
+            {1: 2, 2: 3} and {1: 2, 2: 1})
         """
-        dicts = self._generateMovesList(state)
-        order_dicts = {}
-        for dico in dicts:
-            if self.playerNumber in dico:
-                if dico[self.playerNumber] not in order_dicts:
-                    order_dicts[dico[self.playerNumber]] = [dico]
-                else:
-                    order_dicts[dico[self.playerNumber]].append(dico)
-        res = [order_dicts[key] for key in order_dicts]
-        return res
+        alive_players = self._getAlivePlayers(state)
+        if self.playerNumber not in alive_players:
+            return []
+        players = tuple([self.playerNumber] + [player_number for player_number in alive_players
+                                               if player_number != self.playerNumber])
+        if self._FILTERS_MOVES_LIST:
+            return self._groupMovesList(state, players, depth, principal_variation)
+        # The moves are shuffled, so that the moves that the ordering cannot separate are chosen randomly
+        players_moves = [self._getPossibleMovesForPlayer(player_number, state) for player_number in players]
+        for player_number, moves in zip(players, players_moves):
+            self.moveOrdering.orderMoves(moves, depth, self.playerNumber, player_number, principal_variation)
+        return [MovesGroup(players, own_move, self._iterGroupCombinations(players, players_moves, own_move, depth,
+                                                                          principal_variation))
+                for own_move in players_moves[0]]
+
+    def _iterGroupCombinations(self, players: Tuple[int, ...], players_moves: List[List[MoveDescriptor]],
+                               own_move: MoveDescriptor, depth: int,
+                               principal_variation: Optional[Dict[int, MoveDescriptor]]) \
+            -> Iterator[Tuple[MoveDescriptor, ...]]:
+        """
+        Lazily generates the combinations of a group (see "_generateMovesCombinations")
+
+        Args:
+            players: The numbers of the players, in the order of their slot in the combinations
+            players_moves: The ordered moves of each player, in the same order
+            own_move: The move of the player concerned in this alpha beta, contained in all the combinations
+            depth: The depth of the state in the searched tree
+            principal_variation: The best combination found for this state by a previous search, if any
 
-    def _getPossibleMoves(self, players: List[int], state: API) -> List[Tuple[int, MoveDescriptor]]:
+        Returns:
+            An iterator of tuples, containing the move of each player: the priority combinations of the move ordering
+            that are possible in this state first, then the other combinations
+        """
+        priority_combinations = []
+        for combination in self.moveOrdering.getPriorityCombinations(depth, self.playerNumber, own_move,
+                                                                      principal_variation):
+            if len(combination) == len(players) and \
+                    all(combination.get(player_number, ()) in moves
+                        for player_number, moves in zip(players, players_moves)):
+                priority_combinations.append(tuple([combination[player_number] for player_number in players]))
+        yield from priority_combinations
+        for other_moves in itertools.product(*players_moves[1:]):
+            combination = (own_move,) + other_moves
+            if combination not in priority_combinations:
+                yield combination
+
+    def _groupMovesList(self, state: API, players: Tuple[int, ...], depth: int,
+                        principal_variation: Optional[Dict[int, MoveDescriptor]]) -> List[MovesGroup]:
         """
-        Generate all the possible moves for the players
+        Groups the combinations filtered by a subclass (see "_FILTERS_MOVES_LIST") like "_generateMovesCombinations"
 
         Args:
-            players: The list of player numbers for which generate the moves
-            state: The API for which the move will be generated
+            state: The state for which the movements will be evaluated
+            players: The numbers of the players, in the order of their slot in the combinations
+            depth: The depth of the state in the searched tree
+            principal_variation: The best combination found for this state by a previous search, if any
 
-        Returns: A list containing couples [player_number, move_descriptor]
+        Returns: The same groups as "_generateMovesCombinations", with combinations that are already generated
         """
-        moves = []
-        for player_number in [player for player in players if state.game.avatars[player].isAlive()]:
-            possible_moves_for_player = self._getPossibleMovesForPlayer(player_number, state)
-            moves.append(itertools.product([player_number],
-                                           possible_moves_for_player))
-        return moves
+        groups = {}  # type: Dict[MoveDescriptor, List[Dict[int, MoveDescriptor]]]
+        for combination in self._generateMovesList(state):
+            if len(combination) == len(players):
+                groups.setdefault(combination[self.playerNumber], []).append(combination)
+        actions_combinations = list(groups.values())
+        random.shuffle(actions_combinations)  # The combinations that the ordering cannot separate are chosen randomly
+        self.moveOrdering.orderCombinations(actions_combinations, depth, self.playerNumber, principal_variation)
+        return [MovesGroup(players, combinations[0][self.playerNumber],
+                           [tuple([combination[player_number] for player_number in players])
+                            for combination in combinations])
+                for combinations in actions_combinations]
 
     def _getPossibleMovesForPlayer(self, player_number: int, state: API) -> List[MoveDescriptor]:
         """
@@ -0,0 +1,177 @@
+"""
+File containing the definition of a TranspositionTable, in which a search stores the results computed for the states
+it explored, so that it does not compute them again when it reaches them through another sequence of moves
+"""
+
+from collections import namedtuple
+from typing import Dict, List, Optional, Union
+
+from ...characters.moves import MoveDescriptor
+
+__author__ = 'Anthony Rouneau'
+
+# Types of bounds of a stored value
+EXACT = 0  # The value is the exact value of the state
+LOWER_BOUND = 1  # The search was cut off: the value of the state is greater or equal than the stored value
+UPPER_BOUND = 2  # No move reached alpha: the value of the state is lower or equal than the stored value
+
+TranspositionEntry = namedtuple("TranspositionEntry", "key depth value bound bestMove endState reachedEnd")
+"""
+An entry of the table. It only contains compact values, and no reference to a state:
+
+    - key: The hash of the state (see "API.__hash__")
+    - depth: The depth that remained to be explored below the state when the value was computed
+    - value: The value computed for the state
+    - bound: The type of bound of the value (EXACT, LOWER_BOUND or UPPER_BOUND)
+    - bestMove: The best combination of moves found for the state (a dict linking player numbers to move descriptors)
+    - endState: The end state reached by the best moves (see "SimultaneousAlphaBeta._maxValue")
+    - reachedEnd: True if the best moves reach the end of the game
+"""
+
+
+class TranspositionTable:
+    """
+    A transposition table with a fixed number of buckets. Each bucket contains two entries:
+
+        - a "depth-preferred" entry, only replaced by an entry computed with a depth greater or equal
+        - an "always-replace" entry, that receives the entries that could not take the depth-preferred place
+
+    The table can be shared by several searches, as long as they use the same evaluation function.
+    """
+
+    def __init__(self, max_entries: int=2**16):
+        """
+        Instantiates an empty transposition table
+
+        Args:
+            max_entries:
+                The maximum number of entries kept by the table (rounded down to a power of two, at least 2).
+                This bounds the memory used by the table.
+        """
+        nb_buckets = 1
+        while nb_buckets * 4 <= max_entries:
+            nb_buckets *= 2
+        self._mask = nb_buckets - 1
+        self._depthPreferred = [None] * nb_buckets  # type: List[Optional[TranspositionEntry]]
+        self._alwaysReplace = [None] * nb_buckets  # type: List[Optional[TranspositionEntry]]
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        self.replacements = 0
+        self._newEntries = None  # type: Optional[Dict[int, TranspositionEntry]]  # See "trackNewEntries"
+
+    # -------------------- PUBLIC METHODS -------------------- #
+
+    def probe(self, key: int) -> Optional[TranspositionEntry]:
+        """
+        Looks for the entry of the state of which the hash is given
+
+        Args:
+            key: The hash of the state (see "API.__hash__")
+
+        Returns: The entry stored for this state, or None if there is none
+        """
+        index = key & self._mask
+        depth_entry = self._depthPreferred[index]
+        if depth_entry is not None and depth_entry.key == key:
+            self.hits += 1
+            return depth_entry
+        always_entry = self._alwaysReplace[index]
+        if always_entry is not None and always_entry.key == key:
+            self.hits += 1
+            return always_entry
+        self.misses += 1
+        if depth_entry is not None or always_entry is not None:
+            self.collisions += 1  # The bucket is occupied by other states
+        return None
+
+    def store(self, key: int, depth: Union[int, float], value: float, bound: int,
+              best_move: Optional[Dict[int, MoveDescriptor]], end_state: tuple, reached_end: bool) -> None:
+        """
+        Stores the value computed for a state, following the replacement policy of the table
+
+        Args:
+            key: The hash of the state (see "API.__hash__")
+            depth: The depth that remained to be explored below the state
+            value: The value computed for the state
+            bound: The type of bound of the value (EXACT, LOWER_BOUND or UPPER_BOUND)
+            best_move: The best combination of moves found for the state
+            end_state: The end state reached by the best moves
+            reached_end: True if the best moves reach the end of the game
+        """
+        entry = TranspositionEntry(key=key, depth=depth, value=value, bound=bound, bestMove=best_move,
+                                   endState=end_state, reachedEnd=reached_end)
+        index = key & self._mask
+        self.stores += 1
+        if self._newEntries is not None:
+            self._newEntries[key] = entry
+        depth_entry = self._depthPreferred[index]
+        if depth_entry is None or depth_entry.key == key or depth >= depth_entry.depth:
+            if depth_entry is not None and depth_entry.key != key:
+                self.replacements += 1
+                self._alwaysReplace[index] = depth_entry  # The replaced entry still gets a chance to be used
+            elif self._alwaysReplace[index] is not None and self._alwaysReplace[index].key == key:
+                self._alwaysReplace[index] = None  # Outdated entry of the same state
+            self._depthPreferred[index] = entry
+        else:
+            always_entry = self._alwaysReplace[index]
+            if always_entry is not None and always_entry.key != key:
+                self.replacements += 1
+            self._alwaysReplace[index] = entry
+
+    def getEntries(self) -> List[TranspositionEntry]:
+        """
+        Returns: The entries currently stored in the table (e.g. to send them to another process)
+        """
+        return [entry for entry in self._depthPreferred + self._alwaysReplace if entry is not None]
+
+    def storeEntries(self, entries: List[TranspositionEntry]) -> None:
+        """
+        Stores the given entries (e.g. coming from the table of another process), following the replacement policy
+
+        Args:
+            entries: The entries to store
+        """
+        for entry in entries:
+            self.store(*entry)
+
+    def trackNewEntries(self) -> None:
+        """
+        Makes this table remember the entries stored from now on, until they are taken with "takeNewEntries"
+        (e.g. to send to another process only what it does not know yet)
+        """
+        self._newEntries = {}
+
+    def takeNewEntries(self) -> List[TranspositionEntry]:
+        """
+        Returns:
+            The last entry stored for each state since the previous call to this method (or since "trackNewEntries"),
+            that are not remembered as new anymore. Empty if the new entries are not tracked.
+        """
+        if self._newEntries is None:
+            return []
+        entries = list(self._newEntries.values())
+        self._newEntries = {}
+        return entries
+
+    def getStatistics(self) -> Dict[str, int]:
+        """
+        Returns: The number of hits, misses, collisions, stores and replacements since the creation of the table
+        """
+        return {"hits": self.hits, "misses": self.misses, "collisions": self.collisions, "stores": self.stores,
+                "replacements": self.replacements}
+
+    def getNumberOfEntries(self) -> int:
+        """
+        Returns: The number of entries currently stored in the table
+        """
+        return len([entry for entry in self._depthPreferred if entry is not None]) + \
+            len([entry for entry in self._alwaysReplace if entry is not None])
+
+    def clear(self) -> None:
+        """
+        Removes all the entries of the table (the statistics are kept)
+        """
+        self._depthPreferred = [None] * len(self._depthPreferred)
+        self._alwaysReplace = [None] * len(self._alwaysReplace)
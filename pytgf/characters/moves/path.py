@@ -67,10 +67,17 @@ class Path(metaclass=ABCMeta):
         """
         return self.stopped or self.completed
 
-    def performNextMove(self) -> Tuple[bool, bool, Union[None, TileIdentifier]]:
+    def performNextMove(self, complete_step: bool=False) -> Tuple[bool, bool, Union[None, TileIdentifier]]:
         """
         Performs the next step in the path
 
+        Args:
+            complete_step:
+                If True, the current step (ShortMove) is completed at once, the unit jumping to the destination of the
+                step instead of being moved frame by frame (used by a loop that does not draw the game).
+                The following step is then only prepared at the next call (or by "prepareNextStep"), so that a stop
+                triggered in between cancels the path before its following step begins.
+
         Returns:
             A tuple containing
 
@@ -79,6 +86,7 @@ class Path(metaclass=ABCMeta):
                 - The id of the new tile of the unit, or None if the current move did not just start.
         """
         self._handleFirstMove()
+        self.prepareNextStep()
         if not self.finished():
             if self._currentMove is None and self._isFirstMoveEmpty():
                 self.completed = True
@@ -89,21 +97,34 @@ class Path(metaclass=ABCMeta):
                     move_just_started = self._newMoveStarted
                     self._newMoveStarted = False
                     new_tile_id = None
-                    self._needNextMove = False
-                    self._currentMove.performStep()
+                    if complete_step:
+                        self._currentMove.completeMove(skip_frames=True)
+                    else:
+                        self._currentMove.performStep()
                     move_performed = self._currentMove.isPerformed
                     if move_just_started:
                         new_tile_id = self._newMoveTileId
                     if move_performed:
                         new_tile_id = self._handleStepFinished()
                         self.reachedTileIdentifier = new_tile_id
-                        next_step_got, next_destination_tile_id = self._getNextStepIfNeeded()
-                        self._newMoveStarted = next_step_got
-                        self._newMoveTileId = next_destination_tile_id
+                        self._needNextMove = True
+                        if not complete_step:
+                            self.prepareNextStep()
                         self._decrementMovesToGo()
                     return move_just_started, move_performed, new_tile_id
         return False, False, None
 
+    def prepareNextStep(self) -> None:
+        """
+        Gets the next step of the path if the last step is performed and the next one was not prepared yet.
+        If the path was stopped in the meantime, it finishes instead.
+        """
+        if self._needNextMove and not self.finished():
+            self._needNextMove = False
+            next_step_got, next_destination_tile_id = self._getNextStepIfNeeded()
+            self._newMoveStarted = next_step_got
+            self._newMoveTileId = next_destination_tile_id
+
     def complete(self) -> TileIdentifier:
         """
         Completes the Path until it reaches the end.
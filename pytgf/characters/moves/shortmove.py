@@ -122,20 +122,30 @@ class ShortMove(object):
                 self._currentPos = temp_x, temp_y
                 self.unit.moveTo(self._currentPos)
 
-    def completeMove(self) -> None:
+    def completeMove(self, skip_frames: bool=False) -> None:
         """
         Completes what needs to be done for this move to be finished
+
+        Args:
+            skip_frames:
+                If True, the intermediate frames are skipped: the unit is directly moved to its destination
+                (e.g. in a loop that does not draw the game). Default: False
         """
-        for _ in range(self._frameNeeded):
-            self.performStep()
+        if skip_frames:
+            if not self.isPerformed:
+                self._frameNeeded = 1  # The next step is the last one
+                self.performStep()
+        else:
+            for _ in range(self._frameNeeded):
+                self.performStep()
 
     def cancelMove(self) -> None:
         """
         Cancels the effect of this move and marks it as performed
         """
         frames_already_done = self._totalFrameNeeded - self._frameNeeded
-        for _ in range(frames_already_done):
-            self.unit.moveTo(self.sourceTile.graphics.center)
+        if self._graphical and frames_already_done > 0:
+            self.unit.moveTo(self.sourceTile.center)
         self.isPerformed = True
 
     def isConsistent(self) -> bool:
@@ -3,7 +3,7 @@ File containing the definition of an entity.
 """
 
 from copy import deepcopy
-from typing import Optional
+from typing import Optional, Dict, Any, List
 
 import pygame
 
@@ -29,10 +29,13 @@ class Entity:
         """
         self._nbLives = nb_lives
         self.sprite = sprite  # type: UnitSprite
+        self._spriteShared = False  # True if the sprite is shared with another snapshot of the game (see "snapshot")
         self.playerNumber = id_number
         self.speed = speed
         self._isAlive = True
         self._drawable = None
+        self.game = None  # The game on which this entity is placed (set by the game itself)
+        self.stateIndex = None  # The index of this entity in the compact state of its game (see "CompactGameState")
 
     def isAlive(self) -> bool:
         """
@@ -47,27 +50,33 @@ class Entity:
         Args:
             nb_lives: The number of lives to set to the entity
         """
+        self._beforeModification()
         self._nbLives = nb_lives
         if self._nbLives <= 0:
             self._isAlive = False
         else:
             self._isAlive = True
+        self._afterModification()
 
     def kill(self) -> None:
         """
         Remove a life from the entity
         """
+        self._beforeModification()
         self._nbLives -= 1
         if self._nbLives <= 0:
             self._isAlive = False
+        self._afterModification()
 
     def oneUp(self) -> None:
         """
         Adds a life to the entity
         """
+        self._beforeModification()
         self._nbLives += 1
         if self._nbLives > 0:
             self._isAlive = True
+        self._afterModification()
 
     def draw(self, surface: pygame.Surface) -> None:
         """
@@ -81,6 +90,14 @@ class Entity:
                 self._drawable = pygame.sprite.RenderPlain(self.sprite)
             self._drawable.draw(surface)
 
+    def getDrawnSprites(self) -> List[pygame.sprite.Sprite]:
+        """
+        Returns: The sprites drawn by the "draw" method, in the order in which they are drawn
+        """
+        if self.sprite is not None and self.sprite.rect is not None and self.isAlive():
+            return [self.sprite]
+        return []
+
     def moveTo(self, destination: Coordinates) -> None:
         """
         Move the center of the unit to the position
@@ -92,7 +109,7 @@ class Entity:
             current_position = self.sprite.rect.center
             if current_position != destination:
                 x, y = vectorize(current_position, destination)
-                self.sprite.rect.move_ip(x, y)
+                self._getWritableSprite().rect.move_ip(x, y)
 
     def move(self, destination_offset: Coordinates) -> None:
         """
@@ -102,7 +119,7 @@ class Entity:
             destination_offset: The translation offset to perform
         """
         if self.sprite is not None and self.sprite.rect is not None:
-            self.sprite.rect.move_ip(destination_offset[0], destination_offset[1])
+            self._getWritableSprite().rect.move_ip(destination_offset[0], destination_offset[1])
 
     def getSpriteGroup(self) -> pygame.sprite.Group:
         """
@@ -110,12 +127,67 @@ class Entity:
         """
         return self._drawable
 
+    def snapshot(self) -> 'Entity':
+        """
+        Creates a shallow copy of this entity, without its graphical part, to be used in a snapshot of a game.
+
+        Returns: A copy of this entity that can be modified without affecting this one
+        """
+        cls = self.__class__
+        result = cls.__new__(cls)
+        result.__dict__.update(self.__dict__)
+        result.sprite = None
+        result._spriteShared = False
+        result._drawable = None
+        return result
+
+    def saveState(self) -> Dict[str, Any]:
+        """
+        Returns: The current state of this entity, that can be given back to "restoreState"
+        """
+        return self.__dict__.copy()
+
+    def restoreState(self, state: Dict[str, Any]) -> None:
+        """
+        Restores a state of this entity, saved with "saveState"
+
+        Args:
+            state: The state to restore
+        """
+        self.__dict__.clear()
+        self.__dict__.update(state)
+
+    def _getWritableSprite(self) -> Optional[UnitSprite]:
+        """
+        Returns: The sprite of this entity, copied beforehand if it was shared with another snapshot of the game
+        """
+        if self._spriteShared:
+            self.sprite = deepcopy(self.sprite)
+            self._spriteShared = False
+        return self.sprite
+
+    def _beforeModification(self) -> None:
+        """
+        Informs the game on which this entity is placed (if any) that this entity is about to be modified
+        """
+        if self.game is not None:
+            self.game.beforeEntityModification(self)
+
+    def _afterModification(self) -> None:
+        """
+        Informs the game on which this entity is placed (if any) that this entity has been modified
+        """
+        if self.game is not None:
+            self.game.afterEntityModification(self)
+
     def __deepcopy__(self, memo={}):
         cls = self.__class__
         result = cls.__new__(cls)
         memo[id(self)] = result
         for k, v in self.__dict__.items():
-            if k != "sprite" and k != "_drawable":
+            if k == "game":  # Only keeps the link with the game if the game is copied as well
+                value = memo.get(id(v)) if v is not None else None
+            elif k != "sprite" and k != "_drawable":
                 value = deepcopy(v, memo)
             else:
                 value = None
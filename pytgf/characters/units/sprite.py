@@ -5,12 +5,48 @@ File containing the abstract definition of a sprite designed to be linked with a
 import os
 from abc import ABCMeta, abstractmethod
 from copy import deepcopy
+from typing import Dict, Optional, Tuple
 
 import pygame
 import pygame.transform as transform
 
 __author__ = 'Anthony Rouneau'
 
+ImageKey = Tuple[str, Optional[Tuple[int, int]], int]
+
+_images = {}  # type: Dict[ImageKey, Tuple[pygame.Surface, bool]]  # Images of the process, and if they are converted
+
+
+def get_image(path: str, size: Optional[Tuple[int, int]]=None, rotation: int=0) -> pygame.Surface:
+    """
+    Gets the image stored at the given path, scaled to the given size and then rotated by the given angle. Each image
+    is loaded and transformed only once per process (and converted to the format of the display as soon as the display
+    is initialized): the returned surface is shared and must not be modified.
+
+    Args:
+        path: The absolute path to the image
+        size: The width and the height of the image before its rotation (None to keep the size of the file)
+        rotation: The angle, in degrees, of the counterclockwise rotation of the image
+
+    Returns: The loaded and transformed image
+    """
+    rotation %= 360
+    key = (path, size, rotation)
+    display_initialized = pygame.display.get_surface() is not None
+    cached = _images.get(key)
+    if cached is not None and (cached[1] or not display_initialized):
+        return cached[0]
+    if size is None and rotation == 0:
+        image = pygame.image.load_extended(path) if cached is None else cached[0]  # type: pygame.Surface
+        if display_initialized:
+            image = image.convert_alpha()
+    elif rotation == 0:
+        image = transform.scale(get_image(path), size)
+    else:
+        image = transform.rotate(get_image(path, size), rotation)
+    _images[key] = (image, display_initialized)
+    return image
+
 
 class UnitSprite(pygame.sprite.Sprite, metaclass=ABCMeta):
     """
@@ -28,11 +64,12 @@ class UnitSprite(pygame.sprite.Sprite, metaclass=ABCMeta):
         self.resFolder = os.path.join("res", "sprites")
         img = None
         self.rect = None
+        self._imageKey = None  # type: Optional[ImageKey]  # The key of the image of this sprite in the cache
+        self._sharedImage = None  # type: Optional[pygame.Surface]  # The image of the cache, to detect replacements
         if graphics:
-            location = os.path.join(os.curdir, self.imageRelativePath)
-            img = pygame.image.load_extended(location)  # type: pygame.Surface
+            location = os.path.abspath(os.path.join(os.curdir, self.imageRelativePath))
+            img = self._getSharedImage((location, None, 0))
             self.rect = img.get_rect()  # type: pygame.Rect
-        # img = img.convert_alpha()
         self.image = img
 
     def rotate(self, angle: float) -> None:
@@ -43,7 +80,11 @@ class UnitSprite(pygame.sprite.Sprite, metaclass=ABCMeta):
             angle: The angle in degrees
         """
         if self.image is not None and self.rect is not None:
-            self.image = transform.rotate(self.image, angle)
+            if self._isImageShared() and angle % 90 == 0:
+                path, size, rotation = self._imageKey
+                self.image = self._getSharedImage((path, size, (rotation + angle) % 360))
+            else:
+                self.image = transform.rotate(self.image, angle)
             self.rect = self.image.get_rect()  # type: pygame.Rect
 
     def size(self, width: int, height: int) -> None:
@@ -55,7 +96,12 @@ class UnitSprite(pygame.sprite.Sprite, metaclass=ABCMeta):
             height: The new height
         """
         if self.image is not None and self.rect is not None:
-            self.image = transform.scale(self.image, (width, height))
+            if self._isImageShared():
+                path, _, rotation = self._imageKey
+                size = (height, width) if rotation % 180 == 90 else (width, height)  # The size before the rotation
+                self.image = self._getSharedImage((path, size, rotation))
+            else:
+                self.image = transform.scale(self.image, (width, height))
             (x, y) = self.rect.center
             self.rect = self.image.get_rect()
             self.rect.move_ip(x, y)
@@ -68,12 +114,29 @@ class UnitSprite(pygame.sprite.Sprite, metaclass=ABCMeta):
         """
         pass
 
+    def _getSharedImage(self, key: ImageKey) -> pygame.Surface:
+        """
+        Args:
+            key: The path, the size and the rotation of the wanted image (see "get_image")
+
+        Returns: The image of the cache corresponding to the given key, that becomes the image of this sprite
+        """
+        self._imageKey = key
+        self._sharedImage = get_image(*key)
+        return self._sharedImage
+
+    def _isImageShared(self) -> bool:
+        """
+        Returns: True if the image of this sprite is still the one of the cache (i.e. it was not replaced by a subclass)
+        """
+        return self._imageKey is not None and self.image is self._sharedImage
+
     def __deepcopy__(self, memo={}):
         cls = self.__class__
         result = cls.__new__(cls)
         memo[id(self)] = result
         for k, v in self.__dict__.items():
-            if k != "image" and k != "rect":
+            if k != "image" and k != "rect" and k != "_sharedImage":
                 value = deepcopy(v, memo)
             else:
                 value = None
@@ -4,7 +4,7 @@ File containing the definition of a Unit.
 
 from copy import deepcopy
 from queue import Queue, Empty
-from typing import List
+from typing import List, Dict, Any
 
 import pygame
 
@@ -47,7 +47,9 @@ class Unit(Entity):
         Args:
             last_action: The last action performed by this unit 
         """
+        self._beforeModification()
         self.lastAction = last_action
+        self._afterModification()
 
     def setCurrentAction(self, current_action):
         """
@@ -56,7 +58,9 @@ class Unit(Entity):
         Args:
             current_action: The action this unit is currently performing
         """
+        self._beforeModification()
         self.currentAction = current_action
+        self._afterModification()
 
     def draw(self, surface: pygame.Surface) -> None:
         """
@@ -68,6 +72,12 @@ class Unit(Entity):
         super().draw(surface)
         self._entitiesSpriteGroup.draw(surface)
 
+    def getDrawnSprites(self) -> List[pygame.sprite.Sprite]:
+        """
+        Returns: The sprites of the unit and of its entities, in the order in which they are drawn by "draw"
+        """
+        return super().getDrawnSprites() + self._entitiesSpriteGroup.sprites()
+
     def kill(self) -> None:
         """
         Kills the unit and all its entity if "surviving entities" was set to False at the creation of this unit
@@ -75,7 +85,7 @@ class Unit(Entity):
         super().kill()
         if not self.isAlive():
             if not self.survivingentitys:
-                while len(self._entitiesSpriteGroup) != 0:
+                while len(self._entitiesList) != 0:
                     self.removeOldestentity()
 
     def addentity(self, entity: Entity) -> None:
@@ -87,19 +97,29 @@ class Unit(Entity):
         """
         if 0 <= self._maxentitys <= len(self._entitiesList):
             self.removeOldestentity()
-        if self._entitiesQueue is not None:
-            self._entitiesQueue.put(entity)
-        self._entitiesList.append(entity)
-        if entity.sprite is not None:
-            self._entitiesSpriteGroup.add(entity.sprite)
+        self._beforeModification()
+        try:
+            if self._entitiesQueue is not None:
+                self._entitiesQueue.put(entity)
+            self._entitiesList.append(entity)
+            if entity.sprite is not None:
+                self._entitiesSpriteGroup.add(entity.sprite)
+            if self.game is not None:
+                self.game.setEntityOwner(entity, self)
+        finally:
+            self._afterModification()
 
     def removeOldestentity(self) -> None:
         """
         Removes the oldest entity belonging to this unit-
         """
+        self._beforeModification()
         try:
             oldest_entity = self._entitiesList.pop(0)
-            oldest_entity.kill()
+            writable_entity = self._getWritableEntity(oldest_entity)
+            writable_entity.kill()
+            if self.game is not None:
+                self.game.setEntityOwner(writable_entity, None)
             if self._entitiesQueue is not None:
                 queue_first = self._entitiesQueue.get_nowait()  # type: Entity
                 assert queue_first is oldest_entity
@@ -107,6 +127,8 @@ class Unit(Entity):
                 self._entitiesSpriteGroup.remove(oldest_entity.sprite)
         except Empty:
             pass
+        finally:
+            self._afterModification()
 
     def removeentity(self, entity: Entity) -> None:
         """
@@ -115,20 +137,27 @@ class Unit(Entity):
         Args:
             entity: The entity to remove
         """
-        temp_queue = Queue()
+        self._beforeModification()
         try:
-            while True:  # Will stop when the Empty exception comes out from the Queue
-                current = self._entitiesQueue.get_nowait()
-                if current is not entity:
-                    temp_queue.put(current)
-        except Empty:
-            pass
-        self._entitiesList.remove(entity)
-
-        self._entitiesQueue = temp_queue
-        entity.kill()
-        if entity.sprite is not None:
-            self._entitiesSpriteGroup.remove(entity.sprite)
+            if self._entitiesQueue is not None:
+                temp_queue = Queue()
+                try:
+                    while True:  # Will stop when the Empty exception comes out from the Queue
+                        current = self._entitiesQueue.get_nowait()
+                        if current is not entity:
+                            temp_queue.put(current)
+                except Empty:
+                    pass
+                self._entitiesQueue = temp_queue
+            self._entitiesList.remove(entity)
+            writable_entity = self._getWritableEntity(entity)
+            writable_entity.kill()
+            if self.game is not None:
+                self.game.setEntityOwner(writable_entity, None)
+            if entity.sprite is not None:
+                self._entitiesSpriteGroup.remove(entity.sprite)
+        finally:
+            self._afterModification()
 
     def hasentity(self, entity: Entity) -> bool:
         """
@@ -169,12 +198,69 @@ class Unit(Entity):
                 return True
         return False
 
+    def snapshot(self) -> 'Unit':
+        """
+        Creates a copy of this unit to be used in a snapshot of a game. The entities of this unit are not copied:
+        the game that owns the snapshot copies them before modifying them.
+
+        Returns: A copy of this unit that can be modified without affecting this one
+        """
+        result = super().snapshot()  # type: Unit
+        result.sprite = self.sprite
+        result._spriteShared = self.sprite is not None  # The sprite is only copied if the snapshot modifies it
+        result._entitiesList = list(self._entitiesList)
+        result._entitiesSpriteGroup = pygame.sprite.Group()
+        result._entitiesQueue = None
+        return result
+
+    def saveState(self) -> Dict[str, Any]:
+        """
+        Returns: The current state of this unit, including its entities, that can be given back to "restoreState"
+        """
+        state = super().saveState()
+        state["_entitiesList"] = list(self._entitiesList)
+        state["_entitiesSprites"] = self._entitiesSpriteGroup.sprites()
+        if self._entitiesQueue is not None:
+            state["_entitiesQueue"] = list(self._entitiesQueue.queue)
+        return state
+
+    def restoreState(self, state: Dict[str, Any]) -> None:
+        """
+        Restores a state of this unit, saved with "saveState"
+
+        Args:
+            state: The state to restore
+        """
+        state = state.copy()
+        sprites = state.pop("_entitiesSprites")
+        if state["_entitiesQueue"] is not None:
+            entities_queue = Queue()
+            for entity in state["_entitiesQueue"]:
+                entities_queue.put(entity)
+            state["_entitiesQueue"] = entities_queue
+        super().restoreState(state)
+        self._entitiesSpriteGroup.empty()
+        self._entitiesSpriteGroup.add(*sprites)
+
+    def _getWritableEntity(self, entity: Entity) -> Entity:
+        """
+        Args:
+            entity: An entity belonging to this unit
+
+        Returns: The entity itself, or its private copy if the entity is shared with another snapshot of the game
+        """
+        if self.game is not None:
+            return self.game.getWritableEntity(entity)
+        return entity
+
     def __deepcopy__(self, memo={}):
         cls = self.__class__
         result = cls.__new__(cls)
         memo[id(self)] = result
         for k, v in self.__dict__.items():
-            if k != "_drawable" and k != "_entitiesQueue":
+            if k == "game":  # Only keeps the link with the game if the game is copied as well
+                value = memo.get(id(v)) if v is not None else None
+            elif k != "_drawable" and k != "_entitiesQueue":
                 value = deepcopy(v, memo)
             else:
                 value = None
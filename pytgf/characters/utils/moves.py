@@ -1,5 +1,5 @@
 from itertools import product
-from typing import Iterable, List, Dict
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple
 
 from ..moves import MoveDescriptor
 
@@ -21,6 +21,48 @@ def getMovesCombinations(moves: Dict[PlayerNumber, Iterable[MoveDescriptor]]) ->
         A list of dictionaries (e.g. {1: 2, 2: 3} indicates that the player 1 chose the action "2" and the player 2
         chose the action "3")
     """
-    player_actions = [list(product([player_number], player_moves)) for player_number, player_moves in moves.items()]
-    temp_combinations = list(product(*player_actions))
-    return [dict(combination) for combination in temp_combinations]
+    player_numbers = list(moves.keys())
+    return [combinationToDict(player_numbers, combination) for combination in iterMovesCombinations(moves)]
+
+
+def iterMovesCombinations(moves: Dict[PlayerNumber, Iterable[MoveDescriptor]],
+                          is_move_safe: Optional[Callable[[PlayerNumber, MoveDescriptor], bool]]=None) \
+        -> Iterator[Tuple[MoveDescriptor, ...]]:
+    """
+    Lazily generates the possible combinations of movements: nothing is built before a combination is asked, so that
+    a search can stop iterating as soon as it cuts off.
+
+    Args:
+        moves:
+            A dictionary that contains the move to combine for each player
+            (key: player number; value: collection of move descriptors)
+        is_move_safe:
+            A function indicating if a move of a player is safe (optional). The unsafe moves of a player are removed
+            before they are combined with the moves of the other players, unless all the moves of the player are unsafe
+
+    Returns:
+        An iterator of tuples, containing the move of each player in the order of the keys of the given dictionary
+        (e.g. (2, 3) indicates that the first player chose the action "2" and the second player chose the action "3",
+        see "combinationToDict")
+    """
+    players_moves = []
+    for player_number, player_moves in moves.items():
+        player_moves = list(player_moves)
+        if is_move_safe is not None:
+            safe_moves = [move for move in player_moves if is_move_safe(player_number, move)]
+            if len(safe_moves) > 0:
+                player_moves = safe_moves
+        players_moves.append(player_moves)
+    return product(*players_moves)
+
+
+def combinationToDict(player_numbers: List[PlayerNumber], combination: Tuple[MoveDescriptor, ...]) \
+        -> Dict[int, MoveDescriptor]:
+    """
+    Args:
+        player_numbers: The numbers of the players, in the order of their slot in the combination
+        combination: A combination generated by "iterMovesCombinations"
+
+    Returns: The dictionary linking the number of each player to its move in the given combination
+    """
+    return dict(zip(player_numbers, combination))
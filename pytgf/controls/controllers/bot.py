@@ -4,12 +4,12 @@ File containing the definition of a bot controller.
 
 from abc import ABCMeta, abstractmethod
 from queue import Queue
-from typing import List, Any, Iterable
+from typing import List, Any, Iterable, Optional, Union
 
 from .controller import Controller
 from ..events import BotEvent, WakeEvent
 from ...characters.moves import MoveDescriptor
-from ...game import Core, API
+from ...game import Core, API, CompactGameState, SharedGameState
 
 __author__ = 'Anthony Rouneau'
 
@@ -48,6 +48,7 @@ class Bot(Controller, metaclass=ABCMeta):
         super().__init__(player_number)
         self._gameStateLocalCopy = None
         self.previousGameState = None
+        self.sharedState = None  # type: Optional[SharedGameState]  # Set by the main loop if it shares the state
         self.messagesToTeammates = Queue()
 
     # -------------------- PUBLIC METHODS -------------------- #
@@ -81,20 +82,42 @@ class Bot(Controller, metaclass=ABCMeta):
         move_interesting = False
         for event in events:  # type: BotEvent
             if not isinstance(event, WakeEvent):
-                succeeded = self.gameState.performMove(event.playerNumber, event.moveDescriptor)
-                if not succeeded:
-                    print("error in move... for player %s and descriptor %s" %
-                          (str(event.playerNumber), str(event.moveDescriptor)))
+                if not self.readsSharedState:
+                    succeeded = self.gameState.performMove(event.playerNumber, event.moveDescriptor)
+                    if not succeeded:
+                        print("error in move... for player %s and descriptor %s" %
+                              (str(event.playerNumber), str(event.moveDescriptor)))
                 move_interesting = move_interesting or self._isMoveInteresting(event.playerNumber, event.moveDescriptor)
             else:
                 move_interesting = True
         if move_interesting:
-            selected_move = self._selectNewMove(self.gameState)
+            if self.readsSharedState:
+                selected_move = self._selectNewMove(self.sharedState.snapshot())
+            else:
+                selected_move = self._selectNewMove(self.gameState)
             if self._isMoveAllowed(selected_move):
                 self.moves.put(selected_move)
             else:
                 print("chose not allowed move: ", selected_move)
 
+    @property
+    def mustReplayEvents(self) -> bool:
+        """
+        Returns:
+            True if this bot keeps a local copy of the game (see "gameState"), in which the moves of the game are
+            performed. Can be overridden to return False by the bots that only read the shared state of the game:
+            if the game shares its state (see "sharedState" and "LogicalLoop.shareState"), they react to snapshots
+            of it and do not receive any copy of the game.
+        """
+        return True
+
+    @property
+    def readsSharedState(self) -> bool:
+        """
+        Returns: True if this bot reacts to snapshots of the shared state instead of a local copy of the game
+        """
+        return self.sharedState is not None and not self.mustReplayEvents
+
     def sendMessageToTeammate(self, teammate_number: int, message: TeammateMessage) -> None:
         """
         Adds the message to the message queue, that will be later used by the linker.
@@ -136,15 +159,16 @@ class Bot(Controller, metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def _selectNewMove(self, game_state: API) -> MoveDescriptor:
+    def _selectNewMove(self, game_state: Union[API, CompactGameState]) -> MoveDescriptor:
         """
         Decision taking algorithm that, given the new game state, will (or won't if not needed) make a move in the game
         Returns the move. The move returned must return a correct move for the game (see self._isMoveAllowed)
 
         Args:
             game_state:
-                The game state to react to. This game state must not be modified in place, in order to
-                maintain a stable local copy of the game state.
+                The game state to react to: the API of the local copy of the game, or a snapshot of the shared state
+                if this bot reads the shared state (see "readsSharedState"). This game state must not
+                be modified in place, in order to maintain a stable local copy of the game state.
 
         Returns:
             The constant representing the newly chosen move
@@ -1,4 +1,5 @@
 from .bot import BotControllerWrapper
+from .connection import LocalConnection, local_pipe
 from .human import HumanControllerWrapper
 from .wrapper import ControllerWrapper
 
@@ -4,7 +4,7 @@ File containing the definition of a Bot ControllerWrapper, linking the game with
 
 from abc import ABCMeta
 from queue import Empty, Queue
-from typing import Dict
+from typing import Dict, List
 
 try:
     from multiprocess.connection import PipeConnection
@@ -76,6 +76,18 @@ class BotControllerWrapper(ControllerWrapper, metaclass=ABCMeta):
         self._sendToTeammatesIfNeeded()
         super()._routine()
 
+    def _getConnections(self) -> List[PipeConnection]:
+        """
+        Returns: The pipe connections through which this linker can receive data, including the collaboration pipes
+        """
+        return super()._getConnections() + list(self._collaborationPipes.values())
+
+    def _hasPendingOutput(self) -> bool:
+        """
+        Returns: True if the controller has a move or a message for its teammates waiting to be sent
+        """
+        return super()._hasPendingOutput() or not self.controller.messagesToTeammates.empty()
+
     def _reactToTeammatesIfNeeded(self) -> None:
         """
         Checks if there is messages waiting from the teammates. If there is, react to their message
@@ -0,0 +1,86 @@
+"""
+File containing the definition of a LocalConnection, that replaces a pipe connection when both of its ends are used in
+the same thread
+"""
+
+from collections import deque
+from typing import Any, Deque, Tuple
+
+__author__ = 'Anthony Rouneau'
+
+
+def local_pipe() -> Tuple['LocalConnection', 'LocalConnection']:
+    """
+    Creates a pair of connected LocalConnection, as "multiprocess.connection.Pipe" does
+
+    Returns: The two ends of the local pipe
+    """
+    first_end = LocalConnection()
+    second_end = LocalConnection()
+    first_end.peer = second_end
+    second_end.peer = first_end
+    return first_end, second_end
+
+
+class LocalConnection:
+    """
+    End of a pipe whose objects are stored in memory instead of being pickled and written in a file descriptor.
+    The objects are received by reference, and nothing can be awaited: it is only meant to be used when both ends of the
+    pipe are in the same thread (e.g. between the main loop and a controller wrapper run inline).
+    """
+
+    def __init__(self):
+        self.peer = None  # type: LocalConnection
+        self.closed = False
+        self._received = deque()  # type: Deque[Any]
+
+    # -------------------- PUBLIC METHODS -------------------- #
+
+    def send(self, obj: Any) -> None:
+        """
+        Sends the given object to the other end of the pipe
+
+        Args:
+            obj: The object to send
+
+        Raises:
+            OSError: If this end of the pipe is closed
+            BrokenPipeError: If the other end of the pipe is closed
+        """
+        if self.closed:
+            raise OSError("handle is closed")
+        if self.peer.closed:
+            raise BrokenPipeError("the other end of the pipe is closed")
+        self.peer._received.append(obj)
+
+    def recv(self) -> Any:
+        """
+        Returns: The oldest object sent by the other end of the pipe and not received yet
+
+        Raises:
+            OSError: If this end of the pipe is closed
+            EOFError: If there is nothing to receive, as waiting for an object in the same thread would never end
+        """
+        if self.closed:
+            raise OSError("handle is closed")
+        if len(self._received) == 0:
+            raise EOFError("nothing was sent through this local pipe")
+        return self._received.popleft()
+
+    def poll(self) -> bool:
+        """
+        Returns: True if there is an object to receive
+
+        Raises:
+            OSError: If this end of the pipe is closed
+        """
+        if self.closed:
+            raise OSError("handle is closed")
+        return len(self._received) > 0
+
+    def close(self) -> None:
+        """
+        Closes this end of the pipe
+        """
+        self.closed = True
+        self._received.clear()
@@ -1,11 +1,12 @@
 """
 File containing the definition of an abstract ControllerWrapper, linking the game with a Controller
 """
+import os
 from abc import ABCMeta, abstractmethod
 from queue import Empty
-from typing import Any
+from typing import Any, List
 
-import pygame
+from multiprocess.connection import wait
 
 from pytgf.controls.events import ReadyEvent
 
@@ -21,6 +22,7 @@ from ..events.special import SpecialEvent
 __author__ = 'Anthony Rouneau'
 
 MAX_FPS = 30
+WAIT_TIMEOUT = 0.5  # Maximum time (in seconds) a linker sleeps before checking if it must still run
 
 
 class ControllerWrapper(metaclass=ABCMeta):
@@ -40,6 +42,8 @@ class ControllerWrapper(metaclass=ABCMeta):
         self._connected = True
         self.mainPipe = None
         self.gameInfoPipe = None
+        self._stopRequested = False
+        self._gameProcessId = None
 
     # -------------------- PUBLIC METHODS -------------------- #
 
@@ -51,6 +55,7 @@ class ControllerWrapper(metaclass=ABCMeta):
             main_pipe: The pipe connection to the game
         """
         self.mainPipe = main_pipe
+        self._gameProcessId = os.getpid()
 
     def setGameInfoPipe(self, game_info_pipe: PipeConnection) -> None:
         """
@@ -87,21 +92,48 @@ class ControllerWrapper(metaclass=ABCMeta):
         self.mainPipe.close()
         self.gameInfoPipe.close()
 
-    def run(self) -> None:
+    def stop(self) -> None:
         """
-        Runs the logical loop of this linker, looking for actions coming from the controller and updating
-        the controller's local copy of the game state. The loop runs with a maximum of MAX_FPS iteration/s
+        Asks the run loop of this linker to end, at the latest WAIT_TIMEOUT seconds later.
+        Can be called from another thread.
+        """
+        self._stopRequested = True
+
+    def start(self) -> None:
+        """
+        Prepares the controller and tells the game that this linker is ready
         """
         self.controller.getReady()
-        clock = pygame.time.Clock()
         self.mainPipe.send(ReadyEvent())
+
+    def run(self) -> None:
+        """
+        Runs the logical loop of this linker, looking for actions coming from the controller and updating
+        the controller's local copy of the game state. Between two iterations, the loop sleeps until data arrives
+        in one of the pipes of this linker, unless the controller has something left to send. The sleep lasts at
+        most WAIT_TIMEOUT seconds, so that the loop ends if it was stopped or if the game is gone.
+        """
+        self.start()
         while self._connected:
             try:
-                self._routine()
+                self._runRoutineUntilIdle()
+                if self._connected:
+                    wait(self._getConnections(), timeout=WAIT_TIMEOUT)
+                    if self._mustTerminate():
+                        self.close()
             except (BrokenPipeError, EOFError, OSError):
-                print("Closing pipes for player", self.controller.playerNumber)
-                self.close()
-            clock.tick(MAX_FPS)
+                self._closeBrokenPipes()
+
+    def runOnce(self) -> None:
+        """
+        Handles the data received by this linker and sends what the controller has to send, without waiting for new
+        data. Used instead of "run" when this linker is run inline, by the thread of the game.
+        """
+        if self._connected:
+            try:
+                self._runRoutineUntilIdle()
+            except (BrokenPipeError, EOFError, OSError):
+                self._closeBrokenPipes()
 
     def handleNewGameStateChangeIfNeeded(self) -> None:
         """
@@ -169,7 +201,46 @@ class ControllerWrapper(metaclass=ABCMeta):
         if self._unitAlive:
             self.sendControllerActionsIfNeeded()
         self.checkGameInfo()
-        self.handleNewGameStateChangeIfNeeded()
+        if self._connected:  # The game may have ended
+            self.handleNewGameStateChangeIfNeeded()
+
+    def _runRoutineUntilIdle(self) -> None:
+        """
+        Runs the routine of this linker until the controller has nothing left to send
+        """
+        self._routine()
+        while self._connected and self._hasPendingOutput():
+            self._routine()
+
+    def _mustTerminate(self) -> bool:
+        """
+        Returns: True if this linker was stopped, or if the game process that created its pipes is gone (in which
+                 case the pipes could stay open forever, for instance in an orphaned pool worker)
+        """
+        if self._stopRequested:
+            return True
+        if self._gameProcessId is None:
+            return False
+        return self._gameProcessId != os.getpid() and self._gameProcessId != os.getppid()
+
+    def _closeBrokenPipes(self) -> None:
+        """
+        Closes this linker after one of its pipes was closed by the game
+        """
+        print("Closing pipes for player", self.controller.playerNumber)
+        self.close()
+
+    def _getConnections(self) -> List[PipeConnection]:
+        """
+        Returns: The pipe connections through which this linker can receive data
+        """
+        return [self.mainPipe, self.gameInfoPipe]
+
+    def _hasPendingOutput(self) -> bool:
+        """
+        Returns: True if the controller has something to send, that must not wait for the next incoming data
+        """
+        return self._unitAlive and not self.controller.moves.empty()
 
     def _sendActionToGame(self, move_descriptor: Any) -> None:
         """
@@ -53,7 +53,7 @@ class RandomRoutine(ThoroughRoutine):
         """
         for player_number in state.getPlayerNumbers():
             if state.game.getUnitForNumber(player_number).lastAction is None:
-                state.game.getUnitForNumber(player_number).lastAction = -1
+                state.game.getUnitForNumber(player_number).setLastAction(-1)
         if state.game.isFinished():
             return None
         elif nb_moves == 0:
@@ -61,12 +61,7 @@ class RandomRoutine(ThoroughRoutine):
         else:
             new_state = None  # type: API
             moves = {}
-            moves_list = self._generateMovesCombinations(state)
-            possible_moves = []
-            for i in range(len(moves_list)):
-                for j in range(len(moves_list[i])):
-                    possible_moves.append(moves_list[i][j])
-
+            possible_moves = self._generateMovesList(state)
             random.shuffle(possible_moves)
             while len(possible_moves) > 0 and (new_state is None or new_state.isFinished()):
                 moves = possible_moves.pop()
@@ -13,7 +13,8 @@ from pytgf.game.turnbased import TurnBasedAPI
 from .abstractroutine import AbstractRoutine
 from ..component import Data, Component
 from ..gatherer import Gatherer
-from ...board.simulation.simultaneous_alphabeta import SimultaneousAlphaBeta, Value, EndState, _RetValue
+from ...board.simulation.simultaneous_alphabeta import SimultaneousAlphaBeta, Value, EndState, _RetValue, \
+    StateDescription, MovesGroup
 from ...characters.moves import MoveDescriptor
 from ...game import API
 
@@ -26,6 +27,8 @@ ACTIONS_SEQUENCES_PATH_NAME = "actions_sequences"
 
 
 class ThoroughRoutine(AbstractRoutine, SimultaneousAlphaBeta):
+    _FILTERS_MOVES_LIST = True  # The turn-based combinations are filtered (see "_generateMovesList")
+
     def __init__(self, gatherer: Gatherer, possible_moves: Tuple[MoveDescriptor, ...],
                  eval_fct: Callable[[API], Dict[int, Value]], max_depth: int = -1, must_write_files: bool = True,
                  must_keep_temp_files: bool = False, max_end_states: int = -1):
@@ -134,10 +137,8 @@ class ThoroughRoutine(AbstractRoutine, SimultaneousAlphaBeta):
             self._nbStates += 1
             self._totalNbStates += 1
         # SEARCHING MAX VALUE
+        id_state = state.id  # The state is modified in place during the search
         ret_val = super()._maxValue(state, alpha, beta, depth)
-        id_state = state.id
-        state = []
-        del state
 
         # WE COMPLETE THE A POSTERIORI MOVES IF A MOVE WAS UNFEASIBLE
         if not finished:
@@ -164,28 +165,34 @@ class ThoroughRoutine(AbstractRoutine, SimultaneousAlphaBeta):
         actions_histories = np.hstack((has_won, actions_histories))
         self._actionsSequences = self._actionsSequences.append(pd.DataFrame(actions_histories), ignore_index=True)
 
-    def _minValue(self, state: API, actions: List[Dict[int, MoveDescriptor]], alpha: float, beta: float, depth: int) \
-            -> _RetValue:
-        player_move_descriptor = actions[0][self.playerNumber]
+    def _minValue(self, state: API, actions: MovesGroup, alpha: float, beta: float, depth: int) -> _RetValue:
+        player_move_descriptor = actions.ownMove
         new_actions = np.zeros((len(self._playerMapping), 1))
         new_actions -= 1
 
         # SEARCHING MIN VALUE
+        id_state = state.id  # The state is modified in place during the search
         value, best_actions, end_state, new_game_state, best_reached_end = super()._minValue(state, actions,
                                                                                              alpha, beta,
-                                                                                             depth)  # Simulate actions
-
-        id_state = state.id
-        state = []
-        del state
+                                                                                             depth)
 
         # AS WE FINISHED SEARCHING, WE CAN STORE THE A POSTERIORI DATA
         final_state = self._computeFinalStateScore(depth, end_state)  # Storing whether this move led to a winning state
-        a_posteriori_data = self._gatherer.getAPosterioriData(new_game_state)
+        a_posteriori_data = list(new_game_state)  # The a posteriori data of the state (see "_describeState")
         a_posteriori_data.extend(final_state)
         self._aPosterioriDataVectors[id_state][player_move_descriptor].extend(a_posteriori_data)
         return value, best_actions, end_state, new_game_state, best_reached_end
 
+    def _describeState(self, state: API, reached_end: bool) -> StateDescription:
+        """
+        Args:
+            state: The state currently explored
+            reached_end: True if the best moves from this state reach an end state
+
+        Returns: The a posteriori data of the given state
+        """
+        return self._gatherer.getAPosterioriData(state)
+
     @staticmethod
     def _computeFinalStateScore(depth: int, end_state: EndState) -> Tuple[int, int]:
         final_state = (0, 0)  # We suppose that the game has not ended
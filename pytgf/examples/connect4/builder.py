@@ -5,12 +5,13 @@ from .rules import Connect4API, Connect4Core
 from .units import Bottom, Connect4Unit
 from ...board import Builder
 from ...controls.controllers import Bot, Human
-from ...game.turnbased import TurnBasedMainLoop
+from ...game.logicalloop import PROCESS_EXECUTION
+from ...game.turnbased import TurnBasedMainLoop, HeadlessTurnBasedMainLoop
 
 __author__ = "Anthony Rouneau"
 
 
-def add_controller(main_loop: TurnBasedMainLoop, player_classes: List):
+def add_controller(main_loop: TurnBasedMainLoop, player_classes: List, execution: int=PROCESS_EXECUTION):
     assert len(player_classes) == 2
     for i, player_class in enumerate(player_classes):
         player_number = i + 1
@@ -22,24 +23,26 @@ def add_controller(main_loop: TurnBasedMainLoop, player_classes: List):
             raise TypeError("The type of the player (\'%s\') must either be a Bot or a Human subclass."
                             % (str(player_class)))
         main_loop.addUnit(Connect4Unit(player_number), linker, main_loop.game.board.OUT_OF_BOARD_TILE.identifier,
-                          team=player_number)
+                          team=player_number, execution=execution)
 
 
-def create_game(selected_classes: dict, width: int, height: int, graphics: bool=True) -> TurnBasedMainLoop:
+def create_game(selected_classes: dict, width: int, height: int, graphics: bool=True,
+                headless: bool=False, execution: int=PROCESS_EXECUTION) -> TurnBasedMainLoop:
     lines = 6
     columns = 7
     builder = Builder(width, height, lines, columns)
     builder.setBordersColor((0, 0, 0))
     builder.setTilesVisible(True)
     board = builder.create()
-    board.graphics = board.graphics if graphics else None
+    board.graphics = board.graphics if graphics and not headless else None  # A headless game is never drawn
 
     game = Connect4Core(board)
-    main_loop = TurnBasedMainLoop(Connect4API(game))
+    main_loop_class = HeadlessTurnBasedMainLoop if headless else TurnBasedMainLoop
+    main_loop = main_loop_class(Connect4API(game))
     player_classes = [None, None]
     for player_number, player_class in selected_classes.items():
         player_classes[player_number - 1] = player_class
-    add_controller(main_loop, player_classes)
+    add_controller(main_loop, player_classes, execution)
     for i in range(7):
         game.addUnit(Bottom(1000 + i), game.BOTTOM_TEAM_NUMBER, (5, i), is_avatar=False, active=False)
     return main_loop
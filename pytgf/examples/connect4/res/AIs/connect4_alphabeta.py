@@ -1,39 +1,25 @@
 import random
 from abc import ABCMeta, abstractmethod
-from typing import Dict
 
-from pytgf.board.simulation import SimultaneousAlphaBeta
 from pytgf.characters.moves import MoveDescriptor
 from pytgf.examples.connect4.controllers.player import Connect4BotPlayer
-from pytgf.examples.connect4.rules import Connect4API
-
-
-def eval_fct(game_state: Connect4API) -> Dict[int, float]:
-    scores = {}
-    for player_number in game_state.getPlayerNumbers():
-        score = 0
-        if game_state.hasWon(player_number):
-            score = 1000
-        elif not game_state.isPlayerAlive(player_number):
-            score = -1000
-        score += random.randint(0, 100) / 100
-        scores[player_number] = score
-    return scores
+from pytgf.examples.connect4.rules import Connect4API, Connect4Solver
 
 
 class Connect4AlphaBeta(Connect4BotPlayer, metaclass=ABCMeta):
     def __init__(self, player_number: int):
         super().__init__(player_number)
-        self._alphaBeta = SimultaneousAlphaBeta(self.evalFct, self.possibleMoves, max_depth=self._maxDepth)
+        # A depth of the alpha beta is one move of each player, plus the last moves explored.
+        # The solver scores the wins and the losses itself, and scores 0 a game not finished at its depth limit
+        self._solver = Connect4Solver(max_depth=2 * (self._maxDepth + 1))
 
     def _selectNewMove(self, game_state: Connect4API) -> MoveDescriptor:
-        # print(game_state.game._simplifiedBoard)
-        value = self._alphaBeta.alphaBetaSearching(self.playerNumber, game_state)
-        return value
-
-    @staticmethod
-    def evalFct(game_state: Connect4API) -> Dict[int, float]:
-        return eval_fct(game_state)
+        game = game_state.game
+        team_number = game.unitsTeam[game.getUnitForNumber(self.playerNumber)]
+        column = self._solver.getBestMove(game.bitboard, team_number)
+        if column is None:
+            return random.choice(self.possibleMoves)
+        return column
 
     @property
     @abstractmethod
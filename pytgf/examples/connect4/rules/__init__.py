@@ -1,2 +1,4 @@
+from .bitboard import Connect4Bitboard
 from .connect4 import Connect4Core
 from .connect4api import Connect4API
+from .solver import Connect4Solver
@@ -0,0 +1,139 @@
+"""
+File containing the definition of a bitboard representing the discs of a Connect 4 game
+"""
+
+from typing import Dict, Tuple
+
+__author__ = "Anthony Rouneau"
+
+LINES = 6
+COLUMNS = 7
+HEIGHT = LINES + 1  # Each column is represented by 7 bits: 6 for its tiles and one empty bit above them
+BOTTOM_MASK = sum(1 << (column * HEIGHT) for column in range(COLUMNS))  # The bit of the lowest tile of each column
+BOARD_MASK = BOTTOM_MASK * ((1 << LINES) - 1)  # The bits of all the tiles
+
+
+def get_bit(line: int, column: int) -> int:
+    """
+    Args:
+        line: The line of a tile of the board (0 is the top line)
+        column: The column of the tile
+
+    Returns: The mask containing only the bit of the given tile
+    """
+    return 1 << (column * HEIGHT + LINES - 1 - line)
+
+
+def get_column_mask(column: int) -> int:
+    """
+    Args:
+        column: A column of the board
+
+    Returns: The mask containing the bits of all the tiles of the given column
+    """
+    return ((1 << LINES) - 1) << (column * HEIGHT)
+
+
+def has_alignment(mask: int) -> bool:
+    """
+    Checks in constant time if a mask contains 4 aligned discs, by shifting the mask in each direction
+
+    Args:
+        mask: The discs of one player
+
+    Returns: True if 4 of the discs are aligned horizontally, vertically or diagonally
+    """
+    for shift in (1, HEIGHT, HEIGHT - 1, HEIGHT + 1):  # Vertical, horizontal and the two diagonals
+        pairs = mask & (mask >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+class Connect4Bitboard:
+    """
+    The discs of a Connect 4 game, stored as one integer mask per team (bit = tile) and a mask of the occupied tiles.
+    Each tile (line, column) is represented by the bit "column * 7 + 5 - line".
+    """
+
+    def __init__(self):
+        self.masks = {}  # type: Dict[int, int]
+        self.occupied = 0
+
+    # -------------------- PUBLIC METHODS -------------------- #
+
+    def canPlay(self, column: int) -> bool:
+        """
+        Args:
+            column: A column of the board
+
+        Returns: True if the given column is not full
+        """
+        return not self.occupied & get_bit(0, column)
+
+    def getLowestFreeLine(self, column: int) -> int:
+        """
+        Args:
+            column: A column of the board that is not full
+
+        Returns: The line in which a disc played in the given column falls
+        """
+        return LINES - 1 - bin(self.occupied & get_column_mask(column)).count("1")
+
+    def play(self, line: int, column: int, team_number: int) -> None:
+        """
+        Adds a disc of the given team on the given tile
+
+        Args:
+            line: The line of the tile
+            column: The column of the tile
+            team_number: The number of the team that owns the disc
+        """
+        bit = get_bit(line, column)
+        masks = self.masks.copy()  # The dict is replaced, so that a saved state is never modified
+        masks[team_number] = masks.get(team_number, 0) | bit
+        self.masks = masks
+        self.occupied |= bit
+
+    def getMask(self, team_number: int) -> int:
+        """
+        Args:
+            team_number: The number of a team
+
+        Returns: The mask of the discs of the given team
+        """
+        return self.masks.get(team_number, 0)
+
+    def hasWon(self, team_number: int) -> bool:
+        """
+        Args:
+            team_number: The number of a team
+
+        Returns: True if 4 discs of the given team are aligned
+        """
+        return has_alignment(self.getMask(team_number))
+
+    def isFull(self) -> bool:
+        """
+        Returns: True if there is no free tile left
+        """
+        return self.occupied == BOARD_MASK
+
+    def getNumberOfDiscs(self) -> int:
+        """
+        Returns: The number of discs played
+        """
+        return bin(self.occupied).count("1")
+
+    def saveState(self) -> Tuple[Dict[int, int], int]:
+        """
+        Returns: The current state of the bitboard, that can be given to "restoreState"
+        """
+        return self.masks, self.occupied
+
+    def restoreState(self, state: Tuple[Dict[int, int], int]) -> None:
+        """
+        Args:
+            state: A state of the bitboard, saved with "saveState"
+        """
+        self.masks, self.occupied = state
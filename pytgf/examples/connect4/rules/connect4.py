@@ -1,7 +1,6 @@
-from typing import Optional, List
-
-import numpy as np
+from typing import Optional, Any
 
+from .bitboard import Connect4Bitboard
 from ..units import Bottom, Disc
 from ....board import Board
 from ....board import TileIdentifier
@@ -15,7 +14,7 @@ class Connect4Core(Core):
     def __init__(self, board: Board):
         super().__init__(board)
         # Init with an empty board
-        self._simplifiedBoard = np.zeros((6, 7))  # type: np.ndarray
+        self.bitboard = Connect4Bitboard()
 
     @property
     def _teamKillAllowed(self) -> bool:
@@ -29,11 +28,22 @@ class Connect4Core(Core):
                         entity: Optional[Entity]=None):
         if isinstance(player2, Bottom) and isinstance(player1, Disc):
             team_number = self.unitsTeam[player1]
-            self.tilesOccupants[tile_id] = [player1]
             i, j = tile_id
-            self._simplifiedBoard[i][j] = team_number  # Updating the simplified board
-            self.tilesOccupants[(i-1, j)] = [player2]  # We put the bottom of the line on the upper case
+            if self.journal.isRecording():
+                self._recordTileOccupants(tile_id)
+                self._recordTileOccupants((i-1, j))
+                self.journal.recordItem(self.unitsLocation, player2)
+                self.journal.recordItem(self._previousUnitsLocation, player2)
+                self.journal.recordState(self.bitboard)
+            self._setTileOccupants(tile_id, (player1,))
+            self.bitboard.play(i, j, team_number)  # Updating the bitboard
+            self._setTileOccupants((i-1, j), (player2,))  # We put the bottom of the line on the upper case
             self.unitsLocation[player2] = (i-1, j)
+            self._xorEntityLocation(player2, self._previousUnitsLocation[player2])
+            self._previousUnitsLocation[player2] = (i-1, j)
+            self._xorEntityLocation(player2, (i-1, j))
+            if self.compactState is not None:
+                self.compactState.setPosition(player2.stateIndex, (i-1, j))
             if entity is not None:
                 entity.kill()
             team = None
@@ -46,6 +56,11 @@ class Connect4Core(Core):
                     if player_unit not in team:
                         player_unit.kill()
 
+    def _getEntityHashIdentity(self, entity: Entity) -> Any:
+        if isinstance(entity, Disc):  # The discs of a team are interchangeable
+            return type(entity).__name__, self.unitsTeam[entity]
+        return super()._getEntityHashIdentity(entity)
+
     def _checkWin(self, line: int, column: int, team_number: int) -> bool:
         """
         :param line: The line of the last played disc
@@ -54,44 +69,9 @@ class Connect4Core(Core):
         :return: True if the game is finished
 
         Assume that the game was not terminal before the disc at (line, column) was placed.
-        Check if the game is terminated due to the (line, column) disc.
-        """
-        rows = self._enumerateLocalRows(line, column)
-        finished = False
-        for row in rows:
-            i = 0
-            j = 4
-            while j <= len(row) and not finished:
-                slack = row[i:j]
-                if (slack == team_number).all():
-                    finished = True
-                    break
-                i += 1
-                j += 1
-            if finished:
-                break
-        return finished
-
-    def _enumerateLocalRows(self, line: int, column: int) -> List[np.ndarray]:
-        """
-        :param line: the line of the last disc placed
-        :param column: the column of the last disc placed
-        :return: a list of rows in which the disc in (line, column) could have changed
+        Check if the game is terminated due to the (line, column) disc, in constant time, using the bitboard.
         """
-        rows = []
-
-        # Diagonals
-        inverted_board = np.fliplr(self._simplifiedBoard)
-        rows.append(self._simplifiedBoard.diagonal(column - line))
-        rows.append(inverted_board.diagonal(6 - column - line))
-
-        # Line
-        rows.append(self._simplifiedBoard[line])
-
-        # Column
-        rows.append(self._simplifiedBoard[:, column][line:])
-
-        return rows
+        return self.bitboard.hasWon(team_number)
 
     def _checkFinished(self):
-        return 0 not in self._simplifiedBoard
+        return self.bitboard.isFull()
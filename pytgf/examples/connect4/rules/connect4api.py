@@ -1,3 +1,4 @@
+from .bitboard import LINES, COLUMNS, get_bit
 from .connect4 import Connect4Core
 from ..units import Connect4Unit
 from ..units.bottom import Bottom
@@ -48,9 +49,8 @@ class Connect4API(TurnBasedAPI):
 
     def createMoveForDescriptor(self, unit: Connect4Unit, move_desc: MoveDescriptor, force: bool = False,
                                 is_step: bool=False) -> Path:
-        if isinstance(move_desc, int):
-            occupants = self.game.getTileOccupants((0, move_desc))
-            if self.getTileByteCode((0, move_desc)) == 0:  # Column not full
+        if isinstance(move_desc, int) and 0 <= move_desc < COLUMNS:
+            if self.game.bitboard.canPlay(move_desc):  # Column not full
                 team_number = self.game.unitsTeam[unit]
                 self.discNumber += 1
                 speed = 50
@@ -58,12 +58,7 @@ class Connect4API(TurnBasedAPI):
                 if has_graphics:
                     speed = self.game.board.graphics.size[1] * 2
                 disc = Disc(self.discNumber, self.game.unitsTeam[unit], speed=speed, graphics=has_graphics)
-                near_bottom = 0
-                for i in range(6):
-                    occupants = self.game.getTileOccupants((i, move_desc))
-                    if len(occupants) > 0 and isinstance(occupants[0], Bottom):
-                        near_bottom = i
-                        break
+                near_bottom = self.game.bitboard.getLowestFreeLine(move_desc)  # Where the bottom of the column is
                 path = ListPath(disc, [ShortMove(disc, self.game.board.getTileById((near_bottom, move_desc)),
                                                  self.game.board.getTileById((near_bottom, move_desc)), MAX_FPS,
                                                  self.game.unitsLocation)],
@@ -76,6 +71,13 @@ class Connect4API(TurnBasedAPI):
         raise UnfeasibleMoveException("The move " + str(move_desc) + " is unfeasible...")
 
     def getTileByteCode(self, tile_id: tuple) -> int:
+        i, j = tile_id
+        if 0 <= i < LINES and 0 <= j < COLUMNS:
+            bit = get_bit(i, j)
+            for team_number, mask in self.game.bitboard.masks.items():
+                if mask & bit:
+                    return team_number
+            return 0
         occupants = self.game.getTileOccupants(tile_id)
         if len(occupants) == 0 or (len(occupants) == 1 and isinstance(occupants[0], Bottom)):
             return 0
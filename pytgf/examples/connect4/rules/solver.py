@@ -0,0 +1,159 @@
+"""
+File containing the definition of a negamax solver for Connect 4, that searches directly on the bitboard
+"""
+
+from typing import Dict, Optional, Tuple
+
+from .bitboard import COLUMNS, HEIGHT, LINES, Connect4Bitboard, get_column_mask, has_alignment
+
+__author__ = "Anthony Rouneau"
+
+MAX_DISCS = LINES * COLUMNS
+COLUMNS_ORDER = (3, 2, 4, 1, 5, 0, 6)  # The central columns are part of more alignments: they are explored first
+TOP_MASKS = tuple(1 << (column * HEIGHT + LINES - 1) for column in range(COLUMNS))
+BOTTOM_MASKS = tuple(1 << (column * HEIGHT) for column in range(COLUMNS))
+COLUMN_MASKS = tuple(get_column_mask(column) for column in range(COLUMNS))
+
+# Types of bounds of a stored value
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+class Connect4Solver:
+    """
+    Negamax search with alpha beta pruning and a transposition table, working on two integers: the discs of the player
+    that must play and the occupied tiles. A position is won by the player that must play with a score of
+    (43 - number of discs after the winning disc) // 2 (the sooner, the better), lost with the opposite score, and
+    scored 0 if it is a draw or if the maximum depth is reached before the end of the game.
+    """
+
+    def __init__(self, max_depth: int=12, max_entries: int=2**20):
+        """
+        Args:
+            max_depth: The maximum number of discs played by the search (-1 = until the end of the game)
+            max_entries: The maximum number of positions stored in the transposition table (emptied when full)
+        """
+        self.maxDepth = max_depth
+        if self.maxDepth == -1:  # If there is no maximum depth...
+            self.maxDepth = MAX_DISCS
+        self.maxEntries = max_entries
+        self._table = {}  # type: Dict[int, Tuple[int, int, int]]
+        self.nodesCount = 0
+
+    # -------------------- PUBLIC METHODS -------------------- #
+
+    def getBestMove(self, bitboard: Connect4Bitboard, team_number: int) -> Optional[int]:
+        """
+        Args:
+            bitboard: The discs of the game
+            team_number: The number of the team that must play
+
+        Returns: The best column to play for the given team, or None if the board is full
+        """
+        return self.solve(bitboard, team_number)[1]
+
+    def solve(self, bitboard: Connect4Bitboard, team_number: int) -> Tuple[int, Optional[int]]:
+        """
+        Args:
+            bitboard: The discs of the game
+            team_number: The number of the team that must play
+
+        Returns: The score of the position for the given team, and the best column to play (None if the board is full)
+        """
+        self.nodesCount = 0
+        position = bitboard.getMask(team_number)
+        mask = bitboard.occupied
+        nb_discs = bitboard.getNumberOfDiscs()
+        best_score = -MAX_DISCS
+        best_column = None
+        alpha = -MAX_DISCS
+        for column in COLUMNS_ORDER:
+            if not mask & TOP_MASKS[column]:
+                if self._isWinningMove(position, mask, column):
+                    return (MAX_DISCS + 1 - nb_discs) // 2, column
+                new_mask = mask | (mask + BOTTOM_MASKS[column])
+                score = -self._negamax(position ^ mask, new_mask, nb_discs + 1, self.maxDepth - 1, -MAX_DISCS, -alpha)
+                if best_column is None or score > best_score:
+                    best_score = score
+                    best_column = column
+                alpha = max(alpha, score)
+        if best_column is None:
+            return 0, None
+        return best_score, best_column
+
+    def clear(self) -> None:
+        """
+        Empties the transposition table
+        """
+        self._table = {}
+
+    # -------------------- PROTECTED METHODS -------------------- #
+
+    def _negamax(self, position: int, mask: int, nb_discs: int, depth: int, alpha: int, beta: int) -> int:
+        """
+        Args:
+            position: The discs of the player that must play
+            mask: The occupied tiles
+            nb_discs: The number of discs played
+            depth: The number of discs that can still be played by the search
+            alpha: The score that the player is already sure to get
+            beta: The score that the opponent is already sure to limit the player to
+
+        Returns: The score of the position for the player that must play (exact if between alpha and beta)
+        """
+        self.nodesCount += 1
+        if nb_discs == MAX_DISCS:
+            return 0
+        for column in COLUMNS_ORDER:
+            if not mask & TOP_MASKS[column] and self._isWinningMove(position, mask, column):
+                return (MAX_DISCS + 1 - nb_discs) // 2
+        if depth <= 0:
+            return 0
+        key = position + mask  # Unique for each position
+        entry = self._table.get(key)
+        if entry is not None and entry[0] >= depth:
+            entry_depth, value, bound = entry
+            if bound == EXACT:
+                return value
+            elif bound == LOWER_BOUND:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+        original_alpha = alpha
+        best_score = -MAX_DISCS
+        opponent_position = position ^ mask
+        for column in COLUMNS_ORDER:
+            if not mask & TOP_MASKS[column]:
+                score = -self._negamax(opponent_position, mask | (mask + BOTTOM_MASKS[column]), nb_discs + 1,
+                                       depth - 1, -beta, -alpha)
+                if score > best_score:
+                    best_score = score
+                    if score > alpha:
+                        alpha = score
+                        if alpha >= beta:
+                            break
+        if len(self._table) >= self.maxEntries:
+            self._table = {}
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self._table[key] = (depth, best_score, bound)
+        return best_score
+
+    @staticmethod
+    def _isWinningMove(position: int, mask: int, column: int) -> bool:
+        """
+        Args:
+            position: The discs of the player that must play
+            mask: The occupied tiles
+            column: A column that is not full
+
+        Returns: True if playing in the given column makes the player win
+        """
+        return has_alignment(position | ((mask + BOTTOM_MASKS[column]) & COLUMN_MASKS[column]))
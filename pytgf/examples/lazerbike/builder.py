@@ -8,7 +8,8 @@ from .rules import LazerBikeCore, LazerBikeAPI
 from .units.bike import Bike
 from ...board import Builder
 from ...controls.controllers import Bot, Human
-from ...game.realtime import RealTimeMainLoop
+from ...game.logicalloop import PROCESS_EXECUTION
+from ...game.realtime import RealTimeMainLoop, HeadlessRealTimeMainLoop
 
 human_controls = [(K_RIGHT, K_LEFT, K_UP, K_DOWN),
                   (K_d, K_a, K_w, K_s),
@@ -22,7 +23,7 @@ default_initial_positions = {1: (2, 2, GO_RIGHT), 2: (12, 12, GO_LEFT), 3: (12,
 
 
 def add_controller(main_loop: RealTimeMainLoop, player_class, player_number: int, player_team: int, speed: int,
-                   max_trace: int, init_positions, graphics):
+                   max_trace: int, init_positions, graphics, execution: int=PROCESS_EXECUTION):
     global nb_human
     if issubclass(player_class, Bot):
         linker = LazerBikeBotControllerWrapper(player_class(player_number))
@@ -39,12 +40,13 @@ def add_controller(main_loop: RealTimeMainLoop, player_class, player_number: int
     initial_direction = player_info[2]
     main_loop.addUnit(Bike(speed, player_number, max_trace=max_trace, initial_direction=initial_direction,
                            graphics=graphics),
-                      linker, start_pos, initial_direction, team=player_team)
+                      linker, start_pos, initial_direction, team=player_team, execution=execution)
 
 
 def create_game(player_info: Tuple[Dict[int, Type], Dict[int, int]], width: int=1024, height: int=768, lines: int=15,
                 columns: int=15, init_positions: Dict[int, Tuple[int, int, Direction]]=default_initial_positions,
-                speed: Optional[int]=None, max_trace: int=-1, graphics: bool=True):
+                speed: Optional[int]=None, max_trace: int=-1, graphics: bool=True, headless: bool=False,
+                execution: int=PROCESS_EXECUTION):
     global nb_human
     builder = Builder(width, height, lines, columns)
     builder.setBordersColor((0, 125, 125))
@@ -54,12 +56,16 @@ def create_game(player_info: Tuple[Dict[int, Type], Dict[int, int]], width: int=
 
     if speed is None:
         speed = 0.33 * board.graphics.sideLength
+    if headless:  # Nothing is drawn: neither the board nor the bikes need their graphics
+        board.graphics = None
+        graphics = False
     game = LazerBikeCore(board)
-    main_loop = RealTimeMainLoop(LazerBikeAPI(game))
+    main_loop_class = HeadlessRealTimeMainLoop if headless else RealTimeMainLoop
+    main_loop = main_loop_class(LazerBikeAPI(game))
     player_classes = player_info[0]
     player_teams = player_info[1]
     for player_number, player_class in player_classes.items():
         add_controller(main_loop, player_class, player_number, player_teams[player_number], int(speed),
-                       max_trace, init_positions, graphics)
+                       max_trace, init_positions, graphics, execution)
     nb_human = 0
     return main_loop
@@ -39,6 +39,6 @@ class Bike(Unit):
 
     def turn(self, direction: int):
         angle = (direction - self.lastAction) * 90
-        self.sprite.rotate(angle)
+        self._getWritableSprite().rotate(angle)
 
 
@@ -1,14 +1,24 @@
 from ..rules.sokoban import FULL_HOLE_COLOR
 from ..units.box import Box
 from ....board import Tile, pathfinder
+from ....board.pathcache import ShortestPathsCache
 from ....characters.moves import ListPath, MoveDescriptor, Path, ShortMove
 from ....characters.units import Unit
 from ....controls.wrappers.wrapper import MAX_FPS
 from ....game import UnfeasibleMoveException
+from ....game import Core
 from ....game.realtime import API
 
 
+def is_not_deadly(tile: Tile) -> bool:
+    return not tile.deadly
+
+
 class SokobanAPI(API):
+    def __init__(self, game: Core):
+        super().__init__(game)
+        self._shortestPaths = ShortestPathsCache(game.board, is_not_deadly)
+
     def createMoveForDescriptor(self, unit: Unit, move_descriptor, force: bool=False, is_step: bool=False) \
             -> Path:
         if isinstance(move_descriptor, tuple) and len(move_descriptor) == 2:
@@ -17,10 +27,8 @@ class SokobanAPI(API):
                 source_tile = self.game.board.getTileById(self.game.getTileForUnit(unit).identifier)
                 moves = []
                 try:
-                    tile_ids = pathfinder.get_shortest_path(source_tile.identifier, destination_tile.identifier,
-                                                            self.game.board.getTileById,
-                                                            lambda tile: tile.neighbours,
-                                                            lambda tile: tile.walkable and not tile.deadly)
+                    tile_ids = self._getShortestPathsCache().getShortestPath(source_tile.identifier,
+                                                                             destination_tile.identifier)
                     current_tile = source_tile
                     tile_ids = self._checkIfBoxInTheWay(source_tile, tile_ids)
                     if len(tile_ids) > 0:
@@ -34,6 +42,11 @@ class SokobanAPI(API):
                     pass
         raise UnfeasibleMoveException()
 
+    def _getShortestPathsCache(self) -> ShortestPathsCache:
+        if self._shortestPaths.board is not self.game.board:  # This API was copied with another board
+            self._shortestPaths = ShortestPathsCache(self.game.board, is_not_deadly)
+        return self._shortestPaths
+
     def _encodeMoveIntoPositiveNumber(self, player_number: int, move_descriptor: MoveDescriptor) -> int:
         return move_descriptor[0] + (move_descriptor[1] << 16)
 
@@ -1,3 +1,5 @@
 from .api import API
 from .core import Core, UnfeasibleMoveException
 
+from .compactstate import CompactGameState
+from .sharedstate import SharedGameState, SharedStateCapacityException
@@ -3,8 +3,10 @@ File containing the definition of a basic API to interact with a game from a con
 """
 import copy
 from abc import ABCMeta, abstractmethod
-from typing import Tuple, Dict, Union, List
+from functools import partial
+from typing import Tuple, Dict, Union, List, Any
 
+import numpy as np
 import pandas as pd
 
 from .core import Core, UnfeasibleMoveException
@@ -39,6 +41,7 @@ class API(metaclass=ABCMeta):
         self.game = game
         self.id = id(self)
         self._actionsHistory = {pl_num: [] for pl_num in self.getPlayerNumbers()}
+        self._ownedHistories = set(self._actionsHistory.keys())  # Histories not shared with a snapshot of this API
 
     # -------------------- PUBLIC METHODS -------------------- #
 
@@ -55,7 +58,7 @@ class API(metaclass=ABCMeta):
         Returns:
             A copy of this GameState in which the move have been applied (if it is possible)
         """
-        new_game_state = self.copy()
+        new_game_state = self.snapshot()
         feasible_move = new_game_state.performMove(player_number, wanted_move, force=force)
         return feasible_move, new_game_state if feasible_move else None
 
@@ -70,21 +73,13 @@ class API(metaclass=ABCMeta):
             - A boolean -- True if all the moves succeeded, False otherwise
             - A copy of this GameState in which the moves have been applied (if a move is unfeasible, returns None).
         """
-        moves = []
-        for pl_num in self._getSequenceOfPlayerNumbers():
-            if pl_num in player_moves:
-                moves.append((pl_num, player_moves[pl_num]))
-        new_game_state = self.copy()
-        for player_number, wanted_move in moves:
-            feasible_move = new_game_state.performMove(player_number, wanted_move)
-
-            if not feasible_move:
-                return False, None
-        if self._mustCheckIfFinishedAfterSimulations():
-            new_game_state.game.checkIfFinished()
+        new_game_state = self.snapshot()
+        if not new_game_state.performMoves(player_moves):
+            return False, None
         return True, new_game_state
 
-    def performMove(self, player_number: int, move_descriptor: MoveDescriptor, force: bool = False) -> bool:
+    def performMove(self, player_number: int, move_descriptor: MoveDescriptor, force: bool = False,
+                    record: bool=False) -> bool:
         """
         Performs the move inside this GameState
 
@@ -92,30 +87,138 @@ class API(metaclass=ABCMeta):
             player_number: The number of the player moving
             move_descriptor: The move to perform (either a Path or a move descriptor)
             force: Boolean that indicates if the move must be forced into the game (is optional in the game def...)
+            record:
+                If True, the modifications made by the move are recorded so that it can be undone with "undoMove".
+                Nothing is recorded if the move is unfeasible.
+
+        Returns: False if the move is unfeasible, True otherwise
         """
+        if record:
+            self._startRecord()
         if self.game.isFinished():
             return True
         unit = self.game.getUnitForNumber(player_number)  # type: Unit
         try:
             move = self.createMoveForDescriptor(unit, move_descriptor, force=force, is_step=True)
+            self.game.journal.recordItem(self.game.unitsLocation, move.unit)
             new_tile_id = move.complete()
+            self.game.journal.recordState(unit)
             unit.currentAction = move_descriptor
             self._addActionToHistory(move_descriptor, player_number)
             self.game.updateGameState(move.unit, new_tile_id, move_descriptor)
             self._reactToMovePerformed(player_number, move)
 
         except UnfeasibleMoveException:
+            if record:
+                self.undoMove()
             return False
         except IllegalMove:
             self._addActionToHistory(move_descriptor, player_number)
             unit.kill()
         return True
 
+    def performMoves(self, player_moves: Dict[int, MoveDescriptor], record: bool=False) -> bool:
+        """
+        Performs the given moves for the key players inside this GameState
+
+        Args:
+            player_moves: a dictionary with player_number as key and a move as value for the key player
+            record:
+                If True, the modifications made by the moves are recorded so that they can be undone all together
+                with one call to "undoMove". Nothing is recorded if a move is unfeasible.
+
+        Returns: True if all the moves succeeded, False otherwise
+        """
+        if record:
+            self._startRecord()
+        for player_number in self._getSequenceOfPlayerNumbers():
+            if player_number in player_moves:
+                if not self.performMove(player_number, player_moves[player_number]):
+                    if record:
+                        self.undoMove()
+                    return False
+        if self._mustCheckIfFinishedAfterSimulations():
+            self.game.checkIfFinished()
+        return True
+
+    def undoMove(self) -> None:
+        """
+        Undoes the last move (or moves) performed with "record=True", along with every modification made after it
+
+        Raises:
+            EmptyJournalException: If there is no recorded move left to undo
+        """
+        self.game.journal.undo()
+
+    def commitMove(self) -> None:
+        """
+        Keeps the last move (or moves) performed with "record=True": its record is closed without being undone, so
+        that the next modifications are not recorded anymore (unless another record is open)
+
+        Raises:
+            EmptyJournalException: If there is no recorded move to commit
+        """
+        self.game.journal.commit()
+
+    def saveState(self) -> Dict[str, Any]:
+        """
+        Returns:
+            The current state of this API, that can be given back to "restoreState".
+            The game and the actions histories are not part of it, their modifications are recorded separately.
+        """
+        state = {}
+        for key, value in self.__dict__.items():
+            if key != "game" and key != "_actionsHistory" and key != "_ownedHistories":
+                if isinstance(value, (list, dict, set)):
+                    value = copy.copy(value)
+                state[key] = value
+        return state
+
+    def restoreState(self, state: Dict[str, Any]) -> None:
+        """
+        Restores a state of this API, saved with "saveState"
+
+        Args:
+            state: The state to restore
+        """
+        self.__dict__.update(state)
+
+    def _startRecord(self) -> None:
+        """
+        Opens a new record in the journal of the game, in which the state of this API is recorded first
+        """
+        self.game.journal.startRecord()
+        self.game.journal.recordState(self)
+
     def _addActionToHistory(self, move_descriptor, player_number):
+        encoded_move = self.encodeMove(player_number, move_descriptor)
+        self._getWritableHistory(player_number).append(encoded_move)
+        self.game.journal.record(partial(self._removeLastActionFromHistory, player_number))
+
+    def _removeLastActionFromHistory(self, player_number: int) -> None:
+        """
+        Removes the last action of the history of the given player
+
+        Args:
+            player_number: The number representing the player
+        """
+        self._getWritableHistory(player_number).pop()
+
+    def _getWritableHistory(self, player_number: int) -> List[int]:
+        """
+        Args:
+            player_number: The number representing the player of which the history will be modified
+
+        Returns: The actions history of the player, copied beforehand if it was shared with a snapshot of this API
+        """
         if player_number not in self._actionsHistory:
+            self.game.journal.recordItem(self._actionsHistory, player_number)
             self._actionsHistory[player_number] = []
-        encoded_move = self.encodeMove(player_number, move_descriptor)
-        self._actionsHistory[player_number].append(encoded_move)
+            self._ownedHistories.add(player_number)
+        elif player_number not in self._ownedHistories:
+            self._actionsHistory[player_number] = list(self._actionsHistory[player_number])
+            self._ownedHistories.add(player_number)
+        return self._actionsHistory[player_number]
 
     def getActionsHistory(self, player_number: int) -> List[MoveDescriptor]:
         """
@@ -258,7 +361,7 @@ class API(metaclass=ABCMeta):
         """
         suicidal = {}
         winning = {}
-        api = self.copy()
+        api = self.snapshot()
         for player_number in self.game.playerNumbers:
             player_deadly = False
             player_winning = False
@@ -340,6 +443,30 @@ class API(metaclass=ABCMeta):
     def copy(self):
         return copy.deepcopy(self)
 
+    def snapshot(self) -> 'API':
+        """
+        Creates a copy-on-write snapshot of this API, much cheaper than "copy" (see "Core.snapshot").
+        Used to simulate moves.
+
+        Returns: A snapshot of this API that can be modified without affecting this one
+        """
+        cls = self.__class__
+        result = cls.__new__(cls)
+        memo = {id(self): result}
+        result.game = self.game.snapshot(memo)
+        for key, value in self.__dict__.items():
+            if key == "_actionsHistory":
+                value = value.copy()
+            elif key == "_ownedHistories":
+                value = set()
+            elif key != "game":
+                value = copy.deepcopy(value, memo)
+            else:
+                continue
+            setattr(result, key, value)
+        self._ownedHistories = set()
+        return result
+
     def encodeMove(self, player_number: int, move_descriptor: MoveDescriptor) -> int:
         """
         Encode a move to be performed (hence, this API must be in a state where the move represented by the descriptor
@@ -383,17 +510,22 @@ class API(metaclass=ABCMeta):
             raise NoMovementException()
         return self._decodeMoveFromPositiveNumber(player_number, encoded_move)
 
-    def getBoardByteCodes(self) -> Tuple[Tuple[int, ...], ...]:
-        """
-        Returns: A tab containing the byte code of each tile of the board
+    def getBoardByteCodes(self) -> np.ndarray:
         """
-        tab = []
-        for i in range(self.game.board.lines):
-            tab_line = []
-            for j in range(self.game.board.columns):
-                tab_line.append(self.getTileByteCode((i, j)))
-            tab.append(tuple(tab_line))
-        return tuple(tab)
+        Returns:
+            A read-only array containing the byte code of each tile of the board. If the game uses a compact state
+            and the byte codes are not customized, it is a view that follows the modifications of the game
+            (copy it to keep the current codes).
+        """
+        if type(self).getTileByteCode is API.getTileByteCode:
+            if self.game.compactState is not None:
+                return self.game.compactState.getBoardByteCodes()
+            byte_codes = self.game.board.getByteCodes()
+        else:
+            byte_codes = np.array([[self.getTileByteCode((i, j)) for j in range(self.game.board.columns)]
+                                   for i in range(self.game.board.lines)])
+        byte_codes.flags.writeable = False
+        return byte_codes
 
     def convertIntoMoveSequence(self, move_combination: Union[Dict[int, MoveDescriptor],
                                                               List[Dict[int, MoveDescriptor]]],
@@ -519,8 +651,7 @@ class API(metaclass=ABCMeta):
         pass
 
     def __hash__(self):
-        hashable = self.getBoardByteCodes()
-        return hashable.__hash__()
+        return self.game.zobristHash
 
     def __eq__(self, other):
         try:
@@ -0,0 +1,272 @@
+"""
+File containing the definition of a CompactGameState, an array-backed representation of the state of a game
+"""
+
+from functools import partial
+from typing import Optional
+
+import numpy as np
+
+from ..board import Board, TileIdentifier
+from ..characters.moves import MoveDescriptor
+from ..characters.units import Entity
+from ..utils.journal import Journal
+
+__author__ = 'Anthony Rouneau'
+
+
+NO_POSITION = np.iinfo(np.int32).min  # Row and column of an entity that is not located on any tile
+NO_TEAM = -1  # Team of an entity that is not a unit of the game (e.g. a trace or a bullet)
+
+
+class CompactGameState:
+    """
+    Stores the state of a game in NumPy arrays, that can be read without walking through the objects of the game
+    (e.g. to encode the state, or to share it with other processes, see "SharedGameState"). It is only a mirror of the
+    game, kept up to date next to its objects: the game is still copied and hashed through its objects.
+    The entities are indexed by their order of arrival in the game (see "Entity.stateIndex").
+
+        - tiles: The byte code of each tile of the board (see "API.getTileByteCode")
+        - occupancy: The number of entities located on each tile of the board
+        - positions: The (row, column) of the tile on which each entity is located
+        - alive: True for each entity that is alive
+        - teams: The team of each unit (NO_TEAM for the entities that are not units)
+        - lastActions: The last action performed by each unit (None if there is none)
+    """
+
+    def __init__(self, lines: int, columns: int, capacity: int=16):
+        """
+        Instantiates an empty compact state for a board of the given size
+
+        Args:
+            lines: The number of lines in the board
+            columns: The number of columns in the board
+            capacity: The number of entities that can be stored before the arrays are enlarged
+        """
+        self.tiles = np.zeros((lines, columns), dtype=np.int8)
+        self.occupancy = np.zeros((lines, columns), dtype=np.int16)
+        self.positions = np.full((capacity, 2), NO_POSITION, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.teams = np.full(capacity, NO_TEAM, dtype=np.int32)
+        self.lastActions = np.full(capacity, None, dtype=object)
+        self.entitiesCount = 0
+        self.journal = None  # type: Optional[Journal]  # Journal in which the modifications are recorded
+
+    # -------------------- PUBLIC METHODS -------------------- #
+
+    @classmethod
+    def fromBoard(cls, board: Board) -> 'CompactGameState':
+        """
+        Creates a compact state, without any entity, of which the tiles are initialized with the given board
+
+        Args:
+            board: The board of the game
+
+        Returns: The compact state of the board
+        """
+        state = cls(board.lines, board.columns)
+        state.tiles[:] = board.getByteCodes()
+        return state
+
+    @staticmethod
+    def getTileCode(deadly: bool, walkable: bool) -> int:
+        """
+        Args:
+            deadly: True if the tile is deadly
+            walkable: True if the tile is walkable
+
+        Returns: The byte code of a tile that has the given properties (see "API.getTileByteCode")
+        """
+        return int(deadly) + 2 * int(not walkable)
+
+    def addEntity(self, entity: Entity, team_number: int=NO_TEAM) -> int:
+        """
+        Registers the given entity in this state, and sets its "stateIndex"
+
+        Args:
+            entity: The entity to register
+            team_number: The number of the team of the entity, if it is a unit of the game
+
+        Returns: The index of the entity in the arrays of this state
+        """
+        if self.entitiesCount == len(self.alive):
+            self._enlarge()
+        index = self.entitiesCount
+        if self.journal is not None and self.journal.isRecording():
+            self.journal.recordAttribute(entity, "stateIndex")
+            self.journal.record(self._removeLastEntity)
+        self.entitiesCount += 1
+        entity.stateIndex = index
+        self.teams[index] = team_number
+        self.updateEntity(entity)
+        return index
+
+    def updateEntity(self, entity: Entity) -> None:
+        """
+        Copies the alive status and the last action of the given entity into this state
+
+        Args:
+            entity: The registered entity that has been modified
+        """
+        index = entity.stateIndex
+        self._recordEntity(index)
+        self.alive[index] = entity.isAlive()
+        self.lastActions[index] = getattr(entity, "lastAction", None)
+
+    def setTeam(self, entity: Entity, team_number: int) -> None:
+        """
+        Args:
+            entity: The registered entity of which the team is set
+            team_number: The number of the team of the entity
+        """
+        self._recordEntity(entity.stateIndex)
+        self.teams[entity.stateIndex] = team_number
+
+    def setPosition(self, index: int, tile_id: Optional[TileIdentifier]) -> None:
+        """
+        Moves the entity located at the given index on the given tile, and updates the occupancy of the board
+
+        Args:
+            index: The index of the entity in this state
+            tile_id: The identifier of the tile on which the entity is now located (None if it left the board)
+        """
+        i, j = self.positions[index]
+        if self.journal is not None and self.journal.isRecording():
+            self.journal.record(partial(self.setPosition, index, None if i == NO_POSITION else (i, j)))
+        if i != NO_POSITION and self._isOnBoard(i, j):
+            self.occupancy[i, j] -= 1
+        if tile_id is None:
+            self.positions[index] = NO_POSITION
+        else:
+            self.positions[index] = tile_id
+            if self._isOnBoard(*tile_id):
+                self.occupancy[tile_id] += 1
+
+    def setTile(self, tile_id: TileIdentifier, deadly: bool, walkable: bool) -> None:
+        """
+        Updates the byte code of a tile of which the properties have changed
+
+        Args:
+            tile_id: The identifier of the tile
+            deadly: True if the tile is now deadly
+            walkable: True if the tile is now walkable
+        """
+        if self.journal is not None and self.journal.isRecording():
+            self.journal.record(partial(self.tiles.__setitem__, tile_id, self.tiles[tile_id]))
+        self.tiles[tile_id] = self.getTileCode(deadly, walkable)
+
+    def getBoardByteCodes(self) -> np.ndarray:
+        """
+        Returns: A read-only view on the byte codes of the tiles of the board (see "API.getTileByteCode")
+        """
+        view = self.tiles.view()
+        view.flags.writeable = False
+        return view
+
+    def isTileEmpty(self, tile_id: TileIdentifier) -> bool:
+        """
+        Args:
+            tile_id: The identifier of a tile
+
+        Returns: True if the tile is inside the board and no entity is located on it
+        """
+        i, j = tile_id
+        return self._isOnBoard(i, j) and self.occupancy.item(i, j) == 0
+
+    def getPosition(self, entity: Entity) -> Optional[TileIdentifier]:
+        """
+        Args:
+            entity: A registered entity
+
+        Returns: The identifier of the tile on which the entity is located, or None if it is not on the board
+        """
+        i, j = self.positions[entity.stateIndex]
+        if i == NO_POSITION:
+            return None
+        return int(i), int(j)
+
+    def getLastAction(self, entity: Entity) -> MoveDescriptor:
+        """
+        Args:
+            entity: A registered entity
+
+        Returns: The last action performed by the given entity (None if there is none)
+        """
+        return self.lastActions[entity.stateIndex]
+
+    def copy(self) -> 'CompactGameState':
+        """
+        Returns: A copy of this state, which does not share its arrays nor its journal with this one
+        """
+        cls = self.__class__
+        result = cls.__new__(cls)
+        result.tiles = self.tiles.copy()
+        result.occupancy = self.occupancy.copy()
+        result.positions = self.positions.copy()
+        result.alive = self.alive.copy()
+        result.teams = self.teams.copy()
+        result.lastActions = self.lastActions.copy()
+        result.entitiesCount = self.entitiesCount
+        result.journal = None
+        return result
+
+    # -------------------- PROTECTED METHODS -------------------- #
+
+    def _isOnBoard(self, i: int, j: int) -> bool:
+        """
+        Args:
+            i: The row index of a tile
+            j: The column index of a tile
+
+        Returns: True if the tile is inside the board (the games can place entities outside of it, e.g. on (-1, -1))
+        """
+        return 0 <= i < self.occupancy.shape[0] and 0 <= j < self.occupancy.shape[1]
+
+    def _recordEntity(self, index: int) -> None:
+        """
+        Records the alive status, the team and the last action of the entity at the given index before they change
+
+        Args:
+            index: The index of the entity that will be modified
+        """
+        if self.journal is not None and self.journal.isRecording():
+            self.journal.record(partial(self._restoreEntity, index, self.alive[index], self.teams[index],
+                                        self.lastActions[index]))
+
+    def _restoreEntity(self, index: int, alive: bool, team_number: int, last_action: MoveDescriptor) -> None:
+        """
+        Puts back the values recorded by "_recordEntity"
+
+        Args:
+            index: The index of the entity
+            alive: The recorded alive status
+            team_number: The recorded team
+            last_action: The recorded last action
+        """
+        self.alive[index] = alive
+        self.teams[index] = team_number
+        self.lastActions[index] = last_action
+
+    def _removeLastEntity(self) -> None:
+        """
+        Unregisters the last entity registered in this state
+        """
+        self.entitiesCount -= 1
+        index = self.entitiesCount
+        self.setPosition(index, None)
+        self._restoreEntity(index, False, NO_TEAM, None)
+
+    def _enlarge(self) -> None:
+        """
+        Doubles the number of entities that can be stored in this state
+        """
+        capacity = len(self.alive)
+        self.positions = np.concatenate((self.positions, np.full((capacity, 2), NO_POSITION, dtype=np.int32)))
+        self.alive = np.concatenate((self.alive, np.zeros(capacity, dtype=bool)))
+        self.teams = np.concatenate((self.teams, np.full(capacity, NO_TEAM, dtype=np.int32)))
+        self.lastActions = np.concatenate((self.lastActions, np.full(capacity, None, dtype=object)))
+
+    def __deepcopy__(self, memo={}):
+        result = self.copy()
+        memo[id(self)] = result
+        return result
@@ -4,7 +4,8 @@ File containing the definition of a Game.
 
 from abc import ABCMeta, abstractmethod
 from copy import deepcopy
-from typing import Dict, List, Union, Tuple, Callable, Optional
+from functools import partial
+from typing import Dict, List, Union, Tuple, Callable, Optional, Any, Set, Iterable
 
 from ..board import Board, Tile
 from ..board import TileIdentifier
@@ -15,6 +16,9 @@ from ..characters.units import Unit
 from ..characters.utils.units import resize_unit
 from ..controls.events import KeyboardEvent, MouseEvent
 from ..utils.geom import Coordinates
+from ..utils.journal import Journal
+from ..utils.zobrist import get_zobrist_key
+from .compactstate import CompactGameState, NO_TEAM
 
 __author__ = 'Anthony Rouneau'
 
@@ -65,10 +69,24 @@ class Core(metaclass=ABCMeta):
         self.avatars = {}  # type: Dict[int, Unit]
         self.controlledBy = {}  # type: Dict[int, int]
         self._activeUnits = {}  # type: Dict[int, Unit]
+        # Alive active units (player number -> team number), and their count in each team (see "checkIfFinished")
+        self._aliveActiveUnits = {}  # type: Dict[int, int]
+        self._teamsAliveUnitsCount = {}  # type: Dict[int, int]
+        self._teamsAlive = 0  # Number of teams that still have an alive active unit
         self.unitsLocation = {}   # type: Dict[Entity, tuple]
         self._previousUnitsLocation = {}   # type: Dict[Entity, tuple]
-        self.tilesOccupants = {}  # type: Dict[tuple, List[Entity]]
+        # The occupants of each tile, as ordered sets (dictionaries whose values are all None)
+        self.tilesOccupants = {}  # type: Dict[tuple, Dict[Entity, None]]
+        self._entitiesOwner = {}  # type: Dict[Entity, int]  # Player number of the unit that owns each entity
         self.addCustomMoveFunc = None  # type: Callable[[Entity, Path, MoveDescriptor], None]
+        # Tiles and entities that are not shared with a snapshot of this game (see "snapshot")
+        self._ownedTiles = set()  # type: Set[TileIdentifier]
+        self._ownedEntities = set()  # type: Set[Entity]
+        self.journal = Journal()  # Records the modifications of the game so that they can be undone
+        self.board.journal = self.journal
+        self.compactState = None  # type: Optional[CompactGameState]  # See "useCompactState"
+        self.board.game = self
+        self.zobristHash = 0  # Hash of the state of this game, updated incrementally (see "xorHash")
 
     # -------------------- PUBLIC METHODS -------------------- #
 
@@ -87,7 +105,18 @@ class Core(metaclass=ABCMeta):
             is_avatar: True if this unit is controlled by a bot or a human, and hence, is his avatar in the game
             active: True if this unit must count in the "checkIfFinished" method. False if it must not count...
         """
+        if self.journal.isRecording():
+            for dictionary in (self.units, self.avatars, self.controlledBy, self._activeUnits):
+                self.journal.recordItem(dictionary, unit.playerNumber)
+            self.journal.recordItem(self.unitsTeam, unit)
+            self.journal.recordItem(self.teams, team_number, copy_value=True)
+            self.journal.recordAttribute(self, "playerNumbers", copy_value=True)
+        self.unitsTeam[unit] = team_number  # Set before the unit is placed, the team can be part of its hash
         self.addUnitToTile(origin_tile_id, unit)
+        unit.game = self
+        if isinstance(unit, Unit):
+            for entity in unit.getentitys():
+                self.setEntityOwner(entity, unit)
         self.units[unit.playerNumber] = unit
         if is_avatar:
             self.avatars[unit.playerNumber] = unit
@@ -97,12 +126,85 @@ class Core(metaclass=ABCMeta):
             self.controlledBy[unit.playerNumber] = controlled_by
         if active:
             self._activeUnits[unit.playerNumber] = unit
-        self.unitsTeam[unit] = team_number
         resize_unit(unit, self.board)
         if team_number in self.teams.keys():
             self.teams[team_number].append(unit)
         else:
             self.teams[team_number] = [unit]
+        self._updateAliveActiveUnits(unit)
+
+    def useCompactState(self) -> CompactGameState:
+        """
+        Mirrors the state of this game into a CompactGameState, kept up to date by the game from now on.
+        This is an opt-in mirror to read the state as arrays: it is copied with the game (in addition to the objects
+        of the game), and the hash of the game does not depend on it (see "zobristHash").
+
+        Returns: The compact state of this game
+        """
+        if self.compactState is None:
+            compact_state = CompactGameState.fromBoard(self.board)
+            compact_state.journal = self.journal
+            entities = list(self.unitsTeam.keys())
+            entities.extend([entity for entity in self._previousUnitsLocation if entity not in self.unitsTeam])
+            for entity in entities:
+                compact_state.addEntity(entity, self.unitsTeam.get(entity, NO_TEAM))
+                if entity in self.unitsLocation:
+                    compact_state.setPosition(entity.stateIndex, self.unitsLocation[entity])
+            self.compactState = compact_state
+        return self.compactState
+
+    def xorHash(self, *components) -> None:
+        """
+        XORs the Zobrist key of the given components into the hash of this game.
+        XORing the same components a second time removes them from the hash.
+
+        Args:
+            *components: Values that describe a part of the state of the game (e.g. "turn", 2)
+        """
+        if self.journal.isRecording():
+            self.journal.recordAttribute(self, "zobristHash")
+        self.zobristHash ^= get_zobrist_key(components)
+
+    def beforeEntityModification(self, entity: Entity) -> None:
+        """
+        Records the state of the given entity and removes its status from the hash of this game.
+        Must be called before an entity placed on this game is modified (see "afterEntityModification")
+
+        Args:
+            entity: The entity that will be modified
+        """
+        self.journal.recordState(entity)
+        if entity in self._previousUnitsLocation:
+            self._xorEntityStatus(entity)
+
+    def afterEntityModification(self, entity: Entity) -> None:
+        """
+        Puts back the status of the given entity in the hash of this game, and in its compact state if any.
+        Must be called after an entity placed on this game was modified (see "beforeEntityModification")
+
+        Args:
+            entity: The entity that has been modified
+        """
+        if entity in self._previousUnitsLocation:
+            self._xorEntityStatus(entity)
+            if self.compactState is not None:
+                self.compactState.updateEntity(entity)
+        if entity in self.unitsTeam:
+            self._updateAliveActiveUnits(entity)
+
+    def afterTileModification(self, old_tile: Tile, new_tile: Tile) -> None:
+        """
+        Updates the hash of this game, and its compact state if any, after a tile of the board was replaced
+
+        Args:
+            old_tile: The tile as it was before its modification
+            new_tile: The tile that replaced it
+        """
+        tile_id = new_tile.identifier
+        self.xorHash("tile", tile_id, CompactGameState.getTileCode(old_tile.deadly, old_tile.walkable))
+        self.xorHash("tile", tile_id, CompactGameState.getTileCode(new_tile.deadly, new_tile.walkable))
+        if self.compactState is not None:
+            self.compactState.setTile(tile_id, new_tile.deadly, new_tile.walkable)
 
     def getTileForUnit(self, unit: Unit) -> Tile:
         """
@@ -143,7 +245,10 @@ class Core(metaclass=ABCMeta):
                     raise InconsistentGameStateException(error_msg)
                 else:
                     return
+            unit = self.getWritableEntity(unit)
+            self.beforeEntityModification(unit)
             unit.lastAction = move_descriptor
+            self.afterEntityModification(unit)
             self.addUnitToTile(tile_id, unit)
             if self.board.getTileById(tile_id).deadly:
                 unit.kill()
@@ -151,9 +256,10 @@ class Core(metaclass=ABCMeta):
             else:
                 if self._tileHasTwoOrMoreOccupants(tile_id):
                     self._handleCollision(unit, self.tilesOccupants[tile_id], tile_id)
-                for unit in self.tilesOccupants[tile_id]:
-                    if not unit.isAlive():
-                        self.tilesOccupants[tile_id].remove(unit)
+                self._recordTileOccupants(tile_id)
+                occupants = self._getWritableTileOccupants(tile_id)
+                for occupant in [occupant for occupant in occupants if not occupant.isAlive()]:
+                    del occupants[occupant]
 
     def copy(self) -> 'Core':
         """
@@ -163,6 +269,100 @@ class Core(metaclass=ABCMeta):
         """
         return deepcopy(self)
 
+    def snapshot(self, memo: Optional[Dict[int, Any]]=None) -> 'Core':
+        """
+        Creates a copy-on-write snapshot of this game, much cheaper than "copy" for the game simulations.
+        The units are copied right away, but the snapshot shares the lines of the board, the occupants of the tiles
+        and the entities that are not units with this game. These shared structures are only copied by the
+        game (this one or the snapshot) that modifies them first.
+
+        Args:
+            memo:
+                The dictionary used by "deepcopy" in which the copies of the units are registered.
+                It serves to copy the attributes that are unknown to this class (e.g. attributes of a subclass)
+
+        Returns: A snapshot of this game that can be modified without affecting this one
+        """
+        if memo is None:
+            memo = {}
+        cls = self.__class__
+        result = cls.__new__(cls)
+        memo[id(self)] = result
+        units_copies = {}  # type: Dict[Entity, Entity]
+        for unit in self.unitsTeam:
+            unit_copy = unit.snapshot()
+            unit_copy.game = result
+            units_copies[unit] = unit_copy
+            memo[id(unit)] = unit_copy
+        for key, value in self.__dict__.items():
+            if key not in self._SNAPSHOT_ATTRIBUTES:
+                setattr(result, key, deepcopy(value, memo))
+        result.board = self.board.snapshot()
+        result.journal = Journal()
+        result.board.journal = result.journal
+        result.compactState = None
+        if self.compactState is not None:
+            result.compactState = self.compactState.copy()
+            result.compactState.journal = result.journal
+        result.board.game = result
+        result.addCustomMoveFunc = None
+        result._finished = self._finished
+        result.playerNumbers = list(self.playerNumbers)
+        result.winningTeam = self.winningTeam
+        result.winningPlayers = self.winningPlayers
+        if self.winningPlayers is not None:
+            result.winningPlayers = tuple([units_copies.get(unit, unit) for unit in self.winningPlayers])
+        result.teams = {team_number: [units_copies.get(unit, unit) for unit in team_units]
+                        for team_number, team_units in self.teams.items()}
+        result.unitsTeam = {units_copies[unit]: team_number for unit, team_number in self.unitsTeam.items()}
+        result.units = {number: units_copies.get(unit, unit) for number, unit in self.units.items()}
+        result.avatars = {number: units_copies.get(unit, unit) for number, unit in self.avatars.items()}
+        result.controlledBy = self.controlledBy.copy()
+        result._activeUnits = {number: units_copies.get(unit, unit) for number, unit in self._activeUnits.items()}
+        result.unitsLocation = self._replaceKeys(self.unitsLocation, units_copies)
+        result._previousUnitsLocation = self._replaceKeys(self._previousUnitsLocation, units_copies)
+        result.tilesOccupants = self.tilesOccupants.copy()
+        result._entitiesOwner = self._entitiesOwner.copy()
+        result._aliveActiveUnits = self._aliveActiveUnits.copy()
+        result._teamsAliveUnitsCount = self._teamsAliveUnitsCount.copy()
+        copied_tiles = set()
+        for unit in units_copies:
+            for tile_id in (self.unitsLocation.get(unit), self._previousUnitsLocation.get(unit)):
+                if tile_id in self.tilesOccupants and tile_id not in copied_tiles:
+                    result.tilesOccupants[tile_id] = {units_copies.get(occupant, occupant): None
+                                                      for occupant in self.tilesOccupants[tile_id]}
+                    copied_tiles.add(tile_id)
+        result._ownedTiles = copied_tiles
+        result._ownedEntities = set(units_copies.values())
+        self._ownedTiles = self._ownedTiles.intersection(copied_tiles)
+        self._ownedEntities = set(units_copies.keys())
+        return result
+
+    def getWritableEntity(self, entity: Entity) -> Entity:
+        """
+        Gets a version of the given entity that can be modified without affecting any snapshot of this game.
+        If the entity is shared with a snapshot, it is replaced by a private copy everywhere in this game.
+
+        Args:
+            entity: The entity that will be modified
+
+        Returns: The entity itself, or its private copy if it was shared with a snapshot of this game
+
+        Raises:
+            UnknownUnitException: If the entity is neither placed on this game nor owned by one of its units
+        """
+        if entity in self._ownedEntities:
+            return entity
+        if entity not in self.unitsLocation and entity not in self._previousUnitsLocation \
+                and entity not in self._entitiesOwner:
+            raise UnknownUnitException("The entity to modify does not belong to this game")
+        entity_copy = entity.snapshot()
+        entity_copy.game = self
+        self._replaceEntity(entity, entity_copy)
+        self.journal.record(partial(self._replaceEntity, entity_copy, entity))
+        self._ownedEntities.add(entity_copy)
+        return entity_copy
+
     def belongsToSameTeam(self, unit1: Unit, unit2: Unit) -> bool:
         """
         Checks if the two given units are in the same team
@@ -182,30 +382,26 @@ class Core(metaclass=ABCMeta):
         """
         Checks if there is moe than one team alive.
         If there is, the game is not finished.
+        The number of alive active units of each team is kept up to date when the units are modified, so this check
+        runs in constant time as long as the game is not finished.
 
         Returns: True if the game is finished, False if the game is not finished
         """
         if self._finished:
             return True
-        teams_alive = 0
-        team_units = []
-        winning_team = None
-        for team_number, team_players in self.teams.items():
-            for unit in team_players:
-                if unit.isAlive() and unit.playerNumber in self._activeUnits:
-                    teams_alive += 1
-                    team_units = team_players
-                    winning_team = team_number
-                    break
-        if teams_alive > 1:
+        if self._teamsAlive > 1:
             return False
         else:
+            if self.journal.isRecording():
+                for attribute_name in ("_finished", "winningPlayers", "winningTeam"):
+                    self.journal.recordAttribute(self, attribute_name)
             self._finished = True
-            if teams_alive == 0:
+            if self._teamsAlive == 0:
                 self.winningPlayers = ()
                 self.winningTeam = None
             else:
-                self.winningPlayers = tuple([unit for unit in team_units if unit.playerNumber
+                winning_team = next(iter(self._aliveActiveUnits.values()))
+                self.winningPlayers = tuple([unit for unit in self.teams[winning_team] if unit.playerNumber
                                              in self.avatars])
                 self.winningTeam = winning_team
             return True
@@ -279,10 +475,39 @@ class Core(metaclass=ABCMeta):
 
         Returns: A tuple containing all the occupants of this tile, or None if there is none
         """
+        if self.compactState is not None and self.compactState.isTileEmpty(tile_id):
+            return ()
         if tile_id in self.tilesOccupants:
             return tuple(self.tilesOccupants[tile_id])
         return ()
 
+    def getEntityOwner(self, entity: Entity) -> Optional[Unit]:
+        """
+        Args:
+            entity: An entity placed on this game
+
+        Returns: The unit to which the given entity belongs, or None if it does not belong to any unit
+        """
+        player_number = self._entitiesOwner.get(entity)
+        if player_number is None:
+            return None
+        return self.units.get(player_number)
+
+    def setEntityOwner(self, entity: Entity, owner: Optional[Unit]) -> None:
+        """
+        Registers the unit to which the given entity belongs (called by the units when their entities change)
+
+        Args:
+            entity: The entity of which the owner changes
+            owner: The unit to which the entity now belongs, or None if it does not belong to any unit anymore
+        """
+        if self.journal.isRecording():
+            self.journal.recordItem(self._entitiesOwner, entity)
+        if owner is None:
+            self._entitiesOwner.pop(entity, None)
+        else:
+            self._entitiesOwner[entity] = owner.playerNumber
+
     def addCustomMove(self, unit: Unit, move: Path, event: MoveDescriptor) -> None:
         """
         Uses the "addCustomMoveFunc" that could have been defined by the mainloop to add a move that will be performed
@@ -308,38 +533,216 @@ class Core(metaclass=ABCMeta):
             new_tile_id: The identifier of the tile on which place the given unit
             unit: The unit to place on the given tile.
         """
+        if self.journal.isRecording():
+            self.journal.recordItem(self.unitsLocation, unit)
+            self.journal.recordItem(self._previousUnitsLocation, unit)
+            self._recordTileOccupants(new_tile_id)
+            if unit in self._previousUnitsLocation:
+                self._recordTileOccupants(self._previousUnitsLocation[unit])
         if unit not in self.unitsLocation:
+            if unit in self._previousUnitsLocation:  # The entity was removed from the board, and is placed back
+                self._xorEntityRemoval(unit)
+            else:  # New entity, created for this game
+                self._ownedEntities.add(unit)
+                unit.game = self
+                if self.compactState is not None:
+                    self.compactState.addEntity(unit, self.unitsTeam.get(unit, NO_TEAM))
+                self._xorEntityStatus(unit)
             self.unitsLocation[unit] = new_tile_id
         if unit in self._previousUnitsLocation:
             old_tile_id = self._previousUnitsLocation[unit]
+            self._xorEntityLocation(unit, old_tile_id)
             if unit in self.tilesOccupants[old_tile_id]:
-                self.tilesOccupants[old_tile_id].remove(unit)
+                del self._getWritableTileOccupants(old_tile_id)[unit]
             if len(self.tilesOccupants[old_tile_id]) == 0:
                 del self.tilesOccupants[old_tile_id]
         self._previousUnitsLocation[unit] = new_tile_id
+        self._xorEntityLocation(unit, new_tile_id)
+        if self.compactState is not None:
+            self.compactState.setPosition(unit.stateIndex, new_tile_id)
         if new_tile_id in self.tilesOccupants:
-            self.tilesOccupants[new_tile_id].append(unit)
+            self._getWritableTileOccupants(new_tile_id)[unit] = None
         else:
-            self.tilesOccupants[new_tile_id] = [unit]
+            self._setTileOccupants(new_tile_id, (unit,))
 
     # -------------------- PROTECTED METHODS -------------------- #
 
-    def _handleCollision(self, unit: Unit, entities: List[Entity], tile_id: TileIdentifier) -> None:
+    # Attributes of the game that are handled by "snapshot" instead of being deep copied
+    _SNAPSHOT_ATTRIBUTES = {"board", "addCustomMoveFunc", "_finished", "playerNumbers", "winningTeam",
+                            "winningPlayers", "teams", "unitsTeam", "units", "avatars", "controlledBy", "_activeUnits",
+                            "unitsLocation", "_previousUnitsLocation", "tilesOccupants", "_entitiesOwner",
+                            "_aliveActiveUnits", "_teamsAliveUnitsCount",
+                            "_ownedTiles", "_ownedEntities", "journal", "compactState"}
+
+    def _replaceEntity(self, entity: Entity, replacement: Entity) -> None:
+        """
+        Replaces an entity by another everywhere in this game (location, tile and owner)
+
+        Args:
+            entity: The entity to replace
+            replacement: The entity that takes its place
+        """
+        for locations in (self.unitsLocation, self._previousUnitsLocation):
+            if entity in locations:
+                locations[replacement] = locations.pop(entity)
+        for tile_id in {self.unitsLocation.get(replacement), self._previousUnitsLocation.get(replacement)}:
+            if tile_id in self.tilesOccupants and entity in self.tilesOccupants[tile_id]:
+                self._setTileOccupants(tile_id, [replacement if occupant is entity else occupant
+                                                 for occupant in self.tilesOccupants[tile_id]])
+        if entity in self._entitiesOwner:
+            self._entitiesOwner[replacement] = self._entitiesOwner.pop(entity)
+            owner = self.getEntityOwner(replacement)
+            if owner is not None:
+                owner_entities = owner.getentitys()
+                for i, owner_entity in enumerate(owner_entities):
+                    if owner_entity is entity:
+                        owner_entities[i] = replacement
+
+    def _getEntityHashIdentity(self, entity: Entity) -> Any:
+        """
+        Gets what identifies the given entity in the hash of this game. Two entities with the same identity are
+        interchangeable: swapping them does not change the hash. (override to identify the entities differently)
+
+        Args:
+            entity: An entity placed on this game
+
+        Returns: A hashable value (with a stable representation) that identifies the entity
+        """
+        return type(entity).__name__, entity.playerNumber
+
+    def _xorEntityLocation(self, entity: Entity, tile_id: TileIdentifier) -> None:
+        """
+        Adds (or removes) the location of the given entity in (from) the hash of this game
+
+        Args:
+            entity: An entity placed on this game
+            tile_id: The identifier of the tile on which the entity is placed
+        """
+        self.xorHash("location", self._getEntityHashIdentity(entity), tile_id)
+
+    def _xorEntityStatus(self, entity: Entity) -> None:
+        """
+        Adds (or removes) the status of the given entity (alive or not, last action) in (from) the hash of this game
+
+        Args:
+            entity: An entity placed on this game
+        """
+        self.xorHash("status", self._getEntityHashIdentity(entity), entity.isAlive(),
+                     getattr(entity, "lastAction", None))
+
+    def _xorEntityRemoval(self, entity: Entity) -> None:
+        """
+        Adds (or removes) the fact that the given entity has been removed from the board in (from) the hash of this game
+
+        Args:
+            entity: An entity placed on this game
+        """
+        self.xorHash("removed", self._getEntityHashIdentity(entity))
+
+    def _recordTileOccupants(self, tile_id: TileIdentifier) -> None:
+        """
+        Records the occupants of the given tile in the journal (if it is recording), before they are modified
+
+        Args:
+            tile_id: The identifier of the tile of which the occupants will be modified
+        """
+        if self.journal.isRecording():
+            occupants = self.tilesOccupants.get(tile_id)
+            if occupants is not None:
+                occupants = occupants.copy()
+            self.journal.record(partial(self._restoreTileOccupants, tile_id, occupants))
+
+    def _restoreTileOccupants(self, tile_id: TileIdentifier, occupants: Optional[Dict[Entity, None]]) -> None:
+        """
+        Puts back the occupants recorded for the given tile
+
+        Args:
+            tile_id: The identifier of the tile
+            occupants: The recorded occupants of the tile (None if there was no occupant list for this tile)
+        """
+        if occupants is None:
+            self.tilesOccupants.pop(tile_id, None)
+        else:
+            self.tilesOccupants[tile_id] = occupants
+            self._ownedTiles.add(tile_id)
+
+    def _getWritableTileOccupants(self, tile_id: TileIdentifier) -> Dict[Entity, None]:
+        """
+        Args:
+            tile_id: The identifier of the tile of which the occupants will be modified
+
+        Returns: The ordered set of occupants of the tile, copied beforehand if it was shared with a snapshot of this game
+        """
+        if tile_id not in self._ownedTiles:
+            self.tilesOccupants[tile_id] = self.tilesOccupants[tile_id].copy()
+            self._ownedTiles.add(tile_id)
+        return self.tilesOccupants[tile_id]
+
+    def _updateAliveActiveUnits(self, unit: Unit) -> None:
+        """
+        Updates the alive counts used by "checkIfFinished" if the given unit died or came back to life
+
+        Args:
+            unit: A unit of this game that has been added or modified
+        """
+        alive = unit.isAlive() and unit.playerNumber in self._activeUnits
+        if alive == (unit.playerNumber in self._aliveActiveUnits):
+            return
+        team_number = self.unitsTeam[unit]
+        if self.journal.isRecording():
+            self.journal.recordItem(self._aliveActiveUnits, unit.playerNumber)
+            self.journal.recordItem(self._teamsAliveUnitsCount, team_number)
+            self.journal.recordAttribute(self, "_teamsAlive")
+        count = self._teamsAliveUnitsCount.get(team_number, 0)
+        if alive:
+            self._aliveActiveUnits[unit.playerNumber] = team_number
+            self._teamsAliveUnitsCount[team_number] = count + 1
+            if count == 0:
+                self._teamsAlive += 1
+        else:
+            del self._aliveActiveUnits[unit.playerNumber]
+            self._teamsAliveUnitsCount[team_number] = count - 1
+            if count == 1:
+                self._teamsAlive -= 1
+
+    def _setTileOccupants(self, tile_id: TileIdentifier, occupants: Iterable[Entity]) -> None:
+        """
+        Replaces the occupants of the given tile
+
+        Args:
+            tile_id: The identifier of the tile
+            occupants: The new occupants of the tile, in their order of arrival
+        """
+        self.tilesOccupants[tile_id] = dict.fromkeys(occupants)
+        self._ownedTiles.add(tile_id)
+
+    @staticmethod
+    def _replaceKeys(dictionary: Dict[Any, Any], new_keys: Dict[Any, Any]) -> Dict[Any, Any]:
+        """
+        Args:
+            dictionary: The dictionary of which some keys must be replaced
+            new_keys: Maps the keys to replace with their replacement
+
+        Returns: A shallow copy of the given dictionary in which the keys have been replaced
+        """
+        result = dictionary.copy()
+        for old_key, new_key in new_keys.items():
+            if old_key in result:
+                result[new_key] = result.pop(old_key)
+        return result
+
+    def _handleCollision(self, unit: Unit, entities: Iterable[Entity], tile_id: TileIdentifier) -> None:
         """
         Handles a collision between a unit and other units
 
         Args:
             unit: The moving unit
-            entity: The other units that are on the same tile than the moving unit
+            entities: The other units that are on the same tile than the moving unit
         """
-        for entity in entities:
+        for entity in list(entities):
             if not (unit is entity):
-                if entity not in self.unitsLocation.keys():  # If the other unit is an Entity
-                    other_player = None
-                    for player in self.unitsLocation.keys():  # type: Unit
-                        if player.hasentity(entity):
-                            other_player = player
-                            break
+                if entity not in self.unitsLocation:  # If the other unit is an Entity
+                    other_player = self.getEntityOwner(entity)
                     if other_player is not None:  # If we found the player to which belongs the colliding entity
                         self._collidePlayers(unit, other_player, tile_id, entity=entity)
                 else:
@@ -363,8 +766,13 @@ class Core(metaclass=ABCMeta):
             unit: The unit to remove
         """
         old_tile_id = self.unitsLocation[unit]
+        self.journal.recordItem(self.unitsLocation, unit)
+        self._recordTileOccupants(old_tile_id)
         del self.unitsLocation[unit]
-        self.tilesOccupants[old_tile_id].remove(unit)
+        self._xorEntityRemoval(unit)
+        if self.compactState is not None:
+            self.compactState.setPosition(unit.stateIndex, None)
+        del self._getWritableTileOccupants(old_tile_id)[unit]
         if len(self.tilesOccupants) == 0:
             del self.tilesOccupants[old_tile_id]
 
@@ -404,18 +812,32 @@ class Core(metaclass=ABCMeta):
         same_team = self.belongsToSameTeam(player1, player2)
         suicide = player1 is player2
         if (not same_team or self._teamKillAllowed) or (suicide and self._suicideAllowed):
-            player1.kill()
+            self.getWritableEntity(player1).kill()
             if frontal:
-                player2.kill()
+                self.getWritableEntity(player2).kill()
 
     def __deepcopy__(self, memo={}):
         cls = self.__class__
         result = cls.__new__(cls)
         memo[id(self)] = result
         for k, v in self.__dict__.items():
-            if k != "addCustomMoveFunc":
+            if k == "_ownedTiles":  # All the occupants lists are copied by deepcopy
+                value = set(self.tilesOccupants.keys())
+            elif k == "_ownedEntities":  # All the entities are copied by deepcopy (set below)
+                value = None
+            elif k == "journal":  # The records of this game cannot be undone in its copy
+                value = Journal()
+            elif k == "compactState":
+                value = v.copy() if v is not None else None
+            elif k != "addCustomMoveFunc":
                 value = deepcopy(v, memo)
             else:
                 value = None
             setattr(result, k, value)
+        result.board.journal = result.journal
+        result.board.game = result
+        if result.compactState is not None:
+            result.compactState.journal = result.journal
+        result._ownedEntities = set(result.unitsTeam.keys()).union(result.unitsLocation.keys(),
+                                                                   result._previousUnitsLocation.keys())
         return result
@@ -0,0 +1,209 @@
+"""
+File containing the definition of a headless logical loop, that runs a game without any display and without frame pacing
+"""
+
+import time
+from abc import ABCMeta
+from typing import Dict, Tuple, Union, Set
+
+from multiprocess.connection import wait
+
+try:
+    from multiprocess.connection import PipeConnection
+except ImportError:
+    PipeConnection = object
+
+from .api import API
+from .logicalloop import LogicalLoop, CONTINUE, END, INLINE_EXECUTION, PROCESS_EXECUTION
+from ..characters.moves import Path
+from ..characters.units import Unit
+from ..controls.events import Event, SpecialEvent
+from ..controls.wrappers import ControllerWrapper, BotControllerWrapper
+from ..controls.wrappers.wrapper import WAIT_TIMEOUT
+
+__author__ = 'Anthony Rouneau'
+
+REACTION_TIME = 0.1
+
+
+class HeadlessMainLoop(LogicalLoop, metaclass=ABCMeta):
+    """
+    Defines a logical loop that does not use pygame (see "LogicalLoop"): nothing is drawn, no input is handled and the
+    loop is not paced by a clock. Each iteration of the loop completes one step (i.e. one tile) of the current move of
+    each unit at once, the unit jumping to the next tile, so the speed of the units is not taken into account.
+    Between two iterations, the loop waits for the bots that were informed of new moves to answer, so that the game
+    runs as fast as the bots can decide, as in a tournament or while generating data.
+    """
+
+    def __init__(self, api: API, reaction_time: float=REACTION_TIME):
+        """
+        Instantiates the headless logical loop
+
+        Args:
+            api: The game to run in this loop
+            reaction_time:
+                The maximum time (in seconds) during which the loop waits for the answers of the bots that were informed
+                of new moves before performing the next step. A bot that did not answer in time will see its answer
+                handled later, as a real-time bot that is too slow.
+        """
+        super().__init__(api)
+        self.reactionTime = reaction_time
+        self._awaitedWrappers = set()  # type: Set[ControllerWrapper]
+
+    # -------------------- PUBLIC METHODS -------------------- #
+
+    def run(self, max_fps: int=None) -> Union[None, Tuple[Unit, ...]]:
+        """
+        Launch the game and its logical loop, as fast as possible
+
+        Args:
+            max_fps: Ignored, the loop is not paced
+
+        Returns:
+            a tuple containing all the winning players, or an empty tuple in case of draw
+        """
+        try:
+            if not self._prepared:
+                self._prepareLoop()
+            for player_number in self.api.getPlayerNumbers():
+                self._sendEventsToController(player_number)
+            while self._state != END:
+                self._frames += 1
+                self._state = self._checkGameState()
+                if self._state == CONTINUE:
+                    self._getNextMoveFromControllerWrapperIfAvailable()
+                    self._prepareNextSteps()
+                    self._handlePendingMoves()
+                    if not self.game.isFinished() and not self._waitForControllers():
+                        self._state = END  # No controller can make the game progress anymore
+            self._stopControllers()
+            self._prepared = False
+        finally:
+            self._releaseSharedState()
+        return self.game.winningPlayers
+
+    # -------------------- PROTECTED METHODS -------------------- #
+
+    def _stopProcesses(self) -> None:
+        """
+        Tells the wrappers run in processes that the game is over and waits for their processes to finish their current
+        task, instead of terminating them (which does not work if the processes handle the termination signal, as
+        pygame does)
+        """
+        for wrapper, info_connection in self.wrappersInfoConnection.items():
+            if self._executions[wrapper] == PROCESS_EXECUTION:
+                info_connection.send(SpecialEvent(flag=SpecialEvent.END))
+        self.executor.close()
+        self.executor.join()
+
+    def _getNextMoveFromControllerWrapperIfAvailable(self) -> None:
+        """
+        Gets the moves sent by the controllers that are allowed to move. As the loop waits for the answers of the bots,
+        an answer can arrive before the end of the previous turn: it is then kept in the pipe until it can be handled.
+        """
+        self._runInlineWrappers()
+        for wrapper, pipe_conn in self.wrappersConnection.items():
+            if self._mustRetrieveNextMove(wrapper) and pipe_conn.poll():
+                move = pipe_conn.recv()
+                self._handleEvent(self.wrappers[wrapper], move, wrapper.controller.playerNumber)
+
+    def _prepareNextSteps(self) -> None:
+        """
+        Prepares the next step of the current moves, once the moves sent by the controllers have cancelled them if
+        needed. Like this, a move received after a step is applied from the tile that the step reached, as the
+        bots expect it.
+        """
+        for current_move, _ in self._unitsMoves.values():
+            if current_move is not None:
+                current_move.prepareNextStep()
+        for move in self._otherMoves.values():
+            if move is not None:
+                move.prepareNextStep()
+
+    def _waitForControllers(self) -> bool:
+        """
+        Waits until the bots informed of new moves have answered or until the reaction time is elapsed.
+        If no unit is moving, waits until a controller sends a move, as nothing can happen before that.
+        The bots run inline answer before this method returns.
+
+        Returns: False if no unit is moving and none of the controllers that are allowed to move is still running
+        """
+        self._runInlineWrappers()
+        if not self._hasPendingMoves() and not self._waitForNextMove():
+            return False
+        deadline = time.time() + self.reactionTime
+        while len(self._awaitedWrappers) > 0:
+            remaining_time = deadline - time.time()
+            if remaining_time <= 0:
+                break
+            connections = {self._getPipeConnection(wrapper): wrapper for wrapper in self._awaitedWrappers}
+            for connection in wait(list(connections.keys()), timeout=remaining_time):
+                self._awaitedWrappers.discard(connections[connection])
+        self._awaitedWrappers.clear()
+        return True
+
+    def _waitForNextMove(self) -> bool:
+        """
+        Waits until a controller that is allowed to move sends a move, unless a controller run inline already sent one.
+        Every WAIT_TIMEOUT seconds, stops waiting for the linkers that are not running anymore, as they will never
+        send a move.
+
+        Returns: False if none of the controllers that are allowed to move is still running, True otherwise
+        """
+        connections = {}  # type: Dict[PipeConnection, ControllerWrapper]
+        inline_wrappers = False
+        for wrapper, pipe_conn in self.wrappersConnection.items():
+            if self._mustRetrieveNextMove(wrapper):
+                if self._executions[wrapper] != INLINE_EXECUTION:
+                    connections[pipe_conn] = wrapper
+                elif pipe_conn.poll():
+                    return True
+                else:
+                    inline_wrappers = True
+        if len(connections) == 0:
+            return True
+        while len(wait(list(connections.keys()), timeout=WAIT_TIMEOUT)) == 0:
+            connections = {pipe_conn: wrapper for pipe_conn, wrapper in connections.items()
+                           if self._isControllerWrapperRunning(wrapper)}
+            if len(connections) == 0:
+                return inline_wrappers
+        return True
+
+    def _hasPendingMoves(self) -> bool:
+        """
+        Returns: True if a unit is performing a move or has a move waiting to be performed
+        """
+        for current_move, fifo in self._unitsMoves.values():
+            if current_move is not None or not fifo.empty():
+                return True
+        for move in self._otherMoves.values():
+            if move is not None:
+                return True
+        return False
+
+    def _sendEventsToController(self, player_number: int, event: Event=None) -> None:
+        """
+        Sends the events to the controller of the given player, and waits for its answer if it is an alive bot
+
+        Args:
+            player_number: The number of the player to which send the events
+            event: The event to send, or None to send all the events waiting to be sent to this player
+        """
+        wrapper = self.getWrapperFromPlayerNumber(player_number)
+        if event is not None or len(self._eventsToSend[wrapper]) > 0:
+            if isinstance(wrapper, BotControllerWrapper) and self.wrappers[wrapper].isAlive() \
+                    and self._executions[wrapper] != INLINE_EXECUTION:
+                self._awaitedWrappers.add(wrapper)
+        super()._sendEventsToController(player_number, event)
+
+    def _performNextStepOfMove(self, unit: Unit, current_move: Path) -> int:
+        """
+        Completes the next step of the given move on the given unit, without the intermediate frames
+
+        Args:
+            unit: The unit that performs the move
+            current_move: The current move to perform
+
+        Returns: The state of the move (see the MOVE_* constants of the mainloop module)
+        """
+        return LogicalLoop._performNextStepOfMove(unit, current_move, complete_step=True)
@@ -0,0 +1,648 @@
+"""
+File containing the definition of the logic shared by the loops that run a game, containing the bot controllers
+handling, without any dependency on pygame
+"""
+
+from abc import ABCMeta, abstractmethod
+from queue import Queue, Empty
+from threading import Thread
+from typing import Any, Dict, Optional, List
+from typing import Tuple
+from typing import Union
+
+from multiprocess.connection import Pipe
+
+try:
+    from multiprocess.connection import PipeConnection
+except ImportError:
+    PipeConnection = object
+from pathos.pools import ProcessPool as Pool
+
+from .api import API
+from .core import UnfeasibleMoveException
+from .sharedstate import SharedGameState
+from ..board import TileIdentifier
+from ..characters.moves import IllegalMove, ImpossibleMove, Path, MoveDescriptor
+from ..characters.units import Unit
+from ..characters.utils.units import resize_unit
+from ..controls.events import BotEvent, SpecialEvent, Event, MultipleEvents, WakeEvent, ReadyEvent
+from ..controls.wrappers import ControllerWrapper, BotControllerWrapper, local_pipe
+
+__author__ = 'Anthony Rouneau'
+
+CONTINUE = 0
+PAUSE = 1
+END = 2
+FINISH = 3
+
+# Ways of running a controller wrapper (see "LogicalLoop.addUnit")
+PROCESS_EXECUTION = 0  # In its own process: the wrapper can think while the game runs, but talks through OS pipes
+THREAD_EXECUTION = 1  # In a thread of the game process: no process to launch and no copy of the wrapper
+INLINE_EXECUTION = 2  # By the thread of the game, between its frames: nothing is pickled, for the cheapest bots
+
+MOVE_COMPLETED = 0
+MOVE_JUST_STARTED = 1
+MOVE_COMPLETED_AND_JUST_STARTED = 2
+MOVE_IN_PROGRESS = 3
+MOVE_ILLEGAL = -1
+MOVE_IMPOSSIBLE = -2
+MOVE_FAILED = -3
+
+
+class LogicalLoop(metaclass=ABCMeta):
+    """
+    Defines the logic shared by the loops that run a game: the moves sent by the controllers are performed step by
+    step, and the game updates are sent to the BotControllerWrappers. A subclass decides how the loop is run and paced
+    (see "MainLoop" and "HeadlessMainLoop"). This module does not depend on pygame.
+    """
+
+    def __init__(self, api: API):
+        """
+        Instantiates the logical loop
+
+        Args:
+            api: The game to run in this loop
+        """
+        self.api = api
+        self.game = api.game
+        self.game.addCustomMoveFunc = self._addCustomMove
+        self._currentTurnTaken = False
+        self._state = CONTINUE  # The game must go on at start
+        self._eventsToSend = {}  # type: Dict[ControllerWrapper, List[Event]]
+
+        self.wrappersConnection = {}  # type: Dict[ControllerWrapper, PipeConnection]
+        self.wrappersInfoConnection = {}  # type: Dict[ControllerWrapper, PipeConnection]
+
+        self.wrappers = {}  # type: Dict[ControllerWrapper, Unit]
+        self._unitsMoves = {}  # type: Dict[Unit, Tuple[Path, Queue]]
+        self._moveDescriptors = {}  # type: Dict[Path, MoveDescriptor]
+        self._otherMoves = {}  # type: Dict[Unit, Path]
+        self._killSent = {}  # Used to maintain the fact that the kill event has been sent
+        self.executor = None
+        self._executions = {}  # type: Dict[ControllerWrapper, int]
+        self._threads = {}  # type: Dict[ControllerWrapper, Thread]
+        self._processesTasks = {}  # type: Dict[ControllerWrapper, Any]  # The asynchronous results of the executor
+        self._prepared = False
+        self._frames = 0
+        self.sharedState = None  # type: Optional[SharedGameState]  # See "shareState"
+        self._stateShared = False
+        self._sharedStateCapacity = None  # type: Optional[int]
+
+    # -------------------- PUBLIC METHODS -------------------- #
+
+    @abstractmethod
+    def run(self, max_fps: Optional[int]=None) -> Union[None, Tuple[Unit, ...]]:
+        """
+        Launch the game and its logical loop
+
+        Args:
+            max_fps: The maximum frame per seconds of the game, if the loop is paced
+
+        Returns:
+            a tuple containing all the winning players, or an empty tuple in case of draw,
+            or None if the game was closed by the user
+        """
+        pass
+
+    def addUnit(self, unit: Unit, wrapper: ControllerWrapper, tile_id: TileIdentifier,
+                initial_action: MoveDescriptor = None, team: int = -1, execution: int = PROCESS_EXECUTION) -> None:
+        """
+        Adds a unit to the game, located on the tile corresponding
+        to the the given tile id and controlled by the given controller
+
+        Args:
+            unit: The unit to add to the game
+            wrapper: The linker of that unit
+            tile_id: The identifier of the tile it will be placed on
+            initial_action: The initial action of the unit
+            team: The number of the team this player is in (-1 = no team)
+            execution:
+                The way of running the linker: PROCESS_EXECUTION, THREAD_EXECUTION or INLINE_EXECUTION.
+                A linker run inline blocks the game while its controller selects a move, so it must be fast.
+        """
+        is_controlled = wrapper is not None
+        self.game.addUnit(unit, team, tile_id, is_avatar=is_controlled)
+        if is_controlled:
+            self._addControllerWrapper(wrapper, unit, execution)
+            if self._mustSendInitialWakeEvent(initial_action, unit):
+                self._eventsToSend[wrapper].append(WakeEvent())
+        self._unitsMoves[unit] = (None, Queue())
+        tile = self.game.board.getTileById(tile_id)
+        resize_unit(unit, self.game.board)
+        unit.moveTo(tile.center)
+        if initial_action is not None:
+            unit.setLastAction(initial_action)
+            self._handleEvent(unit, initial_action, wrapper.controller.playerNumber, force=True)
+
+    def getWrapperFromPlayerNumber(self, player_number: int):
+        """
+        Retrieves the wrapper from the given player number
+
+        Args:
+            player_number: The number representing the player for which we want the wrapper 
+
+        Returns: The wrapper that wraps the controller of the given player
+        """
+        found = None
+        for wrapper in self.wrappersConnection:
+            if wrapper.controller.playerNumber == player_number:
+                found = wrapper
+                break
+        return found
+
+    def pause(self) -> None:
+        """
+        Change the state of the game to "PAUSE"
+        """
+        self._state = PAUSE
+        print(self._frames, "frames")
+
+    def resume(self) -> None:
+        """
+        Resume the game
+        """
+        self._state = CONTINUE
+
+    def shareState(self, capacity: Optional[int]=None) -> None:
+        """
+        Makes this loop publish the compact state of the game (see "Core.useCompactState") in a block of shared memory
+        after each update of the game. The bots receive the block in their "sharedState" attribute. The bots that only
+        read it (see "Bot.mustReplayEvents") react to snapshots of it instead of a local copy of the game.
+
+        Args:
+            capacity: The maximum number of entities in the shared state (see "SharedGameState.fromCompactState")
+        """
+        self._stateShared = True
+        self._sharedStateCapacity = capacity
+
+    # -------------------- PROTECTED METHODS -------------------- #
+
+    def _addMove(self, unit: Unit, move: Path) -> None:
+        """
+        Adds a move (cancelling the pending moves)
+
+        Args:
+            unit: The unit for which add a move
+            move: The move to add for the given controller
+        """
+        if self._unitsMoves[unit][0] is not None:
+            self._cancelCurrentMoves(unit)
+        fifo = self._unitsMoves[unit][1]  # type: Queue
+        fifo.put(move)
+
+    def _addCustomMove(self, unit: Unit, move: Path, event: MoveDescriptor) -> None:
+        """
+        Adds a move that is NOT PERFORMED BY A CONTROLLER
+
+        Args:
+            unit: The unit that will be moved
+            move: The move that will be performed
+        """
+        if unit not in self._otherMoves or self._otherMoves[unit] is None:
+            self._otherMoves[unit] = move
+        self._moveDescriptors[move] = event
+
+    def _cancelCurrentMoves(self, unit: Unit) -> None:
+        """
+        Cancel the current movement if there is one and remove all the other pending movements.
+
+        Args:
+            unit: The unit for which cancel the movements
+        """
+        if unit in self._unitsMoves:
+            move_tuple = self._unitsMoves[unit]
+            fifo = move_tuple[1]  # type: Queue
+            last_move = move_tuple[0]  # type: Path
+            new_fifo = Queue()
+            if last_move is not None:
+                last_move.stop()
+            while True:
+                try:
+                    move = fifo.get_nowait()
+                    del self._moveDescriptors[move]
+                except Empty:
+                    break
+            self._unitsMoves[unit] = (last_move, new_fifo)
+
+    def _getNextMoveFromControllerWrapperIfAvailable(self) -> None:
+        """
+        Gets event from the controllers and dispatch them to the right method
+        """
+        self._runInlineWrappers()
+        for current_wrapper in self.wrappersConnection:  # type: ControllerWrapper
+            pipe_conn = self._getPipeConnection(current_wrapper)
+            if pipe_conn.poll():
+                move = pipe_conn.recv()
+                if self._mustRetrieveNextMove(current_wrapper):
+                    self._handleEvent(self.wrappers[current_wrapper], move, current_wrapper.controller.playerNumber)
+
+    def _handlePendingMoves(self) -> None:
+        """
+        Get the next move to be performed and perform its next step
+        """
+        moved_units = []
+
+        completed_moves = {}  # type: Dict[Unit, Tuple[TileIdentifier, MoveDescriptor]]
+        just_started = {}  # type: Dict[int, MoveDescriptor]
+        illegal_moves = []  # type: List[Unit]
+        impossible_moves = {}  # type: List[Unit]
+
+        self._handleOtherMoves(completed_moves, illegal_moves, impossible_moves, just_started, moved_units)
+        self._handleMoves(completed_moves, illegal_moves, impossible_moves, just_started, moved_units)
+        self._updateFromMoves(completed_moves, illegal_moves, impossible_moves, just_started)
+
+    def _updateFromMoves(self, completed_moves, illegal_moves, impossible_moves, just_started):
+        players_to_be_sent_messages = []
+        for unit, (tile_id, move_descriptor) in completed_moves.items():
+            self.game.updateGameState(unit, tile_id, move_descriptor)
+        if len(completed_moves) > 0:
+            self._publishState()  # Before the bots are informed of the new moves
+        for player_number, move_descriptor in just_started.items():
+            controller_unit = self.game.getControllerUnitForNumber(player_number)
+            if controller_unit is not None:
+                controller_unit.setCurrentAction(move_descriptor)
+            self._addMessageToSendToAll(player_number, move_descriptor)
+            players_to_be_sent_messages = self._getPlayerNumbersToWhichSendEvents()
+        for player_number in players_to_be_sent_messages:
+            self._sendEventsToController(player_number)
+        for unit in illegal_moves:
+            self.game.unitsLocation[unit] = self.game.board.OUT_OF_BOARD_TILE.identifier
+            self._killUnit(unit, self.getWrapperFromPlayerNumber(unit.playerNumber))
+            # self.game.checkIfFinished()
+            self._cancelCurrentMoves(unit)
+        for unit in impossible_moves:
+            self._cancelCurrentMoves(unit)
+        if len(illegal_moves) > 0:
+            self._publishState()
+        self.game.checkIfFinished()
+
+    def _handleMoves(self, completed_moves, illegal_moves, impossible_moves, just_started, moved_units):
+        for wrapper in self.wrappers:  # type: ControllerWrapper
+            unit = self._getUnitFromControllerWrapper(wrapper)
+            if unit not in moved_units:  # Two moves on the same unit cannot be performed at the same time...
+                if not unit.isAlive() and (unit not in self._killSent or not self._killSent[unit]):
+                    self.wrappersInfoConnection[wrapper].send(SpecialEvent(flag=SpecialEvent.UNIT_KILLED))
+                    self._killSent[unit] = True
+                current_move = self._getNextMoveForUnitIfAvailable(unit)
+                if current_move is not None:
+                    move_state = self._performNextStepOfMove(current_move.unit, current_move)
+                    self._fillMoveStructures(completed_moves, just_started, illegal_moves, impossible_moves,
+                                             current_move, move_state)
+
+    def _handleOtherMoves(self, completed_moves, illegal_moves, impossible_moves, just_started, moved_units):
+        for unit in self._otherMoves:  # type: Unit
+            move = self._otherMoves[unit]
+            if move is not None:
+                move_state = self._performNextStepOfMove(move.unit, move)
+                if move_state != MOVE_FAILED:
+                    moved_units.append(move.unit)
+                if move.finished():
+                    self._otherMoves[unit] = None
+                self._fillMoveStructures(completed_moves, just_started, illegal_moves, impossible_moves, move,
+                                         move_state)
+
+    def _fillMoveStructures(self, completed_moves: Dict[Unit, Tuple[TileIdentifier, MoveDescriptor]],
+                            just_started: Dict[int, MoveDescriptor], illegal_moves: List[Unit],
+                            impossible_moves: List[Unit], move: Path, move_state: int):
+        """
+        Takes a move's state and the data structures of the performed moves in this iteration an fill them
+         following the state's value
+         
+        Args:
+            completed_moves: The dict containing the units that completed a move along with their new tile_id 
+            just_started: 
+                The dict containing the number of the units that started a move, 
+                along with the descriptor of the started move
+            illegal_moves: The list containing all the units that performed an illegal move this iteration  
+            impossible_moves: The list containing all the units that performed an impossible move this iteration  
+            move: The performed move
+            move_state: The state of the performed move
+        """
+        if move_state == MOVE_COMPLETED_AND_JUST_STARTED:
+            completed_moves[move.unit] = (move.reachedTileIdentifier,  self._moveDescriptors[move])
+            just_started[move.unit.playerNumber] = self._moveDescriptors[move]
+        elif move_state == MOVE_COMPLETED:
+            completed_moves[move.unit] = (move.reachedTileIdentifier,  self._moveDescriptors[move])
+        elif move_state == MOVE_JUST_STARTED:
+            just_started[move.unit.playerNumber] = self._moveDescriptors[move]
+        elif move_state == MOVE_ILLEGAL:
+            illegal_moves.append(move.unit)
+        elif move_state == MOVE_IMPOSSIBLE:
+            impossible_moves.append(move.unit)
+
+    def _addMessageToSendToAll(self, moved_unit_number: int, move_descriptor: MoveDescriptor):
+        """
+        Adds a message to the message queue of each ControllerWrapper
+        
+        Args:
+            moved_unit_number: The number representing the unit that moved 
+            move_descriptor: The descriptor of the performed move
+        """
+        controlled_unit = self.game.getControllerUnitForNumber(moved_unit_number)
+        if controlled_unit is None:
+            controlled_unit_number = moved_unit_number
+        else:
+            controlled_unit_number = controlled_unit.playerNumber
+        for wrapper in self._eventsToSend:
+            self._eventsToSend[wrapper].append(BotEvent(controlled_unit_number, move_descriptor))
+
+    @staticmethod
+    def _performNextStepOfMove(unit: Unit, current_move: Path, complete_step: bool=False) -> int:
+        """
+        Perform the next step of the given move on the given unit
+
+        Args:
+            unit: The unit that performs the move
+            current_move: The current move to perform
+            complete_step: If True, the step is completed at once, instead of being performed frame by frame
+        
+        Returns:
+            A couple of booleans. The first indicating that the move has been completed and the second indicating that
+            the move has just started
+        """
+        if unit.isAlive():
+            if current_move is not None:
+                try:
+                    just_started, move_completed, tile_id = current_move.performNextMove(complete_step)
+                    if just_started and move_completed:
+                        return MOVE_COMPLETED_AND_JUST_STARTED
+                    elif move_completed:  # A new tile has been reached by the movement
+                        return MOVE_COMPLETED
+                    elif just_started:
+                        return MOVE_JUST_STARTED
+                    return MOVE_IN_PROGRESS
+                except IllegalMove:
+                    return MOVE_ILLEGAL
+                except ImpossibleMove:
+                    return MOVE_IMPOSSIBLE
+        else:
+            if current_move is not None:
+                current_move.stop(cancel_post_action=True)
+        return MOVE_FAILED
+
+    def _getNextMoveForUnitIfAvailable(self, unit: Unit) -> Union[Path, None]:
+        """
+        Checks if a move is available for the given controller, and if so, returns it
+
+        Args:
+            unit: The given
+
+        Returns: The next move if it is available, and None otherwise
+        """
+        moves = self._unitsMoves[unit]
+        current_move = moves[0]  # type: Path
+        if current_move is None or current_move.finished():
+            if current_move is not None:
+                if isinstance(current_move, Path):
+                    self._reactToFinishedMove()
+                    del self._moveDescriptors[current_move]
+            try:
+                move = moves[1].get_nowait()  # type: Path
+                self._unitsMoves[unit] = (move, moves[1])
+                current_move = move
+            except Empty:
+                self._unitsMoves[unit] = (None, moves[1])
+                current_move = None
+        return current_move
+
+    def _checkGameState(self) -> int:
+        """
+        Checks if the game is finished
+
+        Returns: 0 = CONTINUE; 2 = END
+        """
+        if self.game.isFinished():
+            self.winningPlayers = self.game.winningPlayers
+            return END
+        return CONTINUE
+
+    def _handleEvent(self, unit: Unit, event: MoveDescriptor, player_number: int, force: bool=False) -> None:
+        """
+        The goal of this method is to handle the given event for the given unit
+
+        Args:
+            unit: The unit that sent the event through its linker
+            event: The event sent by the controller
+        """
+        try:
+            move = self.api.createMoveForDescriptor(unit, event, force=force)  # may raise: UnfeasibleMoveException
+            self._currentTurnTaken = True
+            self._moveDescriptors[move] = event
+            self._addMove(unit, move)
+        except UnfeasibleMoveException:
+            self._sendEventsToController(player_number, event=WakeEvent())
+
+    def _getPipeConnection(self, linker: ControllerWrapper) -> PipeConnection:
+        """
+        Args:
+            linker: The linker for which we want the pipe connection
+
+        Returns: The pipe connection to send and receive game updates
+        """
+        return self.wrappersConnection[linker]
+
+    def _getUnitFromControllerWrapper(self, linker: ControllerWrapper) -> Unit:
+        """
+        Args:
+            linker: The linker for which we want the unit
+
+        Returns: The unit for the given linker
+        """
+        return self.wrappers[linker]
+
+    def _sendEventsToController(self, player_number: int, event: Event=None):
+
+        player_wrapper = self.getWrapperFromPlayerNumber(player_number)
+        pipe_conn = self._getPipeConnection(player_wrapper)
+        if event is None:
+            events = self._eventsToSend[player_wrapper]
+            if len(events) > 0:
+                event = MultipleEvents(events)
+        if event is not None:
+            pipe_conn.send(event)
+            self._eventsToSend[player_wrapper] = []
+
+    def _informBotOnPerformedMove(self, moved_unit_number: int, move_descriptor: MoveDescriptor) -> None:
+        """
+        Update the game state of the bot controllers
+
+        Args:
+            moved_unit_number: The number representing the unit that moved and caused the update
+            move_descriptor: The move that caused the update
+        """
+        for wrapper in self.wrappers:
+            if issubclass(type(wrapper), BotControllerWrapper):
+                pipe_conn = self._getPipeConnection(wrapper)
+                pipe_conn.send(BotEvent(moved_unit_number, move_descriptor))
+
+    def _killUnit(self, unit: Unit, linker: ControllerWrapper) -> None:
+        """
+        Kills the given unit and tells its linker
+
+        Args:
+            unit: The unit to kill
+            linker: The linker, to which tell that the unit is dead
+        """
+        unit.kill()
+        if not unit.isAlive():
+            self.wrappersInfoConnection[linker].send(SpecialEvent(flag=SpecialEvent.UNIT_KILLED))
+
+    def _addCollaborationPipes(self, linker: BotControllerWrapper) -> None:
+        """
+        Adds the collaboration pipes between the given linker and its teammate's
+
+        Args:
+            linker: The linker to connect with its teammate
+        """
+        for teammate in self.game.teams[self.game.unitsTeam[self.wrappers[linker]]]:
+            if teammate is not self.wrappers[linker]:
+                teammate_linker = None  # type: BotControllerWrapper
+                for other_linker in self.wrappers:
+                    if self.wrappers[other_linker] is teammate:
+                        teammate_linker = other_linker
+                        break
+                pipe1, pipe2 = Pipe()
+                linker.addCollaborationPipe(teammate_linker.controller.playerNumber, pipe1)
+                teammate_linker.addCollaborationPipe(linker.controller.playerNumber, pipe2)
+
+    def _prepareLoop(self) -> None:
+        """
+        Launches the processes and the threads of the AIs
+        """
+        processes_count = list(self._executions.values()).count(PROCESS_EXECUTION)
+        self.executor = None
+        if processes_count > 0:
+            self.executor = Pool(processes_count)
+            try:
+                self.executor.apipe(lambda: None)
+            except ValueError:
+                self.executor.restart()
+        if self._stateShared:
+            self.sharedState = SharedGameState.fromCompactState(self.game.useCompactState(),
+                                                                self._sharedStateCapacity)
+        for wrapper in self.wrappers:
+            if isinstance(wrapper, BotControllerWrapper):
+                wrapper.controller.sharedState = self.sharedState
+                if not wrapper.controller.readsSharedState:
+                    wrapper.controller.gameState = self.game.copy()
+            self._startControllerWrapper(wrapper)
+        for wrapper in self.wrappers:
+            pipe = self._getPipeConnection(wrapper)
+            event = pipe.recv()  # Waiting for the processes to launch correctly
+            assert(isinstance(event, ReadyEvent))
+        self._prepared = True
+
+    def _startControllerWrapper(self, wrapper: ControllerWrapper) -> None:
+        """
+        Launches the given linker, in the way chosen when it was added to the loop
+
+        Args:
+            wrapper: The linker to launch
+        """
+        execution = self._executions[wrapper]
+        if execution == PROCESS_EXECUTION:
+            self._processesTasks[wrapper] = self.executor.apipe(wrapper.run)
+        elif execution == THREAD_EXECUTION:
+            thread = Thread(target=wrapper.run, daemon=True)
+            thread.start()
+            self._threads[wrapper] = thread
+        else:
+            wrapper.start()
+
+    def _isControllerWrapperRunning(self, wrapper: ControllerWrapper) -> bool:
+        """
+        Args:
+            wrapper: A linker launched by this loop
+
+        Returns:
+            True if the run loop of the given linker has not ended (e.g. because its controller raised an exception).
+            A linker run inline is always running, as this loop runs it.
+        """
+        if wrapper in self._threads:
+            return self._threads[wrapper].is_alive()
+        elif wrapper in self._processesTasks:
+            return not self._processesTasks[wrapper].ready()
+        return True
+
+    def _runInlineWrappers(self) -> None:
+        """
+        Lets the linkers run inline handle the events they received and send the moves of their controller
+        """
+        for wrapper, execution in self._executions.items():
+            if execution == INLINE_EXECUTION:
+                wrapper.runOnce()
+
+    def _stopControllers(self) -> None:
+        """
+        Stops the linkers: the processes are terminated and the other linkers are told that the game is over
+        """
+        for wrapper, info_connection in self.wrappersInfoConnection.items():
+            if self._executions[wrapper] != PROCESS_EXECUTION:
+                info_connection.send(SpecialEvent(flag=SpecialEvent.END))
+                wrapper.stop()
+        self._runInlineWrappers()
+        if self.executor is not None:
+            self._stopProcesses()
+        for thread in self._threads.values():
+            thread.join()
+        self._threads = {}
+        self._processesTasks = {}
+
+    def _stopProcesses(self) -> None:
+        """
+        Stops the processes in which the linkers run
+        """
+        self.executor.terminate()
+
+    def _publishState(self) -> None:
+        """
+        Copies the compact state of the game in the shared memory, if the state is shared
+        """
+        if self.sharedState is not None:
+            self.sharedState.publish(self.game.compactState)
+
+    def _releaseSharedState(self) -> None:
+        """
+        Destroys the block of shared memory, if the state is shared
+        """
+        if self.sharedState is not None:
+            self.sharedState.close()
+            self.sharedState = None
+
+    def _addControllerWrapper(self, wrapper: ControllerWrapper, unit: Unit, execution: int=PROCESS_EXECUTION) -> None:
+        """
+        Adds the linker to the loop, creating the pipe connections
+
+        Args:
+            wrapper: The linker to add
+            unit: The unit, linked by this linker
+            execution: The way of running the linker (see "addUnit")
+        """
+        self.wrappers[wrapper] = unit
+        self._executions[wrapper] = execution
+        pipe = local_pipe if execution == INLINE_EXECUTION else Pipe
+        parent_conn, child_conn = pipe()
+        parent_info_conn, child_info_conn = pipe()
+        self.wrappersConnection[wrapper] = parent_conn
+        self.wrappersInfoConnection[wrapper] = parent_info_conn
+        self._eventsToSend[wrapper] = []
+        wrapper.setMainPipe(child_conn)
+        wrapper.setGameInfoPipe(child_info_conn)
+        if isinstance(wrapper, BotControllerWrapper):
+            self._addCollaborationPipes(wrapper)
+
+    @abstractmethod
+    def _mustSendInitialWakeEvent(self, initial_action: MoveDescriptor, unit: Unit) -> bool:
+        pass
+
+    @abstractmethod
+    def _mustRetrieveNextMove(self, current_wrapper: ControllerWrapper) -> bool:
+        pass
+
+    @abstractmethod
+    def _getPlayerNumbersToWhichSendEvents(self) -> List[int]:
+        pass
+
+    @abstractmethod
+    def _reactToFinishedMove(self):
+        pass
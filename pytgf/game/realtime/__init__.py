@@ -1,3 +1,4 @@
 # noinspection PyUnresolvedReferences,PyPep8Naming
+from .rt_logicalloop import RealTimeLogicalLoop, HeadlessRealTimeMainLoop
 from .rt_mainloop import RealTimeMainLoop
 from ..api import API
@@ -0,0 +1,26 @@
+from typing import List
+
+from ..headless import HeadlessMainLoop
+from ..logicalloop import LogicalLoop
+from ...characters.moves import MoveDescriptor
+from ...characters.units import Unit
+from ...controls.wrappers import ControllerWrapper
+
+
+class RealTimeLogicalLoop(LogicalLoop):
+    def _reactToFinishedMove(self):
+        pass
+
+    def _getPlayerNumbersToWhichSendEvents(self) -> List[int]:
+        return self.api.getPlayerNumbers()
+
+    def _mustRetrieveNextMove(self, current_wrapper: ControllerWrapper) -> bool:
+        # TODO -- LAP !
+        return True
+
+    def _mustSendInitialWakeEvent(self, initial_action: MoveDescriptor, unit: Unit) -> bool:
+        return initial_action is None
+
+
+class HeadlessRealTimeMainLoop(HeadlessMainLoop, RealTimeLogicalLoop):
+    pass
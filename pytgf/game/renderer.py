@@ -0,0 +1,90 @@
+"""
+File containing the definition of a DirtyRectsRenderer, that draws a game on the screen by redrawing only what changed
+"""
+
+from typing import Dict, List, Tuple
+
+import pygame
+
+from ..board.graphics import BoardGraphics
+
+__author__ = 'Anthony Rouneau'
+
+
+class DirtyRectsRenderer:
+    """
+    Draws the board and the sprites of the units on the screen. After the first frame, only the "dirty" rectangles of
+    the screen are redrawn: the tiles whose color changed, and the places left or reached by the sprites that moved,
+    appeared, disappeared or changed of image. The board is copied from the surface kept by its graphics, and only the
+    sprites that overlap a dirty rectangle are drawn again.
+    """
+
+    def __init__(self, board_graphics: BoardGraphics):
+        """
+        Args:
+            board_graphics: The graphics of the board on which the game is played
+        """
+        self.boardGraphics = board_graphics
+        self._drawnSprites = {}  # type: Dict[pygame.sprite.Sprite, Tuple[pygame.Rect, pygame.Surface]]
+        self._fullRedrawNeeded = True
+
+    # -------------------- PUBLIC METHODS -------------------- #
+
+    def invalidate(self) -> None:
+        """
+        Makes the next call to "render" redraw the whole screen (e.g. if something else was drawn on it)
+        """
+        self._fullRedrawNeeded = True
+
+    def render(self, screen: pygame.Surface, sprites: List[pygame.sprite.Sprite]) -> List[pygame.Rect]:
+        """
+        Redraws the parts of the screen that changed since the last call
+
+        Args:
+            screen: The surface on which the game is drawn
+            sprites: The sprites to draw on the board, in the order in which they must be drawn
+
+        Returns: The rectangles of the screen that were redrawn, and that must be updated on the display
+        """
+        sprites_to_draw = {}  # type: Dict[pygame.sprite.Sprite, Tuple[pygame.Rect, pygame.Surface]]
+        for sprite in sprites:
+            sprites_to_draw[sprite] = (sprite.rect.copy(), sprite.image)
+        dirty_rects = self.boardGraphics.refreshSurface()
+        if self._fullRedrawNeeded:
+            dirty_rects.append(screen.get_rect())
+            self._fullRedrawNeeded = False
+        for sprite, (rect, image) in self._drawnSprites.items():
+            drawn = sprites_to_draw.get(sprite)
+            if drawn is None:
+                dirty_rects.append(rect)
+            elif drawn[0] != rect or drawn[1] is not image:
+                dirty_rects.append(rect)
+                dirty_rects.append(drawn[0])
+        for sprite, (rect, _) in sprites_to_draw.items():
+            if sprite not in self._drawnSprites:
+                dirty_rects.append(rect)
+        self._redraw(screen, dirty_rects, list(sprites_to_draw.values()))
+        self._drawnSprites = sprites_to_draw
+        return dirty_rects
+
+    # -------------------- PROTECTED METHODS -------------------- #
+
+    def _redraw(self, screen: pygame.Surface, dirty_rects: List[pygame.Rect],
+                sprites: List[Tuple[pygame.Rect, pygame.Surface]]) -> None:
+        """
+        Redraws the board and the sprites inside each of the given rectangles
+
+        Args:
+            screen: The surface on which the game is drawn
+            dirty_rects: The rectangles of the screen to redraw
+            sprites: The position and the image of each sprite to draw, in the order in which they must be drawn
+        """
+        board_surface = self.boardGraphics.surface
+        sprites_rects = [rect for rect, _ in sprites]
+        for dirty_rect in dirty_rects:
+            screen.set_clip(dirty_rect)  # The sprites that overlap the rectangle must not be redrawn outside of it
+            screen.blit(board_surface, dirty_rect, dirty_rect)
+            for sprite_index in dirty_rect.collidelistall(sprites_rects):
+                rect, image = sprites[sprite_index]
+                screen.blit(image, rect)
+        screen.set_clip(None)
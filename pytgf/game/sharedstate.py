@@ -0,0 +1,244 @@
+"""
+File containing the definition of a SharedGameState, that shares the arrays of a CompactGameState between processes
+"""
+
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from multiprocess import resource_tracker
+from multiprocess.shared_memory import SharedMemory
+
+from .compactstate import CompactGameState
+
+__author__ = 'Anthony Rouneau'
+
+ALIGNMENT = 8  # Each array of the shared block starts on a multiple of 8 bytes
+MIN_RETRY_DELAY = 1e-5  # First pause (in seconds) of a reader before retrying a snapshot that was being written
+MAX_RETRY_DELAY = 1e-3  # The pause of a reader doubles after each failed snapshot, up to this delay (in seconds)
+
+
+class SharedStateCapacityException(Exception):
+    """
+    Exception raised when a published state contains more entities than the shared block can store
+    """
+    pass
+
+
+class SharedGameState:
+    """
+    Block of shared memory containing the arrays of a CompactGameState, written by the main loop of a game and read
+    without any copy by the processes of the bots. Once pickled and unpickled in another process, a SharedGameState is
+    attached to the same block, in read-only mode.
+
+    The block contains a header made of a version number, that is odd while the state is being written, and of the
+    number of entities in the state, followed by the "tiles", "occupancy", "positions", "alive" and "teams" arrays
+    (see CompactGameState). The last actions of the entities, that are Python objects, are not shared.
+    """
+
+    def __init__(self, lines: int, columns: int, capacity: int, name: Optional[str]=None):
+        """
+        Creates a new block of shared memory, or attaches to an existing one
+
+        Args:
+            lines: The number of lines in the board
+            columns: The number of columns in the board
+            capacity: The maximum number of entities that can be stored in the block
+            name: The name of the existing block to attach to, in read-only mode (None to create a new block)
+        """
+        self.lines = lines
+        self.columns = columns
+        self.capacity = capacity
+        self._isOwner = name is None
+        layout, size = self._getLayout(lines, columns, capacity)
+        self._memory = SharedMemory(name=name, create=self._isOwner, size=size)
+        self._arrays = {}  # type: Dict[str, np.ndarray]
+        try:
+            for array_name, (dtype, shape, offset) in layout.items():
+                array = np.ndarray(shape, dtype=dtype, buffer=self._memory.buf, offset=offset)
+                array.flags.writeable = self._isOwner
+                self._arrays[array_name] = array
+        except Exception:
+            self.close()
+            raise
+        self._header = self._arrays["header"]
+        if self._isOwner:
+            self._header[:] = 0
+
+    # -------------------- PUBLIC METHODS -------------------- #
+
+    @classmethod
+    def fromCompactState(cls, compact_state: CompactGameState, capacity: Optional[int]=None) -> 'SharedGameState':
+        """
+        Creates a block of shared memory in which the given state is published
+
+        Args:
+            compact_state: The compact state of the game
+            capacity:
+                The maximum number of entities that can be stored in the block
+                (default: 4 entities per tile of the board, or the number of entities in the state if it is higher)
+
+        Returns: The shared state, containing a copy of the given state
+        """
+        lines, columns = compact_state.tiles.shape
+        if capacity is None:
+            capacity = max(4 * lines * columns, compact_state.entitiesCount)
+        shared_state = cls(lines, columns, capacity)
+        shared_state.publish(compact_state)
+        return shared_state
+
+    @property
+    def name(self) -> str:
+        """
+        Returns: The name of the block of shared memory
+        """
+        return self._memory.name
+
+    @property
+    def version(self) -> int:
+        """
+        Returns: The number of times a state has been published in this block
+        """
+        return int(self._header[0]) // 2
+
+    @property
+    def entitiesCount(self) -> int:
+        """
+        Returns: The number of entities in the last published state
+        """
+        return int(self._header[1])
+
+    @property
+    def tiles(self) -> np.ndarray:
+        """
+        Returns: The view on the shared byte codes of the tiles (may be modified while it is read, see "snapshot")
+        """
+        return self._arrays["tiles"]
+
+    @property
+    def occupancy(self) -> np.ndarray:
+        """
+        Returns: The view on the shared number of entities on each tile (may be modified while it is read)
+        """
+        return self._arrays["occupancy"]
+
+    @property
+    def positions(self) -> np.ndarray:
+        """
+        Returns: The view on the shared positions of all the entities (may be modified while it is read)
+        """
+        return self._arrays["positions"][:self.entitiesCount]
+
+    @property
+    def alive(self) -> np.ndarray:
+        """
+        Returns: The view on the shared alive status of all the entities (may be modified while it is read)
+        """
+        return self._arrays["alive"][:self.entitiesCount]
+
+    @property
+    def teams(self) -> np.ndarray:
+        """
+        Returns: The view on the shared teams of all the entities (may be modified while it is read)
+        """
+        return self._arrays["teams"][:self.entitiesCount]
+
+    def publish(self, compact_state: CompactGameState) -> None:
+        """
+        Copies the given state into the block of shared memory (only in the process that created the block)
+
+        Args:
+            compact_state: The compact state of the game
+
+        Raises:
+            SharedStateCapacityException: If the state contains more entities than the capacity of the block
+        """
+        count = compact_state.entitiesCount
+        if count > self.capacity:
+            raise SharedStateCapacityException("The state contains %d entities, but the shared block can only store %d"
+                                               % (count, self.capacity))
+        self._header[0] += 1  # Odd version: the readers know that the state is being written
+        self._arrays["tiles"][:] = compact_state.tiles
+        self._arrays["occupancy"][:] = compact_state.occupancy
+        self._arrays["positions"][:count] = compact_state.positions[:count]
+        self._arrays["alive"][:count] = compact_state.alive[:count]
+        self._arrays["teams"][:count] = compact_state.teams[:count]
+        self._header[1] = count
+        self._header[0] += 1
+
+    def snapshot(self) -> CompactGameState:
+        """
+        Returns:
+            A consistent local copy of the last published state, of which the last actions are unknown (None).
+            The copy is retried if a new state is published while it is made, after a pause that grows with the
+            number of failed attempts, so that a reader does not monopolize the CPU while the state is written.
+        """
+        delay = MIN_RETRY_DELAY
+        while True:
+            version = int(self._header[0])
+            if version % 2 == 0:
+                count = int(self._header[1])
+                state = CompactGameState(self.lines, self.columns, capacity=max(count, 1))
+                state.tiles[:] = self._arrays["tiles"]
+                state.occupancy[:] = self._arrays["occupancy"]
+                state.positions[:count] = self._arrays["positions"][:count]
+                state.alive[:count] = self._arrays["alive"][:count]
+                state.teams[:count] = self._arrays["teams"][:count]
+                state.entitiesCount = count
+                if int(self._header[0]) == version:
+                    return state
+            time.sleep(delay)
+            delay = min(2 * delay, MAX_RETRY_DELAY)
+
+    def close(self) -> None:
+        """
+        Detaches this process from the block of shared memory, and destroys the block if this process created it
+        """
+        self._arrays = {}
+        self._header = None
+        try:
+            self._memory.close()
+        finally:
+            if self._isOwner:
+                self._memory.unlink()
+
+    # -------------------- PROTECTED METHODS -------------------- #
+
+    @staticmethod
+    def _getLayout(lines: int, columns: int,
+                   capacity: int) -> Tuple[Dict[str, Tuple[type, Tuple[int, ...], int]], int]:
+        """
+        Args:
+            lines: The number of lines in the board
+            columns: The number of columns in the board
+            capacity: The maximum number of entities that can be stored in the block
+
+        Returns: The type, the shape and the offset of each array in the block, and the size of the block
+        """
+        arrays = (("header", np.int64, (2,)), ("tiles", np.int8, (lines, columns)),
+                  ("occupancy", np.int16, (lines, columns)), ("positions", np.int32, (capacity, 2)),
+                  ("alive", np.bool_, (capacity,)), ("teams", np.int32, (capacity,)))
+        layout = {}
+        offset = 0
+        for array_name, dtype, shape in arrays:
+            layout[array_name] = (dtype, shape, offset)
+            size = np.dtype(dtype).itemsize * int(np.prod(shape))
+            offset += -(-size // ALIGNMENT) * ALIGNMENT
+        return layout, offset
+
+    @staticmethod
+    def _getTrackerPid() -> Optional[int]:
+        """
+        Returns: The PID of the process that destroys the blocks of shared memory left by this process when it ends
+        """
+        return getattr(resource_tracker._resource_tracker, "_pid", None)
+
+    def __getstate__(self):
+        return self.lines, self.columns, self.capacity, self.name, self._getTrackerPid()
+
+    def __setstate__(self, state):
+        lines, columns, capacity, name, owner_tracker_pid = state
+        self.__init__(lines, columns, capacity, name=name)
+        if self._getTrackerPid() != owner_tracker_pid:
+            # Only the creator destroys the block: a bot process that ends must not destroy it with its own tracker
+            resource_tracker.unregister(self._memory._name, "shared_memory")
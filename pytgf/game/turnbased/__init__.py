@@ -1,2 +1,3 @@
 from .tb_api import TurnBasedAPI
+from .tb_logicalloop import TurnBasedLogicalLoop, HeadlessTurnBasedMainLoop
 from .tb_mainloop import TurnBasedMainLoop
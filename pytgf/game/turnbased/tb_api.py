@@ -14,14 +14,14 @@ class TurnBasedAPI(API, metaclass=ABCMeta):
     def __init__(self, game: Core):
         super().__init__(game)
         self.currentPlayerIndex = 0
+        self.game.xorHash("turn", self.currentPlayerIndex)
 
-    def performMove(self, player_number: int, move_descriptor: MoveDescriptor, force: bool = False):
-        if self.game.isFinished():
-            return True
-        if not force and player_number != self.getCurrentPlayer():
+    def performMove(self, player_number: int, move_descriptor: MoveDescriptor, force: bool = False,
+                    record: bool = False):
+        if not self.game.isFinished() and not force and player_number != self.getCurrentPlayer():
             raise NotYourTurnException("The move is performed by player " + str(player_number) + " while the current "
                                        "player is " + str(self.getCurrentPlayer()))
-        return super().performMove(player_number, move_descriptor, force)
+        return super().performMove(player_number, move_descriptor, force, record=record)
 
     def isCurrentPlayer(self, player_number: int) -> bool:
         """
@@ -50,7 +50,11 @@ class TurnBasedAPI(API, metaclass=ABCMeta):
         """
         Returns: The number representing the current player
         """
-        self.currentPlayerIndex = self._getNextPlayerIndex()
+        next_player_index = self._getNextPlayerIndex()
+        if next_player_index != self.currentPlayerIndex:
+            self.game.xorHash("turn", self.currentPlayerIndex)
+            self.game.xorHash("turn", next_player_index)
+            self.currentPlayerIndex = next_player_index
 
     def getNextPlayer(self, offset: int = 1) -> int:
         """
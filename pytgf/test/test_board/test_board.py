@@ -1,5 +1,7 @@
 import unittest
 
+import pygame
+
 from ...board import Builder
 
 
@@ -11,9 +13,10 @@ class TestBoard(unittest.TestCase):
         board = Builder(10, 10, 7, 6).create()
         self.assertEqual(board.lines, 7)
         self.assertEqual(board.columns, 6)
-        self.assertEqual(len(board._tiles), 7)
+        self.assertEqual(board.getByteCodes().shape, (7, 6))
         for i in range(7):
-            self.assertEqual(len(board._tiles[i]), 6)
+            for j in range(6):
+                self.assertEqual(board.getTileById((i, j)).identifier, (i, j))
 
     def test_board_borders(self):
         """
@@ -105,6 +108,22 @@ class TestBoard(unittest.TestCase):
         board.setTileDeadly((5, 5), False)
         self.assertFalse(board.getTileById((5, 5)).deadly)
 
+    def test_byte_codes_and_snapshot(self):
+        board = Builder(10, 10, 7, 6).create()
+        board.setTileDeadly((1, 1))
+        board.setTileNonWalkable((2, 2))
+        board.setTileDeadly((3, 3))
+        board.setTileNonWalkable((3, 3))
+        snapshot = board.snapshot()
+        tile = board.getTileById((1, 1))
+        snapshot.setTileDeadly((1, 1), False)
+        self.assertIs(board.getTileById((1, 1)), tile)
+        self.assertFalse(snapshot.getTileById((1, 1)).deadly)
+        byte_codes = board.getByteCodes()
+        self.assertEqual(byte_codes.sum(), 6)
+        self.assertEqual((byte_codes[1, 1], byte_codes[2, 2], byte_codes[3, 3]), (1, 2, 3))
+        self.assertEqual(snapshot.getByteCodes()[1, 1], 0)
+
     def test_get_tile_by_pixel(self):
         builder = Builder(10, 10, 5, 5)
         builder.setMargins(0, 0)
@@ -116,6 +135,33 @@ class TestBoard(unittest.TestCase):
         tile = board.getTileByPixel((9, 7))
         self.assertEqual(tile, board.getTileById((3, 4)))
 
+    def test_refresh_surface(self):
+        builder = Builder(100, 100, 5, 5)
+        builder.setTilesVisible(True)
+        board = builder.create()
+        self.assertEqual(board.graphics.refreshSurface(), [pygame.Rect(0, 0, 100, 100)])  # The whole board is drawn
+        self.assertEqual(board.graphics.refreshSurface(), [])
+        board.graphics.setInternalColor((255, 0, 0), 2, 3)
+        dirty_rects = board.graphics.refreshSurface()
+        self.assertEqual(len(dirty_rects), 1)
+        self.assertTrue(dirty_rects[0].collidepoint(board.getTileById((2, 3)).center))
+        redrawn_board = builder.create()
+        redrawn_board.graphics.setInternalColor((255, 0, 0), 2, 3)
+        self.assertEqual(pygame.image.tostring(board.graphics.surface, "RGB"),
+                         pygame.image.tostring(redrawn_board.graphics.surface, "RGB"))
+
+    def test_get_tile_by_pixel_outside_tiles(self):
+        builder = Builder(100, 100, 5, 5)
+        builder.setMargins(10, 10)
+        board = builder.create()
+        self.assertIsNone(board.getTileByPixel((2, 2)))  # In the margin
+        self.assertIsNone(board.getTileByPixel((-1, 50)))  # Outside the board
+        self.assertIsNone(board.getTileByPixel((100, 50)))
+        tile = board.getTileByPixel((50, 50))
+        self.assertEqual(tile, board.getTileById((2, 2)))
+        self.assertTrue(board.graphics.containsPoint(tile.center, 2, 2))
+        self.assertFalse(board.graphics.containsPoint(tile.center, 2, 3))
+
 
 
 
@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+
+from ...board import Builder
+from ...board.distances import get_distance_field, get_distance_fields, get_territories, UNREACHABLE, NO_OWNER
+from ...board.pathfinder import get_shortest_paths_in_board
+
+
+class TestDistances(unittest.TestCase):
+    def setUp(self):
+        self.board = Builder(10, 10, 5, 5).create()
+        self.board.setTileNonWalkable((1, 1))
+        self.board.setTileNonWalkable((1, 2))
+        self.board.setTileDeadly((3, 3))
+
+    def test_walkable_mask(self):
+        mask = self.board.getWalkableMask()
+        self.assertEqual(mask.shape, (5, 5))
+        self.assertEqual(np.count_nonzero(~mask), 2)
+        self.assertFalse(mask[1, 1])
+        self.assertTrue(mask[3, 3])
+        self.assertFalse(self.board.getWalkableMask(avoid_deadly=True)[3, 3])
+
+    def test_distance_field_same_as_breadth_first_search(self):
+        mask = self.board.getWalkableMask(avoid_deadly=True)
+        field = get_distance_field(mask, [(0, 1)])
+        _, costs = get_shortest_paths_in_board(self.board, (0, 1), -1, lambda tile: not tile.deadly)
+        for i in range(5):
+            for j in range(5):
+                self.assertEqual(field[i, j], costs.get((i, j), UNREACHABLE))
+
+    def test_distance_field_multiple_sources_max_dist(self):
+        mask = self.board.getWalkableMask()
+        mask[0, 0] = False  # A source is reached even if it is not walkable
+        field = get_distance_field(mask, [(0, 0), (4, 4)], max_dist=2)
+        self.assertEqual(field[0, 0], 0)
+        self.assertEqual(field[4, 4], 0)
+        self.assertEqual(field[2, 0], 2)
+        self.assertEqual(field[3, 3], 2)
+        self.assertEqual(field[2, 2], UNREACHABLE)
+        self.assertEqual(field[1, 1], UNREACHABLE)
+
+    def test_distance_fields(self):
+        mask = self.board.getWalkableMask()
+        fields = get_distance_fields(mask, [(0, 0), (4, 4)])
+        self.assertEqual(fields.shape, (2, 5, 5))
+        self.assertTrue(np.array_equal(fields[0], get_distance_field(mask, [(0, 0)])))
+        self.assertTrue(np.array_equal(fields[1], get_distance_field(mask, [(4, 4)])))
+        self.assertTrue(np.array_equal(fields.min(axis=0), get_distance_field(mask, [(0, 0), (4, 4)])))
+
+    def test_territories(self):
+        mask = self.board.getWalkableMask()
+        territories = get_territories(mask, [(0, 0), (4, 4)])
+        self.assertEqual(territories[0, 4], NO_OWNER)  # At distance 4 of both sources
+        self.assertEqual(territories[1, 1], NO_OWNER)  # Not walkable
+        self.assertEqual(territories[1, 0], 0)
+        self.assertEqual(territories[3, 3], 1)
+        self.assertEqual(territories[1, 3], NO_OWNER)  # At distance 4 of both sources, around the wall
+        self.assertEqual(np.count_nonzero(territories == 0), 8)
+        self.assertEqual(np.count_nonzero(territories == 1), 10)
@@ -0,0 +1,49 @@
+import unittest
+
+from ...board.simulation.ordering import MoveOrdering
+
+
+class TestMoveOrdering(unittest.TestCase):
+    def setUp(self):
+        self.ordering = MoveOrdering()
+        self.combinations = [[{1: own_move, 2: other_move} for other_move in range(3)] for own_move in range(3)]
+
+    def test_principal_variation_first(self):
+        self.ordering.orderCombinations(self.combinations, 0, 1, principal_variation={1: 2, 2: 1})
+        self.assertEqual(self.combinations[0][0], {1: 2, 2: 1})
+
+    def test_killer_first(self):
+        self.ordering.registerCutoff({1: 1, 2: 2}, 3, 2, [1, 2])
+        self.ordering.orderCombinations(self.combinations, 3, 1)
+        self.assertEqual(self.combinations[0][0], {1: 1, 2: 2})
+        self.ordering.registerCutoff({1: 0, 2: 0}, 4, 2, [1])
+        self.ordering.orderCombinations(self.combinations, 3, 1, principal_variation={1: 0, 2: 0})
+        self.assertEqual(self.combinations[0][0], {1: 0, 2: 0})  # The principal variation comes before the killers
+
+    def test_history_aging(self):
+        self.ordering.registerCutoff({1: 1, 2: 2}, 0, 3, [1])
+        self.ordering.startSearch()
+        self.ordering.orderCombinations(self.combinations, 0, 1)
+        self.assertEqual(self.combinations[0][0][1], 1)  # The history is kept (but halved) after the killers are reset
+        self.assertEqual(self.ordering.getScore({1: 1, 2: 0}, 0, 1, None, own_move=True), (False, False, 8))
+
+    def test_merge(self):
+        other = MoveOrdering()
+        self.ordering.registerCutoff({1: 0, 2: 0}, 2, 1, [1])
+        other.registerCutoff({1: 1, 2: 1}, 2, 3, [1])
+        other.registerCutoff({1: 0, 2: 0}, 2, 0, [1])
+        self.ordering.merge(other)
+        self.ordering.orderCombinations(self.combinations, 2, 1)
+        self.assertEqual(self.combinations[0][0], {1: 1, 2: 1})  # The greatest history weight is kept
+        self.assertEqual(self.ordering.getScore({1: 0, 2: 0}, 2, 1, None, own_move=True), (False, True, 4))
+
+    def test_lazy_ordering(self):
+        self.ordering.registerCutoff({1: 1, 2: 2}, 1, 2, [2])
+        self.ordering.registerCutoff({1: 0, 2: 1}, 1, 2, [1])
+        moves = [0, 1, 2]
+        self.ordering.orderMoves(moves, 1, 1, 2)
+        self.assertEqual(moves[0], 2)  # The history of the other player
+        self.ordering.orderMoves(moves, 1, 1, 1)
+        self.assertEqual(moves, [0, 1, 2])  # The killers of the player first, then its history
+        self.assertEqual(self.ordering.getPriorityCombinations(1, 1, 1, principal_variation={1: 1, 2: 0}),
+                         [{1: 1, 2: 0}, {1: 1, 2: 2}])
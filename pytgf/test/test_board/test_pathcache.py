@@ -0,0 +1,53 @@
+import copy
+import unittest
+
+from ...board import Builder
+from ...board.distances import UNREACHABLE
+from ...board.pathcache import ShortestPathsCache
+from ...board.pathfinder import get_shortest_paths_in_board, UnreachableDestination
+
+
+class TestShortestPathsCache(unittest.TestCase):
+    def setUp(self):
+        self.board = Builder(10, 10, 4, 4).create()
+        self.board.setTileNonWalkable((0, 2))
+        self.board.setTileDeadly((1, 2))
+        self.cache = ShortestPathsCache(self.board, lambda tile: not tile.deadly)
+
+    def test_same_distances_as_breadth_first_search(self):
+        for source in ((0, 0), (3, 3), (1, 2)):
+            _, costs = get_shortest_paths_in_board(self.board, source, -1, lambda tile: not tile.deadly)
+            for i in range(4):
+                for j in range(4):
+                    if (i, j) != source:
+                        self.assertEqual(self.cache.getDistance(source, (i, j)), costs.get((i, j), UNREACHABLE))
+
+    def test_get_shortest_path(self):
+        path = self.cache.getShortestPath((0, 0), (0, 3))
+        self.assertEqual(len(path), 7)
+        previous = (0, 0)
+        for tile_id in path:
+            self.assertTrue(tile_id in self.board.getTileById(previous).neighbours)
+            self.assertFalse(self.board.getTileById(tile_id).deadly)
+            previous = tile_id
+        self.assertEqual(previous, (0, 3))
+        self.assertRaises(UnreachableDestination, self.cache.getShortestPath, (0, 0), (0, 2))
+        self.assertRaises(UnreachableDestination, self.cache.getShortestPath, (0, 0), (4, 0))
+
+    def test_invalidated_by_tile_modification(self):
+        self.assertEqual(self.cache.getDistance((0, 0), (0, 3)), 7)
+        version = self.board.topologyVersion
+        self.board.setTileDeadly((1, 2), deadly=False)
+        self.assertEqual(self.board.topologyVersion, version + 1)
+        self.assertEqual(self.cache.getShortestPath((0, 0), (0, 3))[1:], [(1, 1), (1, 2), (1, 3), (0, 3)])
+        self.board.setTileNonWalkable((1, 1))
+        self.assertEqual(self.cache.getDistance((0, 0), (0, 3)), 7)
+
+    def test_copy_not_shared(self):
+        self.cache.getDistance((0, 0), (0, 3))
+        board_copy = copy.deepcopy(self.board)
+        cache_copy = copy.deepcopy(self.cache, {id(self.board): board_copy})
+        self.assertIs(cache_copy.board, board_copy)
+        board_copy.setTileDeadly((1, 2), deadly=False)
+        self.assertEqual(cache_copy.getDistance((0, 0), (0, 3)), 5)
+        self.assertEqual(self.cache.getDistance((0, 0), (0, 3)), 7)
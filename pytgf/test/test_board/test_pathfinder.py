@@ -1,7 +1,8 @@
 import unittest
 
 from ...board import Builder
-from ...board.pathfinder import get_shortest_path, get_shortest_paths, reconstruct_path
+from ...board.pathfinder import get_shortest_path, get_shortest_paths, reconstruct_path, get_shortest_path_in_board, \
+    get_shortest_paths_in_board, UnreachableDestination
 
 
 class TestPathfinder(unittest.TestCase):
@@ -51,3 +52,27 @@ class TestPathfinder(unittest.TestCase):
         self.assertRaises(Exception, reconstruct_path, dijkstra_result[0], (0, 0), (0, 3))
         self.assertFalse((0, 3) in dijkstra_result[0].keys())
 
+
+    def test_get_shortest_path_is_shortest(self):
+        self.board.setTileNonWalkable((0, 0))
+        path = get_shortest_path((2, 3), (2, 1), self.board.getTileById, self.get_neighbours, self.walkable)
+        self.assertEqual(path, [(2, 2), (2, 1)])
+        self.assertEqual(path, get_shortest_path_in_board(self.board, (2, 3), (2, 1)))
+
+    def test_get_shortest_path_in_board_unreachable(self):
+        self.board.setTileNonWalkable((0, 1))
+        self.board.setTileNonWalkable((1, 0))
+        self.assertRaises(UnreachableDestination, get_shortest_path_in_board, self.board, (0, 0), (3, 3))
+        self.assertRaises(UnreachableDestination, get_shortest_path_in_board, self.board, (3, 3), (4, 4))
+
+    def test_get_shortest_paths_in_board(self):
+        self.board.setTileNonWalkable((0, 2))
+        self.board.setTileDeadly((1, 2))
+        not_deadly = lambda tile: tile.walkable and not tile.deadly
+        for max_dist in (3, -1):
+            came_from, costs = get_shortest_paths_in_board(self.board, (0, 0), max_dist, not_deadly)
+            self.assertEqual((came_from, costs), get_shortest_paths((0, 0), max_dist, self.board.getTileById,
+                                                                    self.get_neighbours, not_deadly))
+            self.assertEqual(max(costs.values()), 3 if max_dist == 3 else 7)
+        self.assertEqual(costs[(0, 3)], 7)
+        self.assertEqual(len(reconstruct_path(came_from, (0, 0), (0, 3))), 7)
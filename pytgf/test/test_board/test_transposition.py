@@ -0,0 +1,62 @@
+import unittest
+
+from ...board.simulation.transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def setUp(self):
+        self.table = TranspositionTable(max_entries=8)  # 4 buckets of 2 entries
+
+    def test_store_and_probe(self):
+        self.table.store(5, 3, 1.5, EXACT, {1: 2}, (False, 0, False), False)
+        entry = self.table.probe(5)
+        self.assertEqual(entry.value, 1.5)
+        self.assertEqual(entry.bound, EXACT)
+        self.assertEqual(entry.bestMove, {1: 2})
+        self.assertIsNone(self.table.probe(6))
+        self.assertEqual(self.table.getStatistics()["hits"], 1)
+        self.assertEqual(self.table.getStatistics()["misses"], 1)
+
+    def test_collision(self):
+        self.table.store(1, 3, 1, EXACT, {1: 0}, (False, 0, False), False)
+        self.assertIsNone(self.table.probe(5))  # Same bucket as the key 1
+        self.assertEqual(self.table.getStatistics()["collisions"], 1)
+
+    def test_depth_preferred_replacement(self):
+        self.table.store(1, 3, 1, EXACT, {1: 0}, (False, 0, False), False)
+        self.table.store(5, 1, 2, LOWER_BOUND, {1: 1}, (False, 0, False), False)  # Shallower: always-replace entry
+        self.table.store(9, 1, 3, UPPER_BOUND, {1: 2}, (False, 0, False), False)  # Replaces the always-replace entry
+        self.assertEqual(self.table.probe(1).value, 1)
+        self.assertIsNone(self.table.probe(5))
+        self.assertEqual(self.table.probe(9).value, 3)
+        self.table.store(13, 4, 4, EXACT, {1: 3}, (False, 0, False), False)  # Deeper: takes the depth-preferred place
+        self.assertEqual(self.table.probe(13).value, 4)
+        self.assertEqual(self.table.probe(1).value, 1)  # Moved to the always-replace entry
+        self.assertIsNone(self.table.probe(9))
+        self.assertEqual(self.table.getNumberOfEntries(), 2)
+
+    def test_bounded_size(self):
+        for key in range(100):
+            self.table.store(key, key, key, EXACT, None, (False, 0, False), False)
+        self.assertLessEqual(self.table.getNumberOfEntries(), 8)
+        self.table.clear()
+        self.assertEqual(self.table.getNumberOfEntries(), 0)
+
+    def test_entries_transfer(self):
+        self.table.store(1, 3, 1, EXACT, {1: 0}, (False, 0, False), False)
+        self.table.store(6, 2, 2, LOWER_BOUND, {1: 1}, (False, 0, False), False)
+        other = TranspositionTable(max_entries=8)
+        other.storeEntries(self.table.getEntries())
+        self.assertEqual(other.getNumberOfEntries(), 2)
+        self.assertEqual(other.probe(6), self.table.probe(6))
+
+    def test_new_entries(self):
+        self.table.store(1, 3, 1, EXACT, {1: 0}, (False, 0, False), False)
+        self.assertEqual(self.table.takeNewEntries(), [])  # The new entries are not tracked yet
+        self.table.trackNewEntries()
+        self.table.store(2, 3, 2, EXACT, {1: 1}, (False, 0, False), False)
+        self.table.store(2, 4, 3, EXACT, {1: 2}, (False, 0, False), False)
+        new_entries = self.table.takeNewEntries()
+        self.assertEqual([entry.value for entry in new_entries], [3])  # Only the last entry of each state
+        self.assertEqual(self.table.takeNewEntries(), [])
+        self.assertEqual(self.table.getNumberOfEntries(), 2)
@@ -0,0 +1,48 @@
+import os
+import unittest
+
+import pygame
+
+from ....characters.units.sprite import UnitSprite, get_image
+
+RES_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "res")
+
+
+class ExampleSprite(UnitSprite):
+    @property
+    def imageRelativePath(self) -> str:
+        return os.path.join(RES_FOLDER, "sprites", "trace1.png")
+
+
+class TestSprite(unittest.TestCase):
+    def test_images_shared(self):
+        """
+        Tests that the sprites with the same image, size and rotation share the same surface
+        """
+        sprite1 = ExampleSprite()
+        sprite2 = ExampleSprite()
+        self.assertIs(sprite1.image, sprite2.image)
+        sprite1.size(10, 5)
+        sprite2.size(10, 5)
+        self.assertIs(sprite1.image, sprite2.image)
+        self.assertEqual(sprite1.image.get_size(), (10, 5))
+        sprite1.rotate(90)
+        self.assertEqual(sprite1.image.get_size(), (5, 10))
+        self.assertIs(sprite1.image, get_image(sprite1._imageKey[0], (10, 5), 90))
+        sprite2.rotate(-270)
+        self.assertIs(sprite1.image, sprite2.image)
+        sprite1.size(6, 12)  # The image is still vertical
+        self.assertEqual(sprite1.image.get_size(), (6, 12))
+
+    def test_replaced_image(self):
+        """
+        Tests that an image replaced by a subclass is transformed without the shared images
+        """
+        sprite = ExampleSprite()
+        shared_image = sprite.image
+        sprite.image = pygame.Surface((4, 8))
+        sprite.rotate(90)
+        self.assertEqual(sprite.image.get_size(), (8, 4))
+        sprite.size(2, 1)
+        self.assertEqual(sprite.image.get_size(), (2, 1))
+        self.assertEqual(shared_image.get_size(), ExampleSprite().image.get_size())
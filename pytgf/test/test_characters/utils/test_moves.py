@@ -0,0 +1,23 @@
+import unittest
+
+from ....characters.utils.moves import getMovesCombinations, iterMovesCombinations, combinationToDict
+
+
+class TestMovesCombinations(unittest.TestCase):
+    def test_combinations(self):
+        combinations = getMovesCombinations({1: (0, 1), 2: (2, 3)})
+        self.assertEqual(len(combinations), 4)
+        self.assertIn({1: 1, 2: 2}, combinations)
+
+    def test_lazy_combinations(self):
+        combinations = iterMovesCombinations({1: (0, 1), 2: (2, 3), 3: (4, 5)})
+        self.assertFalse(hasattr(combinations, "__len__"))  # Nothing is materialized
+        self.assertEqual(next(combinations), (0, 2, 4))
+        self.assertEqual(combinationToDict([1, 2, 3], next(combinations)), {1: 0, 2: 2, 3: 5})
+
+    def test_unsafe_moves_pruned(self):
+        combinations = list(iterMovesCombinations({1: (0, 1, 2), 2: (0, 1)},
+                                                  is_move_safe=lambda player_number, move: move != 0))
+        self.assertEqual(combinations, [(1, 1), (2, 1)])
+        combinations = list(iterMovesCombinations({1: (0,), 2: (0, 1)}, is_move_safe=lambda player_number, move: False))
+        self.assertEqual(len(combinations), 2)  # All the moves are unsafe: they are all kept
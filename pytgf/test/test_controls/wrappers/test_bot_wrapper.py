@@ -1,4 +1,5 @@
 import unittest
+from threading import Thread
 from typing import Tuple, List
 
 from multiprocess.connection import Pipe
@@ -14,9 +15,10 @@ from ....board import Builder
 from ....characters.moves import Path
 from ....characters.units import Unit
 from ....controls.controllers import Bot
-from ....controls.events import BotEvent, SpecialEvent
+from ....controls.events import BotEvent, SpecialEvent, ReadyEvent
 from ....controls.wrappers.bot import BotControllerWrapper
-from ....game import Core, UnfeasibleMoveException, API
+from ....controls.wrappers.connection import local_pipe
+from ....game import Core, UnfeasibleMoveException, API, CompactGameState, SharedGameState
 
 MOVE1 = "MOVE1"
 MOVE2 = "MOVE2"
@@ -106,6 +108,18 @@ class ExampleBot(Bot):
         return "MOVE1-" + str(game_state.move1) + '/' + "MOVE2-" + str(game_state.move2)
 
 
+class SnapshotBot(ExampleBot):
+    @property
+    def mustReplayEvents(self) -> bool:
+        return False
+
+    def reactToEvents(self, events: List[BotEvent]):
+        return Bot.reactToEvents(self, events)  # Does not perform the moves in the API like the ExampleBot
+
+    def _selectNewMove(self, game_state: CompactGameState):
+        return "MOVE-" + str(game_state.entitiesCount)
+
+
 class TestBotControllerWrapper(unittest.TestCase):
     def setUp(self):
         self.game = ExampleGame(Builder(10, 10, 7, 6).create())
@@ -171,6 +185,74 @@ class TestBotControllerWrapper(unittest.TestCase):
         # Should run indefinitely if no flag was sent
         self.assertTrue(True)
 
+    def test_run_wakes_on_event(self):
+        """
+        Checks that the logical loop of the linker answers as soon as an event arrives, and ends on the end event
+        """
+        thread = Thread(target=self.linker1.run)
+        thread.start()
+        self.assertIsInstance(self.move_pipe_parent1.recv(), ReadyEvent)
+        self.move_pipe_parent1.send(BotEvent(1, MOVE2))
+        self.assertTrue(self.move_pipe_parent1.poll(1))
+        self.assertEqual(self.move_pipe_parent1.recv(), "MOVE1-0/MOVE2-1")
+        self.game_info_pipe_parent1.send(SpecialEvent(SpecialEvent.END))
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+
+    def test_run_stopped(self):
+        """
+        Checks that the logical loop of the linker ends when it is stopped, even if no event arrives
+        """
+        thread = Thread(target=self.linker1.run)
+        thread.start()
+        self.assertIsInstance(self.move_pipe_parent1.recv(), ReadyEvent)
+        self.linker1.stop()
+        thread.join(2)
+        self.assertFalse(thread.is_alive())
+        self.assertTrue(self.move_pipe_child1.closed)
+
+    def test_run_once_inline(self):
+        """
+        Checks that a linker run inline through local pipes answers to an event in a single call, and ends on the end
+        event
+        """
+        move_pipe_parent, move_pipe_child = local_pipe()
+        game_info_pipe_parent, game_info_pipe_child = local_pipe()
+        self.linker1.setMainPipe(move_pipe_child)
+        self.linker1.setGameInfoPipe(game_info_pipe_child)
+        self.linker1.start()
+        self.assertIsInstance(move_pipe_parent.recv(), ReadyEvent)
+        event = BotEvent(1, MOVE2)
+        move_pipe_parent.send(event)
+        self.linker1.runOnce()
+        self.assertEqual(move_pipe_parent.recv(), "MOVE1-0/MOVE2-1")
+        self.assertFalse(move_pipe_parent.poll())
+        game_info_pipe_parent.send(SpecialEvent(SpecialEvent.END))
+        self.linker1.runOnce()
+        self.assertTrue(move_pipe_child.closed)
+        self.assertRaises(BrokenPipeError, move_pipe_parent.send, event)
+
+    def test_react_to_shared_snapshot(self):
+        """
+        Checks that a bot that only reads the shared state reacts to a snapshot of it without replaying the moves
+        """
+        bot = SnapshotBot(1)
+        bot.gameState = self.game.copy()
+        self.assertFalse(bot.readsSharedState)
+        bot.sharedState = SharedGameState.fromCompactState(self.game.useCompactState())
+        try:
+            self.assertTrue(bot.readsSharedState)
+            linker = ExampleBotControllerWrapper(bot)
+            linker.setMainPipe(self.move_pipe_child1)
+            linker.setGameInfoPipe(self.game_info_pipe_child1)
+            self.move_pipe_parent1.send(BotEvent(1, MOVE1))
+            linker._routine()  # Message received
+            linker._routine()  # Message sent
+            self.assertEqual(self.move_pipe_parent1.recv(), "MOVE-2")
+            self.assertEqual(bot.gameState.move1, 0)
+        finally:
+            bot.sharedState.close()
+
     def test_unit_dead(self):
         """
         Checks if the linker blocks the incoming message of a dead unit, and starts to send again when resurrected
@@ -1,11 +1,56 @@
+import pickle
 import unittest
 from typing import List, Dict
 
+import numpy as np
 import pandas as pd
 
+from ...board.simulation import SimultaneousAlphaBeta, MonteCarloTreeSearch, BatchEvaluator
 from ...controls.controllers import Passive
 from ...controls.wrappers import ControllerWrapper
 from ...examples.connect4.builder import create_game
+from ...examples.connect4.res.AIs.connect4_random import Connect4Random
+from ...examples.connect4.rules import Connect4Solver
+from ...game import API, SharedGameState, SharedStateCapacityException
+from ...game.logicalloop import THREAD_EXECUTION
+
+
+class HorizontalLinesEvaluator(BatchEvaluator):
+    def __init__(self):
+        self.batchesSizes = []
+
+    def evaluateBatch(self, encoded_states, player_numbers):
+        self.batchesSizes.append(len(encoded_states))
+        boards = encoded_states[:, :42].reshape((-1, 6, 7))
+        scores = []
+        for player_number in player_numbers:
+            discs = boards == player_number
+            has_line = np.zeros(len(boards), dtype=bool)
+            for column in range(4):
+                has_line |= discs[:, :, column:column + 4].all(axis=2).any(axis=1)
+            scores.append(has_line)
+        return np.stack(scores, axis=1).astype(float)
+
+
+def play_three_in_a_row(api: API) -> None:
+    """
+    Plays the first moves of a game in which the player 1 can win directly by playing in the column 3
+    (each player has three discs in the columns 0, 1 and 2, the discs of the player 1 being on the bottom line)
+    """
+    for player_number, move in ((1, 0), (2, 0), (1, 1), (2, 1), (1, 2), (2, 2)):
+        api.performMove(player_number, move)
+
+
+class CrashingBot(Connect4Random):
+    def _selectNewMove(self, game_state):
+        raise ValueError("The bot crashed")
+
+
+def win_evaluation(state: API) -> Dict[int, int]:
+    """
+    Evaluation function that only rewards the players that won
+    """
+    return {player_number: int(state.hasWon(player_number)) for player_number in state.getPlayerNumbers()}
 
 
 class TestConnect4(unittest.TestCase):
@@ -55,6 +100,231 @@ class TestConnect4(unittest.TestCase):
         self.assertTrue(self.mainLoop.api.isFinished())
         self.assertTrue(self.mainLoop.api.hasWon(1))
 
+    def test_snapshot(self):
+        api = self.mainLoop.api
+        api.performMove(1, 0)
+        succeeded, new_api = api.simulateMove(2, 0)
+        self.assertTrue(succeeded)
+        new_api.performMove(1, 0)
+        self.assertEqual(api.getTileByteCode((4, 0)), 0)
+        self.assertEqual(new_api.getTileByteCode((4, 0)), 2)
+        self.assertEqual(new_api.getTileByteCode((3, 0)), 1)
+        self.assertEqual(len(api.getActionsHistory(1)), 1)
+        self.assertEqual(len(new_api.getActionsHistory(1)), 2)
+        self.assertNotEqual(hash(api), hash(new_api))
+        self.assertEqual(hash(api), hash(api.copy()))
+
+    def test_undo_move(self):
+        api = self.mainLoop.api.copy()
+        api.performMove(1, 0)
+        board_codes = api.getBoardByteCodes()
+        self.assertTrue(api.performMove(2, 0, record=True))
+        self.assertTrue(api.performMoves({1: 1}, record=True))
+        self.assertFalse(api.performMove(2, None, record=True))  # Unfeasible moves are not recorded
+        api.undoMove()
+        self.assertEqual(api.getBoardByteCodes()[5][1], 0)
+        api.undoMove()
+        self.assertTrue(np.array_equal(api.getBoardByteCodes(), board_codes))
+        self.assertEqual(len(api.getActionsHistory(2)), 0)
+        api.performMove(2, 1)
+        api.performMove(1, 0)
+        api.performMove(2, 1)
+        api.performMove(1, 0)
+        api.performMove(2, 1)
+        api.performMove(1, 0, record=True)
+        self.assertTrue(api.hasWon(1))
+        api.undoMove()
+        self.assertFalse(api.isFinished())
+        api.performMove(1, 2)
+        api.performMove(2, 1)
+        self.assertTrue(api.hasWon(2))
+
+    def test_commit_move(self):
+        api = self.mainLoop.api.copy()
+        self.assertTrue(api.performMove(1, 0, record=True))
+        self.assertTrue(api.performMove(2, 1, record=True))
+        api.commitMove()  # Nested in the first record: undone with it
+        self.assertTrue(api.game.journal.isRecording())
+        api.commitMove()
+        self.assertFalse(api.game.journal.isRecording())
+        self.assertEqual(api.game.journal.getRecordsCount(), 0)
+        self.assertEqual(len(api.getActionsHistory(2)), 1)
+        self.assertTrue(api.performMove(1, 2, record=True))
+        self.assertTrue(api.performMove(2, 3, record=True))
+        api.commitMove()
+        api.undoMove()
+        self.assertEqual(len(api.getActionsHistory(1)), 1)
+        self.assertEqual(len(api.getActionsHistory(2)), 1)
+        self.assertFalse(api.game.journal.isRecording())
+
+    def test_compact_state(self):
+        api = self.mainLoop.api.copy()
+        compact_state = api.game.useCompactState()
+        api.performMove(1, 3)
+        disc = api.game.getTileOccupants((5, 3))[0]
+        self.assertEqual(compact_state.getPosition(disc), (5, 3))
+        self.assertEqual(compact_state.teams[disc.stateIndex], 1)
+        self.assertEqual(compact_state.getLastAction(api.game.getUnitForNumber(1)), 3)
+        self.assertEqual(api.game.getTileOccupants((2, 4)), ())
+        self.assertEqual(api.game.getTileOccupants((4, 3)), (api.game.getTileOccupants((4, 3))[0],))
+        self.assertFalse(api.getBoardByteCodes().flags.writeable)
+        copied_api = api.copy()
+        self.assertIsNot(copied_api.game.compactState, compact_state)
+        self.assertTrue(np.array_equal(copied_api.game.compactState.tiles, compact_state.tiles))
+        self.assertEqual(hash(copied_api), hash(api))
+        copied_api.performMove(2, 3)
+        self.assertFalse(np.array_equal(copied_api.game.compactState.occupancy, compact_state.occupancy))
+        self.assertEqual(compact_state.occupancy[4, 3], 1)  # The bottom of the column
+        self.assertEqual(copied_api.game.compactState.occupancy[4, 3], 1)  # The disc of the player 2
+        self.assertEqual(copied_api.game.compactState.occupancy[3, 3], 1)  # The bottom of the column
+        previous_hash = hash(api)
+        api.performMove(2, 4, record=True)
+        self.assertNotEqual(hash(api), previous_hash)
+        api.undoMove()
+        self.assertEqual(hash(api), previous_hash)
+
+    def test_shared_state(self):
+        api = self.mainLoop.api.copy()
+        compact_state = api.game.useCompactState()
+        shared_state = SharedGameState.fromCompactState(compact_state)
+        try:
+            attached_state = pickle.loads(pickle.dumps(shared_state))  # As received by the process of a bot
+            self.assertEqual(attached_state.name, shared_state.name)
+            self.assertFalse(attached_state.tiles.flags.writeable)
+            api.performMove(1, 3)
+            shared_state.publish(compact_state)
+            self.assertEqual(attached_state.version, 2)
+            snapshot = attached_state.snapshot()
+            self.assertEqual(snapshot.entitiesCount, compact_state.entitiesCount)
+            self.assertTrue(np.array_equal(snapshot.tiles, compact_state.tiles))
+            self.assertTrue(np.array_equal(snapshot.occupancy, compact_state.occupancy))
+            self.assertTrue(np.array_equal(attached_state.positions, compact_state.positions[:snapshot.entitiesCount]))
+            self.assertTrue(np.array_equal(attached_state.teams, compact_state.teams[:snapshot.entitiesCount]))
+            attached_state.close()
+            small_state = SharedGameState(6, 7, capacity=1)
+            self.assertRaises(SharedStateCapacityException, small_state.publish, compact_state)
+            small_state.close()
+        finally:
+            shared_state.close()
+
+    def test_shared_state_with_bots(self):
+        main_loop = create_game({1: Connect4Random, 2: Connect4Random}, 360, 360, headless=True,
+                                execution=THREAD_EXECUTION)
+        main_loop.shareState()
+        main_loop.run()
+        self.assertTrue(main_loop.game.isFinished())
+        self.assertIsNone(main_loop.sharedState)  # Released at the end of the game
+        for wrapper in main_loop.wrappers:
+            self.assertFalse(wrapper.controller.readsSharedState)  # The bots need the API: they replay the moves
+            self.assertIsNotNone(wrapper.controller.gameState)
+
+    def test_headless_crashed_bot(self):
+        main_loop = create_game({1: CrashingBot, 2: Connect4Random}, 360, 360, headless=True,
+                                execution=THREAD_EXECUTION)
+        main_loop.run()  # Would wait forever for the move of the player 1
+        self.assertFalse(main_loop.game.isFinished())
+
+    def test_zobrist_hash(self):
+        api = self.mainLoop.api.copy()
+        transposed_api = self.mainLoop.api.copy()
+        self.assertEqual(hash(api), hash(transposed_api))
+        for player_number, move in ((1, 0), (2, 1), (1, 4), (2, 5), (1, 2), (2, 3)):
+            api.performMove(player_number, move)
+        for player_number, move in ((1, 4), (2, 5), (1, 0), (2, 1), (1, 2), (2, 3)):
+            transposed_api.performMove(player_number, move)
+        self.assertEqual(hash(api), hash(transposed_api))
+        self.assertNotEqual(hash(api), hash(self.mainLoop.api))
+        previous_hash = hash(api)
+        api.performMove(1, 6, record=True)
+        self.assertNotEqual(hash(api), previous_hash)
+        self.assertEqual(hash(api.copy()), hash(api))
+        api.undoMove()
+        self.assertEqual(hash(api), previous_hash)
+        api.performMove(1, 5)
+        transposed_api.performMove(1, 6)
+        self.assertNotEqual(hash(api), hash(transposed_api))
+
+    def test_alphabeta_time_budget(self):
+        api = self.mainLoop.api
+        play_three_in_a_row(api)
+        state_hash = hash(api)
+        alpha_beta = SimultaneousAlphaBeta(win_evaluation, tuple(range(7)), max_depth=-1, turn_based=True)
+        move = alpha_beta.alphaBetaSearching(1, api, time_budget=0.5)
+        self.assertEqual(move, 3)  # Wins directly
+        self.assertGreaterEqual(alpha_beta.reachedDepth, 0)
+        self.assertEqual(hash(api), state_hash)
+
+    def test_alphabeta_parallel(self):
+        api = self.mainLoop.api
+        play_three_in_a_row(api)
+        state_hash = hash(api)
+        alpha_beta = SimultaneousAlphaBeta(win_evaluation, tuple(range(7)), max_depth=1, turn_based=True,
+                                           nb_workers=2)
+        try:
+            self.assertEqual(alpha_beta.alphaBetaSearching(1, api), 3)  # Wins directly
+            self.assertGreater(alpha_beta.getSearchStatistics()["nodes"], 1)  # The nodes of the workers are counted
+        finally:
+            alpha_beta.close()
+        self.assertEqual(hash(api), state_hash)
+
+    def test_alphabeta_batch_evaluation(self):
+        api = self.mainLoop.api
+        play_three_in_a_row(api)
+        evaluator = HorizontalLinesEvaluator()
+        alpha_beta = SimultaneousAlphaBeta(win_evaluation, tuple(range(7)), max_depth=0, turn_based=True,
+                                           batch_evaluator=evaluator)
+        self.assertEqual(alpha_beta.alphaBetaSearching(1, api), 3)  # Wins directly
+        # One batch per move, with the 7 answers of the opponent, except for the winning move: its leaves finish the
+        # game, and are evaluated by the evaluation function
+        self.assertEqual(evaluator.batchesSizes, [7] * 6)
+        cutoffs_count = alpha_beta.getSearchStatistics()["min_cutoffs"]
+        alpha_beta._prepare(1, api)
+        group = next(group for group in alpha_beta._generateMovesCombinations(api) if group.ownMove == 0)
+        value, _, _, _, _ = alpha_beta._minValueOfLeaves(api.snapshot(), group, 0.5, 0)
+        self.assertEqual(value, 0)  # Lower than alpha: the batch is counted as a cutoff
+        self.assertEqual(alpha_beta.getSearchStatistics()["min_cutoffs"], cutoffs_count + 1)
+        winning_group = next(group for group in alpha_beta._generateMovesCombinations(api) if group.ownMove == 3)
+        value, _, end_state, _, reached_end = alpha_beta._minValueOfLeaves(api.snapshot(), winning_group, 0.5, 0)
+        self.assertEqual(value, 1)  # Scored by the evaluation function, as in the search without batches
+        self.assertEqual(end_state, (True, 0, True))
+        self.assertTrue(reached_end)
+
+    def test_monte_carlo_tree_search(self):
+        api = self.mainLoop.api
+        play_three_in_a_row(api)
+        state_hash = hash(api)
+        monte_carlo = MonteCarloTreeSearch(tuple(range(7)))
+        self.assertEqual(monte_carlo.monteCarloSearching(1, api, max_iterations=300), 3)  # Wins directly
+        self.assertEqual(monte_carlo.getSearchStatistics()["iterations"], 300)
+        self.assertEqual(hash(api), state_hash)
+        api.performMove(1, 4)
+        self.assertEqual(monte_carlo.monteCarloSearching(2, api, max_iterations=100), 3)  # Avoids losing
+        self.assertGreater(monte_carlo.getSearchStatistics()["reused_visits"], 0)  # Reuses the first tree
+
+    def test_bitboard(self):
+        api = self.mainLoop.api.copy()
+        play_three_in_a_row(api)
+        bitboard = api.game.bitboard
+        self.assertEqual(bitboard.getNumberOfDiscs(), 6)
+        self.assertEqual(bitboard.getLowestFreeLine(0), 3)
+        self.assertEqual(api.getTileByteCode((5, 1)), 1)
+        self.assertEqual(api.getTileByteCode((4, 1)), 2)
+        self.assertFalse(bitboard.hasWon(1))
+        api.performMove(1, 3, record=True)
+        self.assertTrue(bitboard.hasWon(1))
+        api.undoMove()
+        self.assertFalse(bitboard.hasWon(1))
+        self.assertEqual(bitboard.getNumberOfDiscs(), 6)
+
+    def test_solver(self):
+        api = self.mainLoop.api
+        play_three_in_a_row(api)
+        solver = Connect4Solver(max_depth=8)
+        score, column = solver.solve(api.game.bitboard, 1)
+        self.assertEqual(column, 3)  # Wins directly
+        self.assertGreater(score, 0)
+        self.assertEqual(solver.getBestMove(api.game.bitboard, 2), 3)  # Avoids losing
+
     def test_unfeasible(self):
         self.mainLoop.api.performMove(1, 0)
         self.mainLoop.api.performMove(2, 0)
@@ -1,16 +1,22 @@
 import time
 import unittest
 
+import numpy as np
 import pygame
 
 from ...board import Builder, Board
+from ...board.simulation import SimultaneousAlphaBeta
 from ...controls.controllers import Passive
+from ...examples.lazerbike.builder import create_game
 from ...examples.lazerbike.controllers import LazerBikeBotControllerWrapper
 from ...examples.lazerbike.gamedata import GO_RIGHT, GO_UP, GO_DOWN, GO_LEFT
 from ...examples.lazerbike.rules import LazerBikeAPI
 from ...examples.lazerbike.rules.lazerbike import LazerBikeCore
 from ...examples.lazerbike.units.bike import Bike
-from ...game.realtime import RealTimeMainLoop
+from ...examples.lazerbike.units.trace import Trace
+from ...game.core import UnknownUnitException
+from ...game.logicalloop import INLINE_EXECUTION, THREAD_EXECUTION
+from ...game.realtime import RealTimeMainLoop, HeadlessRealTimeMainLoop
 
 
 class TestLazerbike(unittest.TestCase):
@@ -43,6 +49,146 @@ class TestLazerbike(unittest.TestCase):
         self.assertFalse(my_copy.units[1].isAlive())
         self.assertTrue(self.loop.game.units[1].isAlive())
 
+    def test_snapshot(self):
+        self.loop.addUnit(Bike(200, 1, max_trace=-1), LazerBikeBotControllerWrapper(Passive(1)), (15, 25), GO_DOWN,
+                          team=1)
+        self.loop.addUnit(Bike(200, 2, max_trace=-1), LazerBikeBotControllerWrapper(Passive(2)), (16, 24), GO_UP,
+                          team=2)
+        api = self.loop.api
+        succeeded, child = api.simulateMove(1, GO_RIGHT)
+        self.assertTrue(succeeded)
+        self.assertEqual(api.game.getTileIdForUnit(api.game.units[1]), (15, 25))
+        self.assertEqual(child.game.getTileIdForUnit(child.game.units[1]), (15, 26))
+        self.assertEqual(len(api.getActionsHistory(1)), 0)
+        trace = child.game.getTileOccupants((15, 25))[0]
+        _, grandchild = child.simulateMoves({2: GO_UP})
+        _, grandchild = grandchild.simulateMoves({2: GO_RIGHT})  # Bike 2 crashes into the trace of bike 1
+        self.assertFalse(grandchild.isPlayerAlive(2))
+        self.assertNotIn(trace, grandchild.game.units[1].getentitys())
+        self.assertTrue(child.isPlayerAlive(2))
+        self.assertTrue(trace.isAlive())
+        self.assertEqual(child.game.getTileOccupants((15, 25)), (trace,))
+        self.assertEqual(child.game.units[1].getentitys(), [trace])
+        self.assertEqual(len(child.getActionsHistory(2)), 0)
+        self.assertEqual(len(grandchild.getActionsHistory(2)), 2)
+
+    def test_snapshot_sprites(self):
+        self.loop.addUnit(Bike(200, 1, max_trace=-1), LazerBikeBotControllerWrapper(Passive(1)), (15, 25), GO_DOWN,
+                          team=1)
+        self.loop.addUnit(Bike(200, 2, max_trace=-1), LazerBikeBotControllerWrapper(Passive(2)), (30, 25), GO_UP,
+                          team=2)
+        game = self.loop.game.snapshot()
+        bike = game.units[1]
+        sprite = self.loop.game.units[1].sprite
+        self.assertIs(bike.sprite, sprite)
+        bike.turn(GO_RIGHT)
+        self.assertIsNot(bike.sprite, sprite)
+        self.assertIs(self.loop.game.units[1].sprite, sprite)
+        with self.assertRaises(UnknownUnitException):
+            game.getWritableEntity(Trace(1))
+
+    def test_undo_move(self):
+        self.loop.addUnit(Bike(200, 1, max_trace=-1), LazerBikeBotControllerWrapper(Passive(1)), (15, 25), GO_DOWN,
+                          team=1)
+        self.loop.addUnit(Bike(200, 2, max_trace=-1), LazerBikeBotControllerWrapper(Passive(2)), (16, 24), GO_UP,
+                          team=2)
+        api = self.loop.api.copy()
+        self.assertTrue(api.performMoves({1: GO_RIGHT, 2: GO_UP}, record=True))
+        self.assertTrue(api.performMoves({1: GO_RIGHT, 2: GO_RIGHT}, record=True))  # Bike 2 crashes into a trace
+        self.assertFalse(api.isPlayerAlive(2))
+        self.assertTrue(api.isFinished())
+        api.undoMove()
+        self.assertTrue(api.isPlayerAlive(2))
+        self.assertFalse(api.isFinished())
+        self.assertTrue(api.game.getTileOccupants((15, 25))[0].isAlive())
+        api.undoMove()
+        self.assertEqual(api.game.getTileIdForUnit(api.game.units[1]), (15, 25))
+        self.assertEqual(api.game.getTileIdForUnit(api.game.units[2]), (16, 24))
+        self.assertEqual(len(api.game.units[1].getentitys()), 0)
+        self.assertEqual(api.game.getTileOccupants((15, 26)), ())
+        self.assertTrue(np.array_equal(api.getBoardByteCodes(), self.loop.api.getBoardByteCodes()))
+
+    def test_same_state_hash(self):
+        self.loop.addUnit(Bike(200, 1, max_trace=-1), LazerBikeBotControllerWrapper(Passive(1)), (15, 25), GO_DOWN,
+                          team=1)
+        self.loop.addUnit(Bike(200, 2, max_trace=-1), LazerBikeBotControllerWrapper(Passive(2)), (30, 25), GO_UP,
+                          team=2)
+        api = self.loop.api.copy()
+        other_api = self.loop.api.copy()
+        previous_hash = api.game.zobristHash
+        api.game.units[1].setCurrentAction(GO_RIGHT)
+        self.assertEqual(api.game.zobristHash, previous_hash)
+        self.assertTrue(api.performMoves({1: GO_RIGHT, 2: GO_UP}))
+        self.assertTrue(api.performMoves({1: GO_DOWN, 2: GO_UP}))
+        self.assertTrue(other_api.performMoves({1: GO_RIGHT, 2: GO_UP}))
+        other_api.game.units[1].setCurrentAction(None)
+        self.assertTrue(other_api.performMoves({1: GO_DOWN, 2: GO_UP}))
+        self.assertEqual(api.game.zobristHash, other_api.game.zobristHash)
+        self.assertEqual(hash(api), hash(other_api))
+        self.assertEqual(api, other_api)
+
+    def test_alphabeta_dead_player(self):
+        for player_number, tile_id in ((1, (15, 25)), (2, (30, 25)), (3, (40, 40))):
+            self.loop.addUnit(Bike(200, player_number, max_trace=-1),
+                              LazerBikeBotControllerWrapper(Passive(player_number)), tile_id, GO_DOWN,
+                              team=player_number)
+        api = self.loop.api.copy()
+        api.game.units[1].kill()
+        self.assertFalse(api.isFinished())
+        moves = (GO_RIGHT, GO_UP, GO_DOWN, GO_LEFT)
+        alpha_beta = SimultaneousAlphaBeta(lambda state: {number: 0 for number in state.getPlayerNumbers()}, moves,
+                                           max_depth=-1)
+        start = time.time()
+        self.assertIn(alpha_beta.alphaBetaSearching(1, api, time_budget=0.1), moves)
+        self.assertLess(time.time() - start, 5)
+        self.assertEqual(alpha_beta.reachedDepth, 0)  # Nothing is feasible for the dead player: no deepening
+
+    def test_entity_owner(self):
+        self.loop.addUnit(Bike(200, 1, max_trace=-1), LazerBikeBotControllerWrapper(Passive(1)), (15, 25), GO_DOWN,
+                          team=1)
+        self.loop.addUnit(Bike(200, 2, max_trace=-1), LazerBikeBotControllerWrapper(Passive(2)), (16, 24), GO_UP,
+                          team=2)
+        api = self.loop.api.copy()
+        self.assertTrue(api.performMoves({1: GO_RIGHT, 2: GO_UP}, record=True))
+        trace = api.game.getTileOccupants((15, 25))[0]
+        self.assertIs(api.game.getEntityOwner(trace), api.game.units[1])
+        self.assertIsNone(api.game.getEntityOwner(api.game.units[2]))
+        _, child = api.simulateMove(1, GO_RIGHT)
+        child_trace = child.game.getTileOccupants((15, 25))[0]
+        self.assertIs(child.game.getEntityOwner(child_trace), child.game.units[1])
+        api.undoMove()
+        self.assertIsNone(api.game.getEntityOwner(trace))
+        self.assertEqual(len(api.game.units[1].getentitys()), 0)
+
+    def test_alive_teams(self):
+        self.loop.addUnit(Bike(200, 1, max_trace=-1), LazerBikeBotControllerWrapper(Passive(1)), (15, 25), GO_DOWN,
+                          team=1)
+        self.loop.addUnit(Bike(200, 2, max_trace=-1), LazerBikeBotControllerWrapper(Passive(2)), (30, 25), GO_UP,
+                          team=1)
+        self.loop.addUnit(Bike(200, 3, max_trace=-1), LazerBikeBotControllerWrapper(Passive(3)), (30, 40), GO_UP,
+                          team=2)
+        game = self.loop.game.snapshot()
+        game.units[1].kill()
+        self.assertFalse(game.checkIfFinished())
+        game.units[2].kill()
+        game.units[1].oneUp()
+        self.assertFalse(game.checkIfFinished())
+        game.units[1].setNbLives(0)
+        child = game.snapshot()
+        self.assertTrue(child.checkIfFinished())
+        self.assertEqual(child.winningTeam, 2)
+        self.assertEqual(child.winningPlayers, (child.units[3],))
+        self.assertFalse(self.loop.game.checkIfFinished())
+        game.journal.startRecord()
+        game.units[3].kill()
+        self.assertTrue(game.checkIfFinished())
+        self.assertIsNone(game.winningTeam)
+        game.journal.undo()
+        self.assertFalse(game.isFinished())
+        self.assertTrue(game.units[3].isAlive())
+        game.units[1].oneUp()
+        self.assertFalse(game.checkIfFinished())
+
     def test_draw(self):
         self.loop.addUnit(Bike(200, 1, max_trace=-1), LazerBikeBotControllerWrapper(Passive(1)), (15, 25), GO_DOWN,
                           team=1)
@@ -102,3 +248,28 @@ class TestLazerbike(unittest.TestCase):
         self.assertEqual(winners[0].playerNumber, 1)
         self.assertEqual(winners[1].playerNumber, 3)
 
+    def test_headless(self):
+        loop = HeadlessRealTimeMainLoop(LazerBikeAPI(LazerBikeCore(self.loop.game.board)), reaction_time=0)
+        loop.addUnit(Bike(100, 1, max_trace=-1), LazerBikeBotControllerWrapper(Passive(1)), (15, 0), GO_RIGHT,
+                     team=1)
+        loop.addUnit(Bike(200, 2, max_trace=-1), LazerBikeBotControllerWrapper(Passive(2)), (30, 0), GO_UP,
+                     team=2)
+        self.assertEqual(loop.run()[0].playerNumber, 1)  # The speeds are ignored: bike 2 crashes in the trace of bike 1
+        self.assertEqual(loop.game.getTileIdForUnit(loop.game.units[1]), (15, 15))
+
+    def test_headless_builder(self):
+        loop = create_game(({1: Passive, 2: Passive}, {1: 1, 2: 2}), lines=10, columns=10,
+                           init_positions={1: (2, 0, GO_RIGHT), 2: (5, 0, GO_RIGHT)}, max_trace=3, headless=True,
+                           execution=INLINE_EXECUTION)
+        self.assertIsNone(loop.game.board.graphics)  # Nothing is drawn
+        self.assertEqual(loop.run(), ())  # Both bikes crash in the right border at the same time
+
+    def test_headless_executions(self):
+        loop = HeadlessRealTimeMainLoop(LazerBikeAPI(LazerBikeCore(self.loop.game.board)), reaction_time=0)
+        loop.addUnit(Bike(100, 1, max_trace=-1), LazerBikeBotControllerWrapper(Passive(1)), (15, 0), GO_RIGHT,
+                     team=1, execution=THREAD_EXECUTION)
+        loop.addUnit(Bike(200, 2, max_trace=-1), LazerBikeBotControllerWrapper(Passive(2)), (30, 0), GO_UP,
+                     team=2, execution=INLINE_EXECUTION)
+        self.assertEqual(loop.run()[0].playerNumber, 1)
+        self.assertIsNone(loop.executor)  # No process was launched
+        self.assertEqual(loop.game.getTileIdForUnit(loop.game.units[1]), (15, 15))
@@ -0,0 +1,145 @@
+"""
+File containing the definition of a Journal, recording modifications so that they can be undone
+"""
+
+from copy import copy
+from functools import partial
+from typing import Any, Callable, List
+
+__author__ = 'Anthony Rouneau'
+
+
+class EmptyJournalException(Exception):
+    """
+    Exception raised when one tries to undo a record while the journal does not contain any
+    """
+    pass
+
+
+class Journal:
+    """
+    A journal keeps, for each record, the operations that restore what was modified while the record was open.
+    A record is opened with "startRecord", and closed either with "undo", that undoes its modifications, or with
+    "commit", that keeps them. Records can be nested: the last opened is the first closed, and everything modified
+    after it was opened is undone with it.
+    """
+
+    def __init__(self):
+        """
+        Instantiates an empty journal
+        """
+        self._records = []  # type: List[List[Callable[[], None]]]
+        self._recording = False  # True if a record is open and no record is being undone
+
+    # -------------------- PUBLIC METHODS -------------------- #
+
+    def startRecord(self) -> None:
+        """
+        Opens a new record, in which the next modifications will be recorded
+        """
+        self._records.append([])
+        self._recording = True
+
+    def isRecording(self) -> bool:
+        """
+        Returns: True if a record is open and the modifications must be recorded
+        """
+        return self._recording
+
+    def getRecordsCount(self) -> int:
+        """
+        Returns: The number of records that can be undone
+        """
+        return len(self._records)
+
+    def record(self, undo_function: Callable[[], None]) -> None:
+        """
+        Records the function that will be called (without arguments) to undo a modification
+
+        Args:
+            undo_function: The function that restores what is being modified
+        """
+        if self._recording:
+            self._records[-1].append(undo_function)
+
+    def recordItem(self, container: Any, key: Any, copy_value: bool=False) -> None:
+        """
+        Records the current value of an item of a container (e.g. a dict), or its absence, before it is modified
+
+        Args:
+            container: The container in which the item will be modified
+            key: The key of the item that will be modified
+            copy_value: If True, the value is copied (shallow copy) because it will be modified in place
+        """
+        if self._recording:
+            if key in container:
+                value = container[key]
+                if copy_value:
+                    value = copy(value)
+                self._records[-1].append(partial(container.__setitem__, key, value))
+            else:
+                self._records[-1].append(partial(container.pop, key, None))
+
+    def recordAttribute(self, obj: Any, attribute_name: str, copy_value: bool=False) -> None:
+        """
+        Records the current value of an attribute of an object before it is modified
+
+        Args:
+            obj: The object of which the attribute will be modified
+            attribute_name: The name of the attribute
+            copy_value: If True, the value is copied (shallow copy) because it will be modified in place
+        """
+        if self._recording:
+            value = getattr(obj, attribute_name)
+            if copy_value:
+                value = copy(value)
+            self._records[-1].append(partial(setattr, obj, attribute_name, value))
+
+    def recordState(self, obj: Any) -> None:
+        """
+        Records the state of an object that defines the methods "saveState" and "restoreState"
+
+        Args:
+            obj: The object of which the state will be modified
+        """
+        if self._recording:
+            self._records[-1].append(partial(obj.restoreState, obj.saveState()))
+
+    def undo(self) -> None:
+        """
+        Undoes all the modifications recorded since the last record was opened, and closes this record
+
+        Raises:
+            EmptyJournalException: If there is no record to undo
+        """
+        if len(self._records) == 0:
+            raise EmptyJournalException("There is no record to undo")
+        undo_functions = self._records.pop()
+        self._recording = False
+        try:
+            for undo_function in reversed(undo_functions):
+                undo_function()
+        finally:
+            self._recording = len(self._records) > 0
+
+    def commit(self) -> None:
+        """
+        Closes the last record, keeping its modifications. If it was nested in another record, its modifications are
+        still undone with the enclosing record.
+
+        Raises:
+            EmptyJournalException: If there is no record to close
+        """
+        if len(self._records) == 0:
+            raise EmptyJournalException("There is no record to commit")
+        undo_functions = self._records.pop()
+        if len(self._records) > 0:
+            self._records[-1].extend(undo_functions)
+        self._recording = len(self._records) > 0
+
+    def clear(self) -> None:
+        """
+        Forgets all the records, without undoing them
+        """
+        self._records = []
+        self._recording = False
@@ -0,0 +1,42 @@
+"""
+File containing the functions used to compute the Zobrist keys, with which the game states are hashed incrementally
+"""
+
+from hashlib import blake2b
+from typing import Any, Dict, Tuple
+
+__author__ = 'Anthony Rouneau'
+
+
+_KEYS = {}  # type: Dict[Tuple[Any, ...], int]  # The keys already computed in this process
+
+
+def get_zobrist_key(components: Tuple[Any, ...]) -> int:
+    """
+    Gets the 64-bit pseudo-random key representing the given components (e.g. an entity located on a tile).
+    The key only depends on the representation of the components, so that it is the same in every process
+    (and a hash computed in the main process can be updated in the process of a bot).
+
+    Args:
+        components: A tuple of values (numbers, strings, tuples, ...) that describes a part of a game state
+
+    Returns: The Zobrist key of the given components, to be XORed into the hash of the game state
+    """
+    try:
+        return _KEYS[components]
+    except KeyError:
+        key = _compute_key(components)
+        _KEYS[components] = key
+        return key
+    except TypeError:  # Unhashable components, the key is not kept
+        return _compute_key(components)
+
+
+def _compute_key(components: Tuple[Any, ...]) -> int:
+    """
+    Args:
+        components: A tuple of values that describes a part of a game state
+
+    Returns: A 64-bit key derived from the representation of the given components
+    """
+    return int.from_bytes(blake2b(repr(components).encode(), digest_size=8).digest(), "little")